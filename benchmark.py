@@ -0,0 +1,269 @@
+"""
+Module/Script Name: benchmark.py
+
+Description:
+Throughput benchmark for post_pusher.py against the local mock WordPress server.
+Publishes 1, 100 and 10,000 generated posts (by default) and reports posts/sec,
+p50 / p99 per-post latency and peak memory, optionally failing when a run is slower
+than a saved baseline so performance regressions are caught before release.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial benchmark harness with JSON results and baseline comparison
+"""
+
+import argparse
+import base64
+import json
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory falls back to tracemalloc
+    resource = None
+
+from mock_wp_server import MockWordPress
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (1, 100, 10_000)
+DEFAULT_TOLERANCE = 0.2  # allowed slowdown against a baseline before failing
+
+# A 1x1 PNG, so the featured-image path (hash, cache, upload once) is exercised.
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of `values` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def write_posts(content_dir: Path, count: int) -> List[Path]:
+    """Generate `count` HTML posts in content_dir/pre-post and return their paths."""
+    pre_post = content_dir / "pre-post"
+    pre_post.mkdir(parents=True, exist_ok=True)
+    (content_dir / "posted").mkdir(exist_ok=True)
+    body = "".join(f"<p>Paragraph {i} of a benchmark post.</p>" for i in range(20))
+    files = []
+    for i in range(count):
+        path = pre_post / f"bench-post-{i:05d}.html"
+        path.write_text(f"<h1>Benchmark Post {i}</h1>{body}", encoding="utf-8")
+        files.append(path)
+    return files
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Return this process's peak memory in MB (RSS, or traced heap on Windows)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is kilobytes on Linux but bytes on macOS.
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    import tracemalloc
+
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    return None
+
+
+def run_scenario(
+    wp_url: str, count: int, workers: int, batch: int, verbose: bool
+) -> Dict[str, Any]:
+    """Publish `count` generated posts in this process and return its measurements."""
+    if resource is None:
+        import tracemalloc
+
+        tracemalloc.start()
+    import post_pusher
+
+    if not verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="push_it_bench_") as tmp:
+        content_dir = Path(tmp) / "content"
+        image = Path(tmp) / "featured.png"
+        image.write_bytes(PIXEL_PNG)
+        config = {
+            "wp_url": wp_url,
+            "username": "bench",
+            "app_password": "bench pass",
+            "category_ids": [1],
+            "featured_image_url": f"file://{image}",
+            "content_dir": str(content_dir),
+            "post_status": "draft",
+            "http_pool_size": max(workers, 10),
+        }
+        files = write_posts(content_dir, count)
+
+        # Mirrors publish_all / publish_batches, timing each unit of work.
+        def timed(unit: List[Path]) -> Tuple[float, int]:
+            started = time.perf_counter()
+            if batch:
+                failed = len(post_pusher.publish_chunk(unit, config)["failed"])
+            else:
+                failed = 0 if post_pusher.publish_file(unit[0], config) else 1
+            return time.perf_counter() - started, failed
+
+        size = batch or 1
+        units = [files[i : i + size] for i in range(0, len(files), size)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bench"
+        ) as pool:
+            timings = list(pool.map(timed, units))
+        elapsed = time.perf_counter() - started
+        post_pusher.journal_for(config).close()
+
+    # Every post in a batch waits for the whole batch request.
+    latencies = [t for unit, (t, _) in zip(units, timings) for _ in unit]
+    peak = peak_memory_mb()
+
+    return {
+        "posts": count,
+        "workers": workers,
+        "batch": batch,
+        "seconds": round(elapsed, 3),
+        "posts_per_sec": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "peak_mb": round(peak, 1) if peak is not None else None,
+        "failed": sum(f for _, f in timings),
+    }
+
+
+def _child(queue, *args: Any) -> None:
+    try:
+        queue.put(run_scenario(*args))
+    except Exception as e:  # reported by the parent rather than lost in the child
+        queue.put({"error": repr(e)})
+
+
+def run_isolated(*args: Any) -> Dict[str, Any]:
+    """Run one scenario in a fresh process so caches and peak memory start from zero."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(queue, *args))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    if "error" in result:
+        raise RuntimeError(f"scenario {args[1]} posts failed: {result['error']}")
+    return result
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    header = f"{'Posts':>7} {'Workers':>7} {'Batch':>5} {'Secs':>8} {'Posts/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'Peak MB':>8} {'Failed':>6}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        peak = "n/a" if r["peak_mb"] is None else f"{r['peak_mb']:.1f}"
+        lines.append(
+            f"{r['posts']:>7} {r['workers']:>7} {r['batch'] or '-':>5} {r['seconds']:>8.2f} "
+            f"{r['posts_per_sec']:>8.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {peak:>8} {r['failed']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def regressions(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Compare against a saved run; returns a message per scenario that got slower."""
+    previous = {(b["posts"], b["workers"], b["batch"]): b for b in baseline}
+    problems = []
+    for r in results:
+        b = previous.get((r["posts"], r["workers"], r["batch"]))
+        if not b:
+            continue
+        if r["posts_per_sec"] < b["posts_per_sec"] * (1 - tolerance):
+            problems.append(
+                f"{r['posts']} posts: {r['posts_per_sec']} posts/s vs baseline {b['posts_per_sec']}"
+            )
+        if b["p99_ms"] and r["p99_ms"] > b["p99_ms"] * (1 + tolerance):
+            problems.append(
+                f"{r['posts']} posts: p99 {r['p99_ms']} ms vs baseline {b['p99_ms']} ms"
+            )
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark post_pusher against a mock WordPress server"
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma-separated post counts (default 1,100,10000)",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--batch", type=int, default=0, help="posts per batch/v1 request (0 = off)"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="mock server seconds per request"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument(
+        "--baseline",
+        metavar="PATH",
+        help="results JSON from an earlier run; exit 1 if any scenario regressed",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--verbose", action="store_true", help="keep post_pusher's INFO logs"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+    results = []
+    with MockWordPress(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=0,
+    ) as wp:
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            logger.info(
+                "Publishing %d post(s) with %d worker(s)...", size, args.workers
+            )
+            results.append(
+                run_isolated(wp.url, size, args.workers, args.batch, args.verbose)
+            )
+        logger.info("Mock server replies by status: %s", dict(wp.stats))
+
+    print(format_results(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        logger.info("Results written to %s", args.json)
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        problems = regressions(results, baseline, args.tolerance)
+        for problem in problems:
+            logger.error("Regression: %s", problem)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
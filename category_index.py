@@ -0,0 +1,156 @@
+"""
+Module/Script Name: category_index.py
+
+Description:
+Per-profile cache of a site's WordPress categories. Fetches every page concurrently,
+persists the result, revalidates with one request for the first page (conditional on
+its ETag when the site sends one), and resolves category names to IDs locally.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial paginated, cached category index with name → ID resolution
+- v1.01 Revalidate with the same first-page query the ETag came from; detect renames
+- v1.02 resolve() revalidates before trusting cached IDs, not only on unknown names
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from requests.exceptions import RequestException
+
+from file_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+PER_PAGE = 100
+FETCH_WORKERS = 4
+FIELDS = "id,name,slug,parent,count"
+# Fields that identify a category; post counts change too often to invalidate on.
+IDENTITY_FIELDS = ("id", "name", "slug", "parent")
+
+
+def page_digest(categories: List[Dict[str, Any]]) -> str:
+    """Return a digest of what a page of categories says about their names and tree."""
+    identity = [[c.get(f) for f in IDENTITY_FIELDS] for c in categories]
+    return hashlib.sha256(json.dumps(identity).encode("utf-8")).hexdigest()
+
+
+class CategoryIndex:
+    """All categories of one site, cached on disk and refreshed only when they change."""
+
+    def __init__(self, cache_path: Path, session) -> None:
+        self.cache_path = cache_path
+        self.session = session
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {"total": None, "etag": None, "categories": []}
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable category cache '%s': %s", cache_path, e)
+
+    @property
+    def categories(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._data["categories"])
+
+    def _is_current(self, first) -> bool:
+        """True if a fresh first page shows the cached list still matches the site.
+
+        A 304 means the page still has the cached ETag. Sites without ETags (core
+        WordPress sends none) are compared by total and first-page contents, so a
+        rename beyond the first PER_PAGE categories goes unnoticed until the count
+        changes.
+        """
+        if first.status_code == 304:
+            return True
+        total = int(first.headers.get("X-WP-Total", -1))
+        if total != self._data["total"]:
+            return False
+        return page_digest(first.json()) == self._data.get("first_page")
+
+    def _fetch_page(self, page: int, etag: Optional[str] = None):
+        resp = self.session.get(
+            "wp/v2/categories",
+            params={"per_page": PER_PAGE, "page": page, "_fields": FIELDS},
+            headers={"If-None-Match": etag} if etag else None,
+        )
+        resp.raise_for_status()
+        return resp
+
+    def refresh(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Return all categories, refetching every page only if the site's list changed."""
+        with self._lock:
+            first = None
+            if not force and self._data.get("total") is not None:
+                # The same query the stored ETag came from; if the list changed,
+                # this response is the first page of the refetch.
+                first = self._fetch_page(1, self._data.get("etag"))
+                if self._is_current(first):
+                    return list(self._data["categories"])
+            if first is None:
+                first = self._fetch_page(1)
+            categories = list(first.json())
+            total_pages = int(first.headers.get("X-WP-TotalPages", 1))
+            if total_pages > 1:
+                with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+                    for resp in pool.map(self._fetch_page, range(2, total_pages + 1)):
+                        categories.extend(resp.json())
+
+            self._data = {
+                "total": int(first.headers.get("X-WP-Total", len(categories))),
+                "etag": first.headers.get("ETag"),
+                "first_page": page_digest(first.json()),
+                "categories": sorted(categories, key=lambda c: c["name"].lower()),
+            }
+            write_json_atomic(self.cache_path, self._data)
+            logger.info(
+                "Fetched %d categories in %d page(s)", len(categories), total_pages
+            )
+            return list(self._data["categories"])
+
+    def find(self, name_or_id: Any) -> Optional[int]:
+        """Return the ID for a category given by ID, name or slug (case-insensitive)."""
+        if isinstance(name_or_id, int) or str(name_or_id).isdigit():
+            return int(name_or_id)
+        wanted = str(name_or_id).strip().lower()
+        for cat in self.categories:
+            if wanted in (cat["name"].lower(), cat.get("slug", "").lower()):
+                return cat["id"]
+        return None
+
+    def resolve(self, names_or_ids: Iterable[Any]) -> List[int]:
+        """Resolve a mix of IDs and names to IDs after revalidating the cached list.
+
+        Callers resolve once per run (see post_pusher.category_ids_for), so this costs
+        one conditional first-page request per run. A name that is still cached may
+        have been deleted or moved to another ID on the site since it was stored.
+        """
+        wanted = list(names_or_ids)
+        if any(not (isinstance(n, int) or str(n).isdigit()) for n in wanted):
+            try:
+                self.refresh()
+            except RequestException as e:
+                if self._data.get("total") is None:
+                    raise
+                logger.warning("Could not revalidate categories, using cache: %s", e)
+        ids: List[int] = []
+        for item in wanted:
+            cat_id = self.find(item)
+            if cat_id is None:
+                logger.warning("Unknown category '%s'; skipping it", item)
+            elif cat_id not in ids:
+                ids.append(cat_id)
+        return ids
@@ -0,0 +1,117 @@
+"""
+Module/Script Name: content_sources.py
+
+Description:
+Reads posts straight out of zip bundles without extracting them. Each HTML member is
+exposed as a ZipMember that behaves enough like a Path (name, stem, read_text) to go
+through the normal publish pipeline, and is read only when it is published.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial zip bundle source
+"""
+
+import json
+import logging
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_MEMBER_BYTES = 20 * 1024 * 1024  # refuse suspiciously large (or zip-bomb) members
+
+_archives: Dict[str, zipfile.ZipFile] = {}
+_archives_lock = threading.Lock()
+
+
+def open_archive(archive: Path) -> zipfile.ZipFile:
+    """Return a shared, open ZipFile for an archive; members can be read from any thread."""
+    key = str(archive.resolve())
+    with _archives_lock:
+        zf = _archives.get(key)
+        if zf is None:
+            zf = zipfile.ZipFile(archive)
+            _archives[key] = zf
+        return zf
+
+
+def close_archives() -> None:
+    with _archives_lock:
+        for zf in _archives.values():
+            zf.close()
+        _archives.clear()
+
+
+class ZipMember:
+    """One HTML file inside a zip bundle, read lazily on demand."""
+
+    def __init__(self, archive: Path, member: str) -> None:
+        self.archive = archive
+        self.member = member
+        # Journal key: unique per bundle and member, stable across runs.
+        self.name = f"{archive.name}!{member}"
+        self.stem = PurePosixPath(member).stem
+
+    def __repr__(self) -> str:
+        return f"ZipMember({str(self.archive)!r}, {self.member!r})"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def read_bytes(self) -> bytes:
+        return open_archive(self.archive).read(self.member)
+
+    def read_text(self, encoding: str = "utf-8") -> str:
+        return self.read_bytes().decode(encoding)
+
+    def read_sibling(self, relative: str) -> bytes:
+        """Read another member addressed relative to this one (e.g. an <img src>)."""
+        parts: List[str] = []
+        for part in (PurePosixPath(self.member).parent / relative).parts:
+            if part == "..":
+                if parts:
+                    parts.pop()
+            elif part != ".":
+                parts.append(part)
+        return open_archive(self.archive).read("/".join(parts))
+
+
+def archives_in(source: Path) -> List[Path]:
+    """Return the zip bundle at `source`, or every bundle in the folder `source`."""
+    if source.is_dir():
+        return sorted(source.glob("*.zip"))
+    return [source]
+
+
+def list_members(archive: Path) -> List[ZipMember]:
+    """Return a ZipMember for each HTML file in an archive, without reading any of them."""
+    members: List[ZipMember] = []
+    for info in open_archive(archive).infolist():
+        if info.is_dir() or not info.filename.lower().endswith(".html"):
+            continue
+        if info.file_size > MAX_MEMBER_BYTES:
+            logger.warning(
+                "Skipping '%s' in '%s': %d bytes is too large",
+                info.filename,
+                archive.name,
+                info.file_size,
+            )
+            continue
+        members.append(ZipMember(archive, info.filename))
+    return members
+
+
+def bundle_manifest(archive: Path) -> Optional[List[Dict[str, Any]]]:
+    """Return the entries of a posts.json shipped inside the bundle, if there is one."""
+    zf = open_archive(archive)
+    for name in zf.namelist():
+        if PurePosixPath(name).name == "posts.json":
+            return json.loads(zf.read(name).decode("utf-8"))
+    return None
@@ -0,0 +1,31 @@
+"""
+Module/Script Name: file_utils.py
+
+Description:
+Small file helpers shared by the caches and state files: atomic JSON writes so a
+reader (or a crash) never sees half a file.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 write_json_atomic moved here from media_cache.py
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to a temp file beside `path` and swap it in, so readers never see half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    tmp.replace(path)
@@ -0,0 +1,101 @@
+"""
+Module/Script Name: html_processor.py
+
+Description:
+HTML processing stage for post bodies: finds the real title (<h1> or <title>), collects
+<img> sources that are local paths or live on other hosts, and rewrites them to the
+uploaded media URLs once post_pusher.py has uploaded them.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial title extraction and inline-image rewrite
+"""
+
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+
+from bs4 import BeautifulSoup
+
+
+def parse(content: str) -> BeautifulSoup:
+    return BeautifulSoup(content, "html.parser")
+
+
+def extract_title(soup: BeautifulSoup) -> Optional[str]:
+    """Return the text of the first <h1>, else of <title>, or None if neither has text."""
+    for tag_name in ("h1", "title"):
+        tag = soup.find(tag_name)
+        if tag:
+            text = " ".join(tag.get_text(" ", strip=True).split())
+            if text:
+                return text
+    return None
+
+
+def is_local(src: str) -> bool:
+    """True for paths relative to the HTML file (not URLs, data: or site-rooted /paths)."""
+    parts = urlsplit(src)
+    return (
+        not parts.scheme
+        and not parts.netloc
+        and bool(parts.path)
+        and not parts.path.startswith("/")
+    )
+
+
+def local_path_of(src: str) -> str:
+    """Return the decoded file path of a local src, without query string or fragment."""
+    return unquote(urlsplit(src).path)
+
+
+def is_off_site(src: str, site_url: str) -> bool:
+    """True for http(s) URLs (including protocol-relative) on a host other than the site."""
+    parts = urlsplit(src)
+    if parts.scheme not in ("http", "https", "") or not parts.netloc:
+        return False
+    return parts.netloc.lower() != urlsplit(site_url).netloc.lower()
+
+
+def absolute_url(src: str) -> str:
+    """Give protocol-relative URLs (//host/img.jpg) an https scheme."""
+    return f"https:{src}" if src.startswith("//") else src
+
+
+def images_to_upload(soup: BeautifulSoup, site_url: str) -> List[str]:
+    """Return each distinct <img src> that is local or off-site, in document order."""
+    seen: List[str] = []
+    for img in soup.find_all("img", src=True):
+        src = img["src"].strip()
+        if src and src not in seen and (is_local(src) or is_off_site(src, site_url)):
+            seen.append(src)
+    return seen
+
+
+def rewrite_images(soup: BeautifulSoup, new_urls: Dict[str, str]) -> int:
+    """Point every <img> whose src is in `new_urls` at its uploaded URL; returns the count.
+
+    srcset/sizes are dropped from rewritten tags since they still name the old files.
+    """
+    count = 0
+    for img in soup.find_all("img", src=True):
+        new_url = new_urls.get(img["src"].strip())
+        if new_url:
+            img["src"] = new_url
+            for attr in ("srcset", "sizes"):
+                if attr in img.attrs:
+                    del img[attr]
+            count += 1
+    return count
+
+
+def body_html(soup: BeautifulSoup) -> str:
+    """Return the post content: the <body> contents of a full document, else everything."""
+    body = soup.body
+    if body is not None:
+        return body.decode_contents()
+    return str(soup)
@@ -3,6 +3,8 @@ Module/Script Name: image_drop_widget.py
 
 Description:
 A PyQt6 widget that accepts drag-and-drop of image files and emits a list of file paths.
+Thumbnails are decoded at reduced size on a worker pool and cached on disk, so a drop of
+large photos shows placeholders at once and never blocks the GUI thread.
 
 Author(s):
 Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
@@ -10,15 +12,85 @@ Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey,
 Created Date:
 2025-04-16
 Last Modified Date:
-2025-04-17
+2026-10-16
 
 Comments:
 - v1.01 Ready to Zip and Ship: migrated to PyQt6 imports
+- v1.02 Off-thread scaled decode (QImageReader) with placeholders and an on-disk cache
+- v1.03 RequestWorker comes from the Qt-only qt_workers module
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPixmap
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QStyle,
+)
+from PyQt6.QtCore import Qt, QSize, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QIcon, QImage, QImageReader, QPixmap
+
+from qt_workers import RequestWorker
+
+THUMBNAIL_SIZE = 100
+THUMBNAIL_CACHE_DIR = Path(".push_it") / "thumbnails"
+THUMBNAIL_WORKERS = 4
+
+
+def thumbnail_cache_path(path: str, cache_dir: Path = THUMBNAIL_CACHE_DIR) -> Path:
+    """Return where the thumbnail of `path` is cached; the key changes when the file does."""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{THUMBNAIL_SIZE}"
+    return cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.png"
+
+
+def load_thumbnail(path: str, cache_dir: Path = THUMBNAIL_CACHE_DIR) -> QImage:
+    """Return a thumbnail of `path`, from the cache or decoded straight at thumbnail size.
+
+    Runs on a worker thread, so it works with QImage (QPixmap is GUI-thread only).
+    QImageReader's scaled size lets JPEG decode at a fraction of full resolution
+    instead of decoding every pixel and scaling afterwards.
+    """
+    cached = thumbnail_cache_path(path, cache_dir)
+    if cached.exists():
+        image = QImage(str(cached))
+        if not image.isNull():
+            return image
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(
+            size.scaled(
+                THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio
+            )
+        )
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"cannot read image: {reader.errorString()}")
+    if max(image.width(), image.height()) > THUMBNAIL_SIZE:
+        # Formats without scaled decode (or no size in the header) land here.
+        image = image.scaled(
+            THUMBNAIL_SIZE,
+            THUMBNAIL_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_name(
+        f"{cached.stem}.{os.getpid()}.{threading.get_ident()}.tmp.png"
+    )
+    if image.save(str(tmp), "PNG"):
+        tmp.replace(cached)
+    return image
 
 
 class ImageDropWidget(QWidget):
@@ -28,16 +100,24 @@ class ImageDropWidget(QWidget):
 
     imagesDropped = pyqtSignal(list)  # Emits list of file paths
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, cache_dir: Path = THUMBNAIL_CACHE_DIR):
         super().__init__(parent)
+        self.cache_dir = cache_dir
         self.setAcceptDrops(True)
         layout = QVBoxLayout(self)
         self.instruction = QLabel("Drag & drop images here", self)
         self.instruction.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.instruction)
         self.listWidget = QListWidget(self)
+        self.listWidget.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
         layout.addWidget(self.listWidget)
 
+        # Decoding happens here, never on the GUI thread
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(THUMBNAIL_WORKERS)
+        self._workers: set[RequestWorker] = set()
+        self._placeholder = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
@@ -57,13 +137,18 @@ class ImageDropWidget(QWidget):
             self.imagesDropped.emit(image_paths)
 
     def _addThumbnail(self, path):
+        """Add a placeholder row now and fill in its icon when the worker is done."""
         item = QListWidgetItem()
-        pixmap = QPixmap(path).scaled(
-            100,
-            100,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
-        item.setIcon(pixmap)
+        item.setIcon(self._placeholder)
         item.setText(path.split("/")[-1])
         self.listWidget.addItem(item)
+
+        worker = RequestWorker(load_thumbnail, path, self.cache_dir)
+        worker.setAutoDelete(False)
+        worker.signals.result.connect(
+            lambda image: item.setIcon(QIcon(QPixmap.fromImage(image)))
+        )
+        worker.signals.error.connect(lambda msg: item.setToolTip(msg))
+        worker.signals.finished.connect(lambda: self._workers.discard(worker))
+        self._workers.add(worker)
+        self.thread_pool.start(worker)
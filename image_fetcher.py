@@ -0,0 +1,118 @@
+"""
+Module/Script Name: image_fetcher.py
+
+Description:
+Download-once cache for remote featured images. Each URL is stored on disk and
+revalidated with ETag / Last-Modified, so unchanged images are never downloaded twice.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial conditional-GET image cache
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from file_utils import write_json_atomic
+from media_cache import url_filename
+from wp_client import DEFAULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class RemoteImageCache:
+    """Local copies of remote images, keyed by URL and revalidated once per run."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.index_path = cache_dir / "index.json"
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._fresh: Set[str] = set()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable image cache index: %s", e)
+
+        # A plain session: remote images may live on other hosts, so no WP credentials.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(max_retries=2))
+        self.session.mount("http://", HTTPAdapter(max_retries=2))
+
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _local_path(self, url: str) -> Path:
+        name = url_filename(url) or "image"
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{digest}-{name}"
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Return a local path holding the image at `url`, downloading it only if changed."""
+        with self._lock_for(url):
+            with self._lock:
+                entry = dict(self._index.get(url, {}))
+            local_path = Path(entry["path"]) if entry.get("path") else None
+            if local_path and not local_path.is_file():
+                entry, local_path = {}, None
+            if local_path and url in self._fresh:
+                return str(local_path)
+
+            headers = {}
+            if local_path and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if local_path and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            try:
+                with self.session.get(
+                    url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT
+                ) as resp:
+                    if resp.status_code == 304 and local_path:
+                        logger.info("Image unchanged, using cached copy of '%s'", url)
+                        self._fresh.add(url)
+                        return str(local_path)
+                    resp.raise_for_status()
+                    local_path = self._local_path(url)
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    tmp = local_path.with_name(local_path.name + ".part")
+                    size = 0
+                    with open(tmp, "wb") as f:
+                        for chunk in resp.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
+                            size += len(chunk)
+                    tmp.replace(local_path)
+                    entry = {
+                        "path": str(local_path),
+                        "etag": resp.headers.get("ETag"),
+                        "last_modified": resp.headers.get("Last-Modified"),
+                    }
+            except (OSError, RequestException) as e:
+                logger.error("Error downloading image '%s': %s", url, e)
+                return str(local_path) if local_path and local_path.is_file() else None
+
+            logger.info("Downloaded image '%s' (%d bytes)", url, size)
+            with self._lock:
+                self._index[url] = entry
+                write_json_atomic(self.index_path, self._index)
+            self._fresh.add(url)
+            return str(local_path)
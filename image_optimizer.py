@@ -0,0 +1,169 @@
+"""
+Module/Script Name: image_optimizer.py
+
+Description:
+Optional pre-upload image stage: resizes to a maximum dimension, strips metadata and
+re-encodes to WebP or JPEG. Output is cached by source hash and settings, and the
+bytes saved are tracked per image and per run. Requires Pillow.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial resize / strip / re-encode stage with on-disk cache
+- v1.01 reset_totals() so a long-lived process can report per run
+- v1.02 reset_totals() also forgets this run's results, so the next run counts its images
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from media_cache import file_sha256
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it images are uploaded unchanged
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "max_dimension": 1920,
+    "format": "webp",
+    "quality": 82,
+}
+FORMATS = {"webp": ("WEBP", ".webp"), "jpeg": ("JPEG", ".jpg"), "jpg": ("JPEG", ".jpg")}
+
+_totals_lock = threading.Lock()
+_totals = {"images": 0, "bytes_in": 0, "bytes_out": 0}
+# cache key → path returned, so each image counts once per run
+_results: Dict[str, str] = {}
+_warned_missing = False
+
+
+def normalise_settings(settings: Any) -> Dict[str, Any]:
+    """Merge a profile's `image_optimization` value (True or a dict) with the defaults."""
+    merged = dict(DEFAULT_SETTINGS)
+    if isinstance(settings, dict):
+        merged.update(settings)
+    merged["format"] = str(merged["format"]).lower()
+    if merged["format"] not in FORMATS:
+        raise ValueError(f"Unsupported image_optimization format: {merged['format']}")
+    merged["max_dimension"] = int(merged["max_dimension"])
+    merged["quality"] = int(merged["quality"])
+    return merged
+
+
+def _record(bytes_in: int, bytes_out: int) -> None:
+    with _totals_lock:
+        _totals["images"] += 1
+        _totals["bytes_in"] += bytes_in
+        _totals["bytes_out"] += bytes_out
+
+
+def reset_totals() -> None:
+    """Start a new run: zero the totals and forget which images were counted."""
+    with _totals_lock:
+        for key in _totals:
+            _totals[key] = 0
+        _results.clear()
+
+
+def totals() -> Dict[str, int]:
+    """Return the images processed and bytes in/out so far this run."""
+    with _totals_lock:
+        return dict(_totals)
+
+
+def log_totals() -> None:
+    """Log the bytes saved across all images optimised this run, if any."""
+    t = totals()
+    if t["images"]:
+        logger.info(
+            "Image optimisation: %d image(s), %d → %d bytes (saved %d)",
+            t["images"],
+            t["bytes_in"],
+            t["bytes_out"],
+            t["bytes_in"] - t["bytes_out"],
+        )
+
+
+def optimize_image(local_path: str, settings: Dict[str, Any], cache_dir: Path) -> str:
+    """Return the path of an optimised copy of `local_path`, or `local_path` if not smaller.
+
+    The copy lives in `cache_dir` under a key derived from the source hash and the
+    settings, so repeated runs reuse it without decoding the image again.
+    """
+    global _warned_missing
+    if Image is None:
+        if not _warned_missing:
+            logger.warning("Pillow is not installed; uploading images unoptimised")
+            _warned_missing = True
+        return local_path
+
+    pil_format, ext = FORMATS[settings["format"]]
+    settings_key = json.dumps(settings, sort_keys=True)
+    key = hashlib.sha256(
+        (file_sha256(local_path) + settings_key).encode("utf-8")
+    ).hexdigest()[:24]
+    with _totals_lock:
+        if key in _results:
+            return _results[key]
+    out_path = cache_dir / key / (Path(local_path).stem + ext)
+    bytes_in = os.path.getsize(local_path)
+
+    if not out_path.is_file():
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with Image.open(local_path) as img:
+            img = ImageOps.exif_transpose(img)
+            limit = settings["max_dimension"]
+            if limit and max(img.size) > limit:
+                img.thumbnail((limit, limit), Image.LANCZOS)
+            if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            elif img.mode not in ("RGB", "RGBA", "L"):
+                img = img.convert("RGBA")
+            tmp = out_path.with_name(out_path.name + ".part")
+            # No exif/icc arguments are passed, so metadata is not carried over.
+            img.save(
+                tmp,
+                format=pil_format,
+                quality=settings["quality"],
+                optimize=True,
+                **({"progressive": True} if pil_format == "JPEG" else {"method": 6}),
+            )
+            tmp.replace(out_path)
+
+    bytes_out = os.path.getsize(out_path)
+    if bytes_out >= bytes_in:
+        logger.info(
+            "Optimised '%s' was not smaller (%d ≥ %d bytes); keeping original",
+            local_path,
+            bytes_out,
+            bytes_in,
+        )
+        _record(bytes_in, bytes_in)
+        with _totals_lock:
+            _results[key] = local_path
+        return local_path
+
+    logger.info(
+        "Optimised '%s': %d → %d bytes (saved %d)",
+        local_path,
+        bytes_in,
+        bytes_out,
+        bytes_in - bytes_out,
+    )
+    _record(bytes_in, bytes_out)
+    with _totals_lock:
+        _results[key] = str(out_path)
+    return str(out_path)
@@ -0,0 +1,233 @@
+"""
+Module/Script Name: log_panel.py
+
+Description:
+In-window log view for post_pusher.py runs. Output lines go into a fixed-size ring
+buffer and are flushed to a list model on a timer, so a burst of thousands of lines
+costs one model update per tick instead of one widget update per line. Lines are
+filtered by minimum level and by file name through a proxy model.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial ring-buffered, timer-coalesced log list with level / file filters
+"""
+
+import logging
+import re
+from collections import deque
+from typing import Any, Deque, List, NamedTuple, Optional
+
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    QTimer,
+)
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListView,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+DEFAULT_CAPACITY = 5000  # lines kept; older ones fall off the front
+FLUSH_INTERVAL_MS = 100
+
+# "2026-10-16 12:00:00 [INFO] [worker_0] Posted 'x' → Post ID 5"
+LINE_RE = re.compile(
+    r"^\S+ \S+ \[(DEBUG|INFO|WARNING|ERROR|CRITICAL)\] (?:\[[^\]]*\] )?"
+)
+FILE_RE = re.compile(r"'([^'\s]+\.html)'")
+LEVEL_COLOURS = {
+    logging.WARNING: "#b26a00",
+    logging.ERROR: "#c62828",
+    logging.CRITICAL: "#c62828",
+}
+
+
+class LogLine(NamedTuple):
+    level: int
+    file: str
+    text: str
+
+
+def parse_line(text: str, previous: Optional[LogLine] = None) -> LogLine:
+    """Classify one output line; continuation lines (tracebacks) inherit the previous one."""
+    match = LINE_RE.match(text)
+    if match:
+        level = logging.getLevelName(match.group(1))
+    elif previous is not None:
+        return LogLine(previous.level, previous.file, text)
+    else:
+        level = logging.INFO
+    found = FILE_RE.search(text)
+    return LogLine(level, found.group(1) if found else "", text)
+
+
+class LogModel(QAbstractListModel):
+    """List model over a bounded deque of LogLine rows."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.lines: Deque[LogLine] = deque(maxlen=capacity)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        line = self.lines[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return line.text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            colour = LEVEL_COLOURS.get(line.level)
+            return QColor(colour) if colour else None
+        return None
+
+    def extend(self, new_lines: List[LogLine]) -> None:
+        """Append a batch, dropping the oldest rows first so the deque never overflows."""
+        if not new_lines:
+            return
+        capacity = self.lines.maxlen
+        new_lines = new_lines[-capacity:]
+        overflow = len(self.lines) + len(new_lines) - capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self.lines.popleft()
+            self.endRemoveRows()
+        start = len(self.lines)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_lines) - 1)
+        self.lines.extend(new_lines)
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self.lines.clear()
+        self.endResetModel()
+
+
+class LogFilter(QSortFilterProxyModel):
+    """Shows lines at or above a minimum level whose file name contains a substring."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.min_level = logging.DEBUG
+        self.file_text = ""
+
+    def set_filter(self, min_level: int, file_text: str) -> None:
+        self.min_level = min_level
+        self.file_text = file_text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        line = self.sourceModel().lines[source_row]
+        if line.level < self.min_level:
+            return False
+        return not self.file_text or self.file_text in line.file.lower()
+
+
+class LogPanel(QWidget):
+    """Log list with level and file filters, fed raw process output from the GUI thread."""
+
+    LEVELS = (
+        ("All", logging.DEBUG),
+        ("Info+", logging.INFO),
+        ("Warnings+", logging.WARNING),
+        ("Errors", logging.ERROR),
+    )
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.model = LogModel(capacity, self)
+        self.proxy = LogFilter(self)
+        self.proxy.setSourceModel(self.model)
+        # Pending lines wait here until the next tick; bounded like the model itself.
+        self._pending: Deque[LogLine] = deque(maxlen=capacity)
+        self._partial = ""
+        self._last: Optional[LogLine] = None
+
+        self.view = QListView()
+        self.view.setModel(self.proxy)
+        self.view.setUniformItemSizes(True)
+        self.view.setWordWrap(False)
+        self.view.setMinimumHeight(140)
+        self.level_selector = QComboBox()
+        for label, level in self.LEVELS:
+            self.level_selector.addItem(label, level)
+        self.level_selector.setCurrentIndex(1)
+        self.file_filter = QLineEdit()
+        self.file_filter.setPlaceholderText("Filter by file…")
+        self.clear_button = QPushButton("Clear", clicked=self.clear)
+        self.level_selector.currentIndexChanged.connect(self._apply_filter)
+        self.file_filter.textChanged.connect(self._apply_filter)
+        self._apply_filter()
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Log:"))
+        controls.addWidget(self.level_selector)
+        controls.addWidget(self.file_filter)
+        controls.addWidget(self.clear_button)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls)
+        layout.addWidget(self.view)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def _apply_filter(self, *_: Any) -> None:
+        self.proxy.set_filter(
+            self.level_selector.currentData(), self.file_filter.text()
+        )
+
+    def set_file_filter(self, name: str) -> None:
+        self.file_filter.setText(name)
+
+    def append_text(self, text: str) -> None:
+        """Queue raw output; an unterminated last line waits for the rest of it."""
+        text = self._partial + text
+        *complete, self._partial = text.split("\n")
+        for raw in complete:
+            raw = raw.rstrip("\r")
+            if raw:
+                self._last = parse_line(raw, self._last)
+                self._pending.append(self._last)
+
+    def flush(self) -> None:
+        """Move queued lines into the model in one batch, keeping the view pinned to the end."""
+        if not self._pending:
+            return
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        batch = list(self._pending)
+        self._pending.clear()
+        self.model.extend(batch)
+        if at_bottom:
+            self.view.scrollToBottom()
+
+    def finish(self) -> None:
+        """Flush everything, including a last line without a trailing newline."""
+        if self._partial:
+            self.append_text("\n")
+        self.flush()
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._partial = ""
+        self._last = None
+        self.model.clear()
@@ -0,0 +1,133 @@
+"""
+Module/Script Name: manifest.py
+
+Description:
+Loads a posts.json manifest (title, slug, focus keyword, Rank Math description and
+featured image per post) and checks which slugs already exist on the site using a
+few bulk REST queries.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial manifest loader and bulk slug-existence lookup
+- v1.01 Split out index_manifest so bundles can supply their own posts.json
+- v1.02 posts_titled(): find posts by exact title, for files without a slug
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+SLUG_CHUNK_SIZE = 50  # keeps ?slug=a,b,c URLs well under common 8 KB limits
+PER_PAGE = 100
+
+# Manifest key → REST post meta key (Rank Math registers these for the REST API)
+META_KEYS = {
+    "focus_keyword": "rank_math_focus_keyword",
+    "rank_math_description": "rank_math_description",
+}
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load a posts.json manifest and return its entries keyed by slug."""
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return index_manifest(json.load(f))
+
+
+def index_manifest(entries: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Return manifest entries keyed by slug, warning about missing or duplicate slugs."""
+    manifest: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        slug = entry.get("slug")
+        if not slug:
+            logger.warning("Skipping manifest entry without a slug: %s", entry)
+            continue
+        if slug in manifest:
+            logger.warning(
+                "Duplicate slug '%s' in manifest; keeping the last one", slug
+            )
+        manifest[slug] = entry
+    return manifest
+
+
+def apply_entry(payload: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Copy manifest metadata (title, slug, excerpt, SEO meta) onto a post payload."""
+    if entry.get("title"):
+        payload["title"] = entry["title"]
+    if entry.get("slug"):
+        payload["slug"] = entry["slug"]
+    if entry.get("description"):
+        payload["excerpt"] = entry["description"]
+    meta = {
+        rest_key: entry[key] for key, rest_key in META_KEYS.items() if entry.get(key)
+    }
+    if meta:
+        payload["meta"] = meta
+
+
+def existing_slugs(session, slugs: Iterable[str]) -> Dict[str, int]:
+    """Return {slug: post_id} for the slugs that already exist, in any status.
+
+    Slugs are looked up SLUG_CHUNK_SIZE at a time with ?slug=a,b,c&per_page=100, so a
+    manifest of a few hundred posts costs only a handful of requests.
+    """
+    wanted: List[str] = sorted(set(slugs))
+    found: Dict[str, int] = {}
+    for i in range(0, len(wanted), SLUG_CHUNK_SIZE):
+        chunk = wanted[i : i + SLUG_CHUNK_SIZE]
+        page = 1
+        while True:
+            resp = session.get(
+                "wp/v2/posts",
+                params={
+                    "slug": ",".join(chunk),
+                    "status": "any",
+                    "per_page": PER_PAGE,
+                    "page": page,
+                    "_fields": "id,slug",
+                },
+            )
+            resp.raise_for_status()
+            for post in resp.json():
+                found[post["slug"]] = post["id"]
+            if page >= int(resp.headers.get("X-WP-TotalPages", 1)):
+                break
+            page += 1
+    return found
+
+
+def raw_field(post: Dict[str, Any], key: str) -> str:
+    """Return a post field's raw value (context=edit), falling back to its rendered one."""
+    value = post.get(key)
+    if isinstance(value, dict):
+        return value.get("raw", value.get("rendered", "")) or ""
+    return value or ""
+
+
+def posts_titled(session, title: str) -> List[Dict[str, Any]]:
+    """Return the site's posts (any status) whose raw title is exactly `title`.
+
+    One ?search= query, newest first, with context=edit so titles and content come
+    back as they were sent rather than rendered. Each post has id, title and content.
+    """
+    resp = session.get(
+        "wp/v2/posts",
+        params={
+            "search": title,
+            "status": "any",
+            "context": "edit",
+            "per_page": PER_PAGE,
+            "orderby": "date",
+            "order": "desc",
+            "_fields": "id,title,content",
+        },
+    )
+    resp.raise_for_status()
+    return [post for post in resp.json() if raw_field(post, "title") == title]
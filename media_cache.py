@@ -0,0 +1,279 @@
+"""
+Module/Script Name: media_cache.py
+
+Description:
+Persistent, content-addressed cache mapping image hashes to WordPress media IDs,
+so the same featured image is uploaded to a site only once, plus a locally cached
+index of the site's existing media library by source URL and filename.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial SHA-256 → media ID cache with on-site verification
+- v1.01 Added MediaIndex: incremental, paged index of existing site media
+- v1.02 Cache entries carry the media source_url so inline images can be rewritten
+- v1.03 write_json_atomic moved to file_utils.py
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import unquote, urlsplit
+
+from requests.exceptions import RequestException
+
+from file_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+MEDIA_PER_PAGE = 100
+
+
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaCache:
+    """Maps image content hashes to media IDs on one WordPress site."""
+
+    def __init__(self, cache_path: Path, session) -> None:
+        self.cache_path = cache_path
+        self.session = session
+        self._lock = threading.Lock()
+        self._hash_locks: Dict[str, threading.Lock] = {}
+        self._verified: Set[int] = set()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable media cache '%s': %s", cache_path, e)
+
+    def _lock_for(self, digest: str) -> threading.Lock:
+        with self._lock:
+            return self._hash_locks.setdefault(digest, threading.Lock())
+
+    def _exists_on_site(self, entry: Dict[str, Any]) -> bool:
+        """Return True if the media item still exists; network errors count as 'unknown' → True.
+
+        Entries cached before source_url was recorded get it filled in from the response.
+        """
+        media_id = entry["id"]
+        if media_id in self._verified and entry.get("source_url"):
+            return True
+        try:
+            resp = self.session.get(
+                f"wp/v2/media/{media_id}", params={"_fields": "id,source_url"}
+            )
+        except RequestException as e:
+            logger.warning("Could not verify cached media ID %s: %s", media_id, e)
+            return True
+        if resp.status_code == 200:
+            self._verified.add(media_id)
+            try:
+                source_url = resp.json().get("source_url")
+            except ValueError:
+                source_url = None
+            if source_url and source_url != entry.get("source_url"):
+                with self._lock:
+                    entry["source_url"] = source_url
+                    write_json_atomic(self.cache_path, self._entries)
+            return True
+        if resp.status_code in (404, 410):
+            return False
+        logger.warning(
+            "Unexpected status %s verifying media ID %s", resp.status_code, media_id
+        )
+        return True
+
+    def lookup(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry (id, source_url) for a content hash if it still exists on the site."""
+        with self._lock:
+            entry = self._entries.get(digest)
+        if not entry:
+            return None
+        if self._exists_on_site(entry):
+            return entry
+        logger.info("Cached media ID %s no longer exists; dropping it", entry["id"])
+        self.forget(digest)
+        return None
+
+    def store(self, digest: str, media_id: int, **extra: Any) -> Dict[str, Any]:
+        """Record a media ID for a content hash, persist the cache and return the entry."""
+        with self._lock:
+            entry = {"id": media_id, **extra}
+            self._entries[digest] = entry
+            self._verified.add(media_id)
+            write_json_atomic(self.cache_path, self._entries)
+            return entry
+
+    def forget(self, digest: str) -> None:
+        """Drop a content hash from the cache and persist the change."""
+        with self._lock:
+            if self._entries.pop(digest, None) is not None:
+                write_json_atomic(self.cache_path, self._entries)
+
+    def get_or_upload(
+        self, local_path: str, upload: Callable[[str], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for a local image, uploading it only if no valid copy is cached.
+
+        `upload` returns the new media item's JSON (at least id and source_url) or None.
+        """
+        try:
+            digest = file_sha256(local_path)
+        except OSError as e:
+            logger.error("I/O error hashing image '%s': %s", local_path, e)
+            return None
+
+        # One upload per hash even when several workers hit the same image at once.
+        with self._lock_for(digest):
+            entry = self.lookup(digest)
+            if entry:
+                logger.info("Reusing media ID %s for '%s'", entry["id"], local_path)
+                return entry
+            media = upload(local_path)
+            if not media or not media.get("id"):
+                return None
+            return self.store(
+                digest,
+                media["id"],
+                source_url=media.get("source_url"),
+                filename=os.path.basename(local_path),
+            )
+
+
+def url_filename(url: str) -> str:
+    """Return the decoded file name at the end of a URL's path."""
+    return unquote(urlsplit(url).path.rsplit("/", 1)[-1])
+
+
+class MediaIndex:
+    """Local index of a site's media library: source URL / file name → media ID.
+
+    The index is persisted between runs and refreshed incrementally by paging the
+    library newest-first until a known media ID is reached. Entries found in the index
+    are verified against the site before use, so deleted media is never reused.
+    """
+
+    def __init__(self, index_path: Path, session) -> None:
+        self.index_path = index_path
+        self.session = session
+        self._lock = threading.Lock()
+        self._refreshed = False
+        self._verified: Set[int] = set()
+        self._data: Dict[str, Any] = {"max_id": 0, "items": {}}
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable media index '%s': %s", index_path, e)
+        self._rebuild_lookups()
+
+    def _rebuild_lookups(self) -> None:
+        self._by_url: Dict[str, int] = {}
+        names: Dict[str, List[int]] = {}
+        for media_id, urls in self._data["items"].items():
+            for url in urls:
+                self._by_url[url] = int(media_id)
+                names.setdefault(url_filename(url), []).append(int(media_id))
+        # A file name only identifies media if exactly one item uses it.
+        self._by_name = {
+            name: ids[0] for name, ids in names.items() if len(set(ids)) == 1
+        }
+
+    def refresh(self) -> None:
+        """Fetch media added since the last refresh (once per run)."""
+        with self._lock:
+            if self._refreshed:
+                return
+            known_max = int(self._data.get("max_id", 0))
+            new_max = known_max
+            page = 1
+            added = 0
+            while True:
+                resp = self.session.get(
+                    "wp/v2/media",
+                    params={
+                        "per_page": MEDIA_PER_PAGE,
+                        "page": page,
+                        "orderby": "id",
+                        "order": "desc",
+                        "_fields": "id,source_url,media_details",
+                    },
+                )
+                resp.raise_for_status()
+                items = resp.json()
+                for item in items:
+                    if item["id"] <= known_max:
+                        continue
+                    new_max = max(new_max, item["id"])
+                    self._data["items"][str(item["id"])] = self._item_urls(item)
+                    added += 1
+                reached_known = any(item["id"] <= known_max for item in items)
+                if reached_known or page >= int(resp.headers.get("X-WP-TotalPages", 1)):
+                    break
+                page += 1
+            self._data["max_id"] = new_max
+            self._refreshed = True
+            if added:
+                write_json_atomic(self.index_path, self._data)
+                self._rebuild_lookups()
+            logger.info(
+                "Media index: %d new item(s), %d total", added, len(self._data["items"])
+            )
+
+    @staticmethod
+    def _item_urls(item: Dict[str, Any]) -> List[str]:
+        """Return the original and every resized URL WordPress generated for an item."""
+        urls = [item.get("source_url", "")]
+        sizes = (item.get("media_details") or {}).get("sizes") or {}
+        urls.extend(size.get("source_url", "") for size in sizes.values())
+        return [url for url in urls if url]
+
+    def _exists_on_site(self, media_id: int) -> bool:
+        if media_id in self._verified:
+            return True
+        try:
+            resp = self.session.get(f"wp/v2/media/{media_id}", params={"_fields": "id"})
+        except RequestException as e:
+            logger.warning("Could not verify media ID %s: %s", media_id, e)
+            return True
+        if resp.status_code in (404, 410):
+            with self._lock:
+                self._data["items"].pop(str(media_id), None)
+                write_json_atomic(self.index_path, self._data)
+                self._rebuild_lookups()
+            return False
+        self._verified.add(media_id)
+        return True
+
+    def lookup(self, url: str) -> Optional[int]:
+        """Return the media ID of an image already on the site, matched by URL or file name."""
+        try:
+            self.refresh()
+        except RequestException as e:
+            logger.warning("Could not refresh media index: %s", e)
+        with self._lock:
+            media_id = self._by_url.get(url) or self._by_name.get(url_filename(url))
+        if media_id and self._exists_on_site(media_id):
+            return media_id
+        return None
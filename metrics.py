@@ -0,0 +1,233 @@
+"""
+Module/Script Name: metrics.py
+
+Description:
+Lightweight per-phase timing for post_pusher.py. Each phase of publishing a file
+(read, HTML processing, image fetch/upload, post creation, move) records its duration
+and byte count per site; totals and latency histograms are written at the end of a run
+as JSON and in Prometheus textfile format. Also wraps a run in cProfile on request.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial phase timers, JSON / Prometheus export and cProfile wrapper
+- v1.01 Listeners are told about each measurement (used for progress events)
+"""
+
+import bisect
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from file_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = "push_it"
+
+
+class _Phase:
+    """Running totals and a fixed-bucket histogram for one (phase, site) pair."""
+
+    __slots__ = ("count", "seconds", "bytes", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds: float, nbytes: int) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.bytes += nbytes
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+_lock = threading.Lock()
+_phases: Dict[Tuple[str, str], _Phase] = {}
+_listeners: List[Callable[[str, str, float, int], None]] = []
+
+
+class Timer:
+    """Handed out by timed(); set `.bytes` inside the block to record a byte count."""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self) -> None:
+        self.bytes = 0
+
+
+def record(phase: str, seconds: float, site: str = "", nbytes: int = 0) -> None:
+    """Add one measurement of `phase` on `site`."""
+    with _lock:
+        entry = _phases.get((phase, site))
+        if entry is None:
+            entry = _phases[(phase, site)] = _Phase()
+        entry.add(seconds, nbytes)
+    for listener in _listeners:
+        listener(phase, site, seconds, nbytes)
+
+
+def add_listener(listener: Callable[[str, str, float, int], None]) -> None:
+    """Call listener(phase, site, seconds, bytes) for every measurement from now on."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+@contextmanager
+def timed(phase: str, site: str = "") -> Iterator[Timer]:
+    """Time the block as one `phase` measurement, whether or not it raises."""
+    timer = Timer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        record(phase, time.perf_counter() - started, site, timer.bytes)
+
+
+def reset() -> None:
+    with _lock:
+        _phases.clear()
+
+
+def snapshot() -> List[Dict[str, Any]]:
+    """Return every phase's totals and cumulative histogram as JSON-ready dicts."""
+    with _lock:
+        items = sorted(_phases.items())
+        rows = []
+        for (phase, site), p in items:
+            cumulative, running = {}, 0
+            for bound, n in zip(list(BUCKETS) + ["+Inf"], p.buckets):
+                running += n
+                cumulative[str(bound)] = running
+            rows.append(
+                {
+                    "phase": phase,
+                    "site": site,
+                    "count": p.count,
+                    "seconds": round(p.seconds, 6),
+                    "avg_seconds": round(p.seconds / p.count, 6) if p.count else 0.0,
+                    "max_seconds": round(p.max, 6),
+                    "bytes": p.bytes,
+                    "buckets": cumulative,
+                }
+            )
+    return rows
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(rows: List[Dict[str, Any]]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    name = f"{METRIC_PREFIX}_phase_duration_seconds"
+    lines = [
+        f"# HELP {name} Time spent in each publishing phase.",
+        f"# TYPE {name} histogram",
+    ]
+    for row in rows:
+        labels = f'phase="{_escape(row["phase"])}",site="{_escape(row["site"])}"'
+        for bound, count in row["buckets"].items():
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {row['seconds']}")
+        lines.append(f"{name}_count{{{labels}}} {row['count']}")
+    name = f"{METRIC_PREFIX}_phase_bytes_total"
+    lines += [
+        f"# HELP {name} Bytes read or sent in each publishing phase.",
+        f"# TYPE {name} counter",
+    ]
+    for row in rows:
+        labels = f'phase="{_escape(row["phase"])}",site="{_escape(row["site"])}"'
+        lines.append(f"{name}{{{labels}}} {row['bytes']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_reports(directory: Path) -> None:
+    """Write metrics.json and metrics.prom into `directory` (e.g. a textfile collector dir)."""
+    rows = snapshot()
+    if not rows:
+        return
+    write_json_atomic(directory / "metrics.json", rows)
+    # The textfile collector may read at any moment, so swap the file in atomically too.
+    prom = directory / "metrics.prom"
+    tmp = prom.with_name(f"{prom.name}.{os.getpid()}.tmp")
+    tmp.write_text(prometheus_text(rows), encoding="utf-8")
+    tmp.replace(prom)
+    logger.info("Metrics written to %s and %s", directory / "metrics.json", prom)
+
+
+def log_totals() -> None:
+    """Log each phase's count, total and average time, slowest phases first."""
+    rows = sorted(snapshot(), key=lambda r: r["seconds"], reverse=True)
+    for row in rows:
+        logger.info(
+            "Phase %-14s %-24s %6d × avg %7.1f ms  max %7.1f ms  total %8.2f s  %d bytes",
+            row["phase"],
+            row["site"],
+            row["count"],
+            row["avg_seconds"] * 1000,
+            row["max_seconds"] * 1000,
+            row["seconds"],
+            row["bytes"],
+        )
+
+
+def profile_run(fn: Callable[[], Any], output: Path) -> Any:
+    """Run `fn` under cProfile, save the stats to `output` and log the top entries.
+
+    Before Python 3.12 cProfile only sees the thread that enabled it, so every thread
+    started during the run gets its own profiler and the results are merged.
+    """
+    profiles: List[cProfile.Profile] = []
+    profiles_lock = threading.Lock()
+    per_thread = sys.version_info < (3, 12)
+
+    def start_thread_profiler(*_: Any) -> None:
+        profiler = cProfile.Profile()
+        with profiles_lock:
+            profiles.append(profiler)
+        profiler.enable()
+
+    main = cProfile.Profile()
+    if per_thread:
+        threading.setprofile(start_thread_profiler)
+    main.enable()
+    try:
+        return fn()
+    finally:
+        main.disable()
+        if per_thread:
+            threading.setprofile(None)
+        stats = pstats.Stats(main)
+        with profiles_lock:
+            for profiler in profiles:
+                stats.add(profiler)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(str(output))
+        summary = io.StringIO()
+        stats.stream = summary
+        stats.sort_stats("cumulative").print_stats(15)
+        logger.info(
+            "Profile saved to %s (python -m pstats %s)\n%s",
+            output,
+            output,
+            summary.getvalue(),
+        )
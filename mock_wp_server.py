@@ -0,0 +1,546 @@
+"""
+Module/Script Name: mock_wp_server.py
+
+Description:
+Self-contained, in-memory stand-in for the parts of the WordPress REST API that
+post_pusher.py and the UI use: posts, media, categories, users/me and batch/v1.
+Latency, server errors and 429 throttling can be injected to see how the publisher
+behaves against a slow or overloaded site without touching a real client site.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial mock server with latency / error / 429 injection
+- v1.01 gzip request bodies (Content-Encoding: gzip), on by default; bytes received
+- v1.02 Post titles carry 'raw'; ?search= on posts; lost_replies for unknown outcomes
+- v1.03 /wp-json index with the site's gmt_offset; post dates are site-local
+- v1.04 batch_supported=False answers batch/v1 with 404, like sites that disable it
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/wp-json"
+MAX_PER_PAGE = 100
+MAX_BATCH_REQUESTS = 25
+POST_STATUSES = ("publish", "future", "draft", "pending", "private")
+
+# (status, body, extra headers)
+Reply = Tuple[int, Any, Dict[str, str]]
+
+
+def wp_error(status: int, code: str, message: str, **data: Any) -> Reply:
+    """Return a WordPress-style REST error reply."""
+    return (
+        status,
+        {"code": code, "message": message, "data": {"status": status, **data}},
+        {},
+    )
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "untitled"
+
+
+def select_fields(item: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """Apply a `_fields=a,b` filter the way WordPress does (top-level keys only)."""
+    if not fields:
+        return item
+    wanted = {f.split(".")[0] for f in fields.split(",")}
+    return {k: v for k, v in item.items() if k in wanted}
+
+
+class MockWordPress:
+    """An in-memory WordPress site served over HTTP on a background thread.
+
+    `latency` (+ up to `jitter`) seconds is added to every request; `error_rate` and
+    `throttle_rate` are the fractions of requests answered with 500 and with 429
+    (plus `Retry-After: retry_after`) before they are processed; the next
+    `lost_replies` write calls are processed but answered with 503. With `gzip_bodies`
+    off, gzip request bodies reach the handlers undecoded, as on a server without an
+    inflate filter. `gmt_offset` is the site's timezone in hours, as in the /wp-json
+    index; post dates are in that zone. Without `batch_supported`, batch/v1 has no
+    route, as on sites that unregister it.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        categories: int = 10,
+        seed: Optional[int] = None,
+        gzip_bodies: bool = True,
+        gmt_offset: float = 0.0,
+        batch_supported: bool = True,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.gzip_bodies = gzip_bodies
+        self.gmt_offset = gmt_offset
+        self.batch_supported = batch_supported
+        # Write calls still to be processed but answered 503, like a proxy timing out.
+        self.lost_replies = 0
+        self.stats: Counter = Counter()
+        self.bytes_received = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.posts: Dict[int, Dict[str, Any]] = {}
+        self.media: Dict[int, Dict[str, Any]] = {}
+        self.categories: Dict[int, Dict[str, Any]] = {}
+        for i in range(1, categories + 1):
+            self._add_category(f"Category {i}")
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.wp = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockWordPress":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock_wp", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockWordPress":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _new_id(self) -> int:
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    def _add_category(self, name: str, parent: int = 0) -> Dict[str, Any]:
+        category = {
+            "id": self._new_id(),
+            "name": name,
+            "slug": slugify(name),
+            "parent": parent,
+            "count": 0,
+        }
+        self.categories[category["id"]] = category
+        return category
+
+    # -- request handling -------------------------------------------------------
+
+    def inject(self) -> Optional[Reply]:
+        """Sleep the configured latency, then maybe return an injected 429 or 500."""
+        delay = self.latency + (
+            self._random.uniform(0, self.jitter) if self.jitter else 0
+        )
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            status, body, _ = wp_error(429, "rest_too_many_requests", "Slow down.")
+            return status, body, {"Retry-After": str(self.retry_after)}
+        if roll < self.throttle_rate + self.error_rate:
+            return wp_error(500, "internal_server_error", "Injected server error.")
+        return None
+
+    def take_lost_reply(self) -> bool:
+        """True (once per lost_replies) if this processed write's reply should be lost."""
+        with self._lock:
+            if self.lost_replies <= 0:
+                return False
+            self.lost_replies -= 1
+            return True
+
+    def handle(
+        self, method: str, route: str, query: Dict[str, List[str]], body: Any
+    ) -> Reply:
+        """Dispatch one REST call (route relative to /wp-json) and return its reply."""
+        route = "/" + route.strip("/")
+        params = {k: v[-1] for k, v in query.items()}
+        if method in ("PUT", "PATCH"):
+            method = "POST"
+        routes = (
+            (r"/", self._index),
+            (r"/wp/v2/posts", self._posts),
+            (r"/wp/v2/posts/(\d+)", self._post),
+            (r"/wp/v2/media", self._media_list),
+            (r"/wp/v2/media/(\d+)", self._media_item),
+            (r"/wp/v2/categories", self._categories),
+            (r"/wp/v2/users/me", self._me),
+            (r"/batch/v1", self._batch),
+        )
+        for pattern, handler in routes:
+            match = re.fullmatch(pattern, route)
+            if match:
+                return handler(method, params, body, *map(int, match.groups()))
+        return wp_error(404, "rest_no_route", "No route was found.")
+
+    @staticmethod
+    def _paged(items: List[Dict[str, Any]], params: Dict[str, str]) -> Reply:
+        try:
+            per_page = int(params.get("per_page", 10))
+            page = int(params.get("page", 1))
+        except ValueError:
+            return wp_error(400, "rest_invalid_param", "Invalid parameter(s).")
+        if not 1 <= per_page <= MAX_PER_PAGE or page < 1:
+            return wp_error(400, "rest_invalid_param", "Invalid parameter(s): per_page")
+        total_pages = max(1, -(-len(items) // per_page))
+        if page > total_pages and items:
+            return wp_error(
+                400, "rest_post_invalid_page_number", "Invalid page number."
+            )
+        chunk = items[(page - 1) * per_page : page * per_page]
+        fields = params.get("_fields")
+        return (
+            200,
+            [select_fields(item, fields) for item in chunk],
+            {"X-WP-Total": str(len(items)), "X-WP-TotalPages": str(total_pages)},
+        )
+
+    def _save_post(self, post: Dict[str, Any], body: Dict[str, Any]) -> Optional[Reply]:
+        status = body.get("status", post.get("status", "draft"))
+        if status not in POST_STATUSES:
+            return wp_error(400, "rest_invalid_param", "Invalid parameter(s): status")
+        for key in (
+            "content",
+            "excerpt",
+            "date",
+            "categories",
+            "featured_media",
+            "meta",
+        ):
+            if key in body:
+                post[key] = body[key]
+        if "title" in body:
+            post["title"] = {"raw": body["title"], "rendered": body["title"]}
+        if body.get("slug"):
+            post["slug"] = body["slug"]
+        post["status"] = status
+        post.setdefault("date", self._site_now())
+        post["modified"] = self._site_now()
+        return None
+
+    def _site_now(self) -> str:
+        """Return the site's wall-clock time as WordPress formats `date`."""
+        now = datetime.now(timezone(timedelta(hours=self.gmt_offset)))
+        return now.replace(tzinfo=None).isoformat(timespec="seconds")
+
+    def _index(self, method: str, params: Dict[str, str], body: Any) -> Reply:
+        info = {
+            "name": "Mock WordPress",
+            "url": self.url,
+            "gmt_offset": self.gmt_offset,
+            "timezone_string": "",
+            "namespaces": ["wp/v2", "batch/v1"],
+        }
+        return 200, select_fields(info, params.get("_fields")), {}
+
+    def _posts(self, method: str, params: Dict[str, str], body: Any) -> Reply:
+        if method == "POST":
+            if not isinstance(body, dict):
+                return wp_error(400, "rest_invalid_json", "Invalid JSON body passed.")
+            with self._lock:
+                post: Dict[str, Any] = {"id": self._new_id()}
+                error = self._save_post(post, body)
+                if error:
+                    return error
+                taken = {p.get("slug") for p in self.posts.values()}
+                slug = post.get("slug") or slugify(
+                    post["title"]["rendered"] if "title" in post else ""
+                )
+                base, n = slug, 2
+                while slug in taken:
+                    slug, n = f"{base}-{n}", n + 1
+                post["slug"] = slug
+                post["link"] = f"{self.url}/{slug}/"
+                self.posts[post["id"]] = post
+            return 201, post, {}
+        if method != "GET":
+            return wp_error(405, "rest_no_route", "No route was found.")
+        with self._lock:
+            items = sorted(self.posts.values(), key=lambda p: p["id"], reverse=True)
+        statuses = params.get("status", "publish").split(",")
+        if "any" not in statuses:
+            items = [p for p in items if p["status"] in statuses]
+        if params.get("slug"):
+            slugs = set(params["slug"].split(","))
+            items = [p for p in items if p["slug"] in slugs]
+        if params.get("after"):
+            items = [p for p in items if p["date"] > params["after"]]
+        if params.get("search"):
+            term = params["search"].lower()
+            items = [
+                p
+                for p in items
+                if term in p.get("title", {}).get("raw", "").lower()
+                or term in str(p.get("content", "")).lower()
+            ]
+        if params.get("orderby") == "date":
+            items.sort(key=lambda p: p["date"], reverse=params.get("order") != "asc")
+        return self._paged(items, params)
+
+    def _post(
+        self, method: str, params: Dict[str, str], body: Any, post_id: int
+    ) -> Reply:
+        with self._lock:
+            post = self.posts.get(post_id)
+            if post is None:
+                return wp_error(404, "rest_post_invalid_id", "Invalid post ID.")
+            if method == "POST":
+                if not isinstance(body, dict):
+                    return wp_error(
+                        400, "rest_invalid_json", "Invalid JSON body passed."
+                    )
+                error = self._save_post(post, body)
+                if error:
+                    return error
+            elif method == "DELETE":
+                del self.posts[post_id]
+            return 200, select_fields(post, params.get("_fields")), {}
+
+    def _media_list(self, method: str, params: Dict[str, str], body: Any) -> Reply:
+        if method == "POST":
+            if not isinstance(body, (bytes, bytearray)) or not body:
+                return wp_error(400, "rest_upload_no_data", "No data supplied.")
+            match = re.search(rb'filename="([^"]+)"', body)
+            name = match.group(1).decode("utf-8", "replace") if match else "upload.bin"
+            with self._lock:
+                media_id = self._new_id()
+                item = {
+                    "id": media_id,
+                    "source_url": f"{self.url}/wp-content/uploads/{media_id}-{name}",
+                    "media_details": {"filesize": len(body), "sizes": {}},
+                }
+                self.media[media_id] = item
+            return 201, item, {}
+        with self._lock:
+            items = sorted(self.media.values(), key=lambda m: m["id"], reverse=True)
+        if params.get("order") == "asc":
+            items.reverse()
+        return self._paged(items, params)
+
+    def _media_item(
+        self, method: str, params: Dict[str, str], body: Any, media_id: int
+    ) -> Reply:
+        with self._lock:
+            item = self.media.get(media_id)
+            if item is None:
+                return wp_error(404, "rest_post_invalid_id", "Invalid post ID.")
+            if method == "DELETE":
+                del self.media[media_id]
+        return 200, select_fields(item, params.get("_fields")), {}
+
+    def _categories(self, method: str, params: Dict[str, str], body: Any) -> Reply:
+        if method == "POST":
+            name = (body or {}).get("name") if isinstance(body, dict) else None
+            if not name:
+                return wp_error(
+                    400, "rest_missing_callback_param", "Missing parameter(s): name"
+                )
+            with self._lock:
+                for category in self.categories.values():
+                    if category["name"].lower() == name.lower():
+                        return wp_error(
+                            400,
+                            "term_exists",
+                            "A term with the name provided already exists.",
+                            term_id=category["id"],
+                        )
+                return 201, self._add_category(name, int(body.get("parent", 0))), {}
+        with self._lock:
+            items = sorted(self.categories.values(), key=lambda c: c["name"])
+        status, page, headers = self._paged(items, params)
+        if status == 200:
+            state = json.dumps(items, sort_keys=True).encode("utf-8")
+            headers["ETag"] = '"' + hashlib.md5(state).hexdigest() + '"'
+        return status, page, headers
+
+    def _me(self, method: str, params: Dict[str, str], body: Any) -> Reply:
+        if method == "POST" and not isinstance(body, dict):
+            return wp_error(400, "rest_invalid_json", "Invalid JSON body passed.")
+        return (
+            200,
+            select_fields(
+                {"id": 1, "name": "mock", "slug": "mock"}, params.get("_fields")
+            ),
+            {},
+        )
+
+    def _batch(self, method: str, params: Dict[str, str], body: Any) -> Reply:
+        if not self.batch_supported:
+            return wp_error(404, "rest_no_route", "No route was found.")
+        if method != "POST" or not isinstance(body, dict):
+            return wp_error(400, "rest_invalid_json", "Invalid JSON body passed.")
+        requests = body.get("requests") or []
+        if len(requests) > MAX_BATCH_REQUESTS:
+            return wp_error(400, "rest_invalid_param", "Invalid parameter(s): requests")
+        responses = []
+        for sub in requests:
+            url = urlsplit(sub.get("path", ""))
+            status, sub_body, headers = self.handle(
+                sub.get("method", "POST").upper(),
+                url.path,
+                parse_qs(url.query),
+                sub.get("body"),
+            )
+            responses.append({"body": sub_body, "status": status, "headers": headers})
+        return 207, {"responses": responses}, {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as a real site would
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        logger.debug("%s " + fmt, self.address_string(), *args)
+
+    def _reply(self, status: int, body: Any, headers: Dict[str, str]) -> None:
+        data = b"" if status == 304 else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self) -> None:
+        wp: MockWordPress = self.server.wp
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        with wp._lock:
+            wp.bytes_received += len(raw)
+        if wp.gzip_bodies and self.headers.get("Content-Encoding") == "gzip":
+            try:
+                raw = gzip.decompress(raw)
+            except (OSError, EOFError):
+                raw = b""
+        route = url.path[len(API_PREFIX) :] if url.path.startswith(API_PREFIX) else None
+
+        if route is None:
+            reply = wp_error(404, "rest_no_route", "No route was found.")
+        elif not self.headers.get("Authorization", "").startswith("Basic "):
+            reply = wp_error(
+                401, "rest_not_logged_in", "You are not currently logged in."
+            )
+        else:
+            reply = wp.inject()
+        if reply is None:
+            body: Any = raw
+            if "json" in (self.headers.get("Content-Type") or ""):
+                try:
+                    body = json.loads(raw or b"null")
+                except ValueError:
+                    body = None
+            reply = wp.handle(self.command, route, parse_qs(url.query), body)
+            if self.command != "GET" and wp.take_lost_reply():
+                reply = wp_error(503, "service_unavailable", "Injected lost reply.")
+            etag = reply[2].get("ETag")
+            if etag and etag == self.headers.get("If-None-Match"):
+                reply = (304, None, {"ETag": etag})
+        with wp._lock:
+            wp.stats[reply[0]] += 1
+        self._reply(*reply)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a mock WordPress REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="extra random seconds"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of 500s"
+    )
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="fraction of 429s"
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="Retry-After seconds"
+    )
+    parser.add_argument("--categories", type=int, default=10, help="categories to seed")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable injection")
+    parser.add_argument(
+        "--gmt-offset", type=float, default=0.0, help="site timezone, hours from UTC"
+    )
+    parser.add_argument(
+        "--no-batch", action="store_true", help="answer batch/v1 with 404"
+    )
+    parser.add_argument(
+        "--no-gzip-bodies",
+        action="store_true",
+        help="do not decode gzip request bodies",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+    wp = MockWordPress(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        categories=args.categories,
+        seed=args.seed,
+        gzip_bodies=not args.no_gzip_bodies,
+        gmt_offset=args.gmt_offset,
+        batch_supported=not args.no_batch,
+    )
+    logger.info("Mock WordPress listening on %s (Ctrl+C to stop)", wp.url)
+    try:
+        wp._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        wp._server.server_close()
+        logger.info("Requests served by status: %s", dict(wp.stats))
+
+
+if __name__ == "__main__":
+    main()
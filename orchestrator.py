@@ -0,0 +1,162 @@
+"""
+Module/Script Name: orchestrator.py
+
+Description:
+Publishes across many profiles (client sites) in one process. A global worker budget
+bounds total concurrency, and a per-wp_url cap keeps one slow host from holding more
+than its share of workers. Prints a per-profile throughput / failure table at the end.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial multi-profile orchestrator with global and per-host limits
+- v1.01 Per-file results on each ProfileRun so run totals count files
+"""
+
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PER_HOST = 2
+
+PublishFn = Callable[[Path, Dict[str, Any], Optional[Dict[str, Any]]], bool]
+
+
+@dataclass
+class ProfileRun:
+    """One profile's share of an orchestrated run, and its results."""
+
+    name: str
+    config: Dict[str, Any]
+    files: List[Path]
+    post_meta: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    succeeded: int = 0
+    failed: int = 0
+    # (file name, ok) for every file published, in completion order
+    results: List[Tuple[str, bool]] = field(default_factory=list)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def host(self) -> str:
+        return self.config["wp_url"].rstrip("/").lower()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+def load_profiles(
+    config_dir: Path, names: Optional[List[str]] = None
+) -> List[Tuple[str, Path]]:
+    """Return (name, path) for every profile JSON in config_dir, or only the named ones."""
+    available = {p.stem: p for p in sorted(config_dir.glob("*.json"))}
+    if names is None:
+        return list(available.items())
+    missing = [n for n in names if n not in available]
+    if missing:
+        raise FileNotFoundError(f"Unknown profile(s): {', '.join(missing)}")
+    return [(n, available[n]) for n in names]
+
+
+def run_profiles(
+    runs: List[ProfileRun],
+    publish: PublishFn,
+    global_workers: int,
+    per_host: int = DEFAULT_PER_HOST,
+) -> List[ProfileRun]:
+    """Publish every run's files with at most `global_workers` in flight overall and
+    `per_host` in flight per wp_url. Files of profiles sharing a host are interleaved.
+    """
+    budget = threading.BoundedSemaphore(global_workers)
+    lock = threading.Lock()
+
+    by_host: Dict[str, List[ProfileRun]] = {}
+    for run in runs:
+        by_host.setdefault(run.host, []).append(run)
+
+    def host_tasks(host_runs: List[ProfileRun]):
+        streams = [[(run, f) for f in run.files] for run in host_runs]
+        for group in itertools.zip_longest(*streams):
+            for task in group:
+                if task is not None:
+                    yield task
+
+    def host_worker(tasks, tasks_lock) -> None:
+        while True:
+            with tasks_lock:
+                task = next(tasks, None)
+            if task is None:
+                return
+            run, path = task
+            with budget:
+                with lock:
+                    if run.started is None:
+                        run.started = time.monotonic()
+                try:
+                    ok = publish(path, run.config, run.post_meta.get(path.name))
+                except Exception:
+                    logger.exception("Unexpected error publishing '%s'", path.name)
+                    ok = False
+                with lock:
+                    run.results.append((path.name, ok))
+                    if ok:
+                        run.succeeded += 1
+                    else:
+                        run.failed += 1
+                    if run.succeeded + run.failed == len(run.files):
+                        run.finished = time.monotonic()
+
+    threads = []
+    for host, host_runs in by_host.items():
+        tasks = host_tasks(host_runs)
+        tasks_lock = threading.Lock()
+        slots = min(per_host, global_workers, sum(len(r.files) for r in host_runs))
+        for i in range(slots):
+            t = threading.Thread(
+                target=host_worker,
+                args=(tasks, tasks_lock),
+                name=f"{host.split('//')[-1]}#{i}",
+            )
+            t.start()
+            threads.append(t)
+    for t in threads:
+        t.join()
+    return runs
+
+
+def format_table(runs: List[ProfileRun]) -> str:
+    """Return a plain-text table of files, successes, failures and throughput per profile."""
+    header = ("Profile", "Files", "OK", "Failed", "Seconds", "Posts/s")
+    rows = []
+    for run in runs:
+        rate = run.succeeded / run.elapsed if run.elapsed else 0.0
+        rows.append(
+            (
+                run.name,
+                str(len(run.files)),
+                str(run.succeeded),
+                str(run.failed),
+                f"{run.elapsed:.1f}",
+                f"{rate:.2f}",
+            )
+        )
+    widths = [max(len(r[i]) for r in [header, *rows]) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(header, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend(
+        "  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows
+    )
+    return "\n".join(lines)
@@ -0,0 +1,197 @@
+"""
+Module/Script Name: payload_reducer.py
+
+Description:
+Optional payload reduction stage for post_pusher.py. Post HTML can be minified
+(comments and indentation dropped, runs of whitespace collapsed, whitespace around
+block tags removed) without touching <pre>, <textarea>, <script> or <style> blocks,
+WordPress block / <!--more--> comments, or the line breaks wpautop turns into <br> and
+<p>. JSON request bodies can be gzip-compressed for sites whose server decodes them,
+which is checked once per site with a tiny probe. Bytes before and after are totalled
+per run.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial safe HTML minifier, gzip request bodies with probe, per-run totals
+"""
+
+import gzip
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Tuple
+
+from requests.exceptions import RequestException
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this go out uncompressed; gzip's header would eat the gain.
+MIN_COMPRESS_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+# Blocks whose contents are copied verbatim.
+_PRESERVED = re.compile(
+    r"<(pre|textarea|script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+# Comments WordPress gives meaning to (block delimiters, more / nextpage markers,
+# conditional comments) are kept; the rest are dropped.
+_COMMENT = re.compile(
+    r"(\s*)<!--(?!\s*/?wp:|\s*(?:more|nextpage|noteaser)\b|\[if|<!\[endif).*?-->(\s*)",
+    re.DOTALL,
+)
+# A tag, with quoted attribute values allowed to contain '>'.
+_TAG = re.compile(r"""(<(?:[^>"']|"[^"]*"|'[^']*')*>)""")
+_QUOTED = re.compile(r"""("[^"]*"|'[^']*')""")
+_STYLE_ATTR_END = re.compile(r"\sstyle\s*=\s*$", re.IGNORECASE)
+_BLOCK_TAG = re.compile(
+    r"</?(?:address|article|aside|blockquote|br|caption|dd|details|div|dl|dt"
+    r"|figcaption|figure|footer|h[1-6]|header|hr|li|main|nav|ol|p|section"
+    r"|summary|table|tbody|td|tfoot|th|thead|tr|ul)\b",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+_totals_lock = threading.Lock()
+_totals = {
+    "posts": 0,
+    "html_in": 0,
+    "html_out": 0,
+    "bodies": 0,
+    "body_in": 0,
+    "body_out": 0,
+}
+
+
+def _collapse(match: "re.Match[str]") -> str:
+    """Shrink a whitespace run without changing what wpautop would make of it."""
+    newlines = match.group(0).count("\n")
+    return "\n\n" if newlines > 1 else "\n" if newlines else " "
+
+
+def _drop_comment(match: "re.Match[str]") -> str:
+    """Remove a comment, keeping the larger of the line breaks around it."""
+    return max(match.group(1), match.group(2), key=lambda ws: ws.count("\n"))
+
+
+def _minify_tag(tag: str) -> str:
+    """Collapse whitespace between attributes and inside style="..." values."""
+    parts = _QUOTED.split(tag)
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            parts[i] = _WHITESPACE.sub(" ", part).replace(" >", ">")
+        elif _STYLE_ATTR_END.search(parts[i - 1]):
+            quote = part[0]
+            css = _WHITESPACE.sub(" ", part[1:-1]).strip()
+            parts[i] = quote + re.sub(r"\s*([;:])\s*", r"\1", css) + quote
+    return "".join(parts)
+
+
+def _minify_chunk(html: str) -> str:
+    """Minify HTML that contains no preserved blocks."""
+    tokens = _TAG.split(_COMMENT.sub(_drop_comment, html))
+    # Even tokens are text, odd tokens are tags.
+    for i in range(1, len(tokens), 2):
+        tokens[i] = _minify_tag(tokens[i])
+    for i in range(0, len(tokens), 2):
+        text = _WHITESPACE.sub(_collapse, tokens[i])
+        if i > 0 and _BLOCK_TAG.match(tokens[i - 1]):
+            text = text.lstrip()
+        if i + 1 < len(tokens) and _BLOCK_TAG.match(tokens[i + 1]):
+            text = text.rstrip()
+        tokens[i] = text
+    return "".join(tokens)
+
+
+def minify_html(html: str) -> str:
+    """Return `html` minified; <pre>, <textarea>, <script> and <style> are left as is."""
+    out: List[str] = []
+    pos = 0
+    for match in _PRESERVED.finditer(html):
+        out.append(_minify_chunk(html[pos : match.start()]))
+        out.append(match.group(0))
+        pos = match.end()
+    out.append(_minify_chunk(html[pos:]))
+    minified = "".join(out).strip()
+    with _totals_lock:
+        _totals["posts"] += 1
+        _totals["html_in"] += len(html.encode("utf-8"))
+        _totals["html_out"] += len(minified.encode("utf-8"))
+    return minified
+
+
+def encode_json(body: Any, compress: bool) -> Tuple[bytes, Dict[str, str]]:
+    """Serialise a request body (gzipped if `compress` and worth it) with its headers."""
+    data = json.dumps(body).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    size_in = len(data)
+    if compress and size_in >= MIN_COMPRESS_BYTES:
+        data = gzip.compress(data, COMPRESS_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    with _totals_lock:
+        _totals["bodies"] += 1
+        _totals["body_in"] += size_in
+        _totals["body_out"] += len(data)
+    return data, headers
+
+
+def accepts_gzip(session) -> bool:
+    """Return True if the site decodes gzip request bodies.
+
+    PHP does not inflate request bodies itself, so this depends on the web server.
+    A gzipped '{}' is POSTed to users/me (an update that changes nothing): a server
+    that passes the bytes through untouched gets 'invalid JSON' back instead of 200.
+    """
+    try:
+        response = session.post(
+            "wp/v2/users/me",
+            data=gzip.compress(b"{}"),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            params={"_fields": "id"},
+        )
+    except RequestException as e:
+        logger.warning("Could not probe gzip request bodies: %s", e)
+        return False
+    return response.status_code == 200
+
+
+def reset_totals() -> None:
+    with _totals_lock:
+        for key in _totals:
+            _totals[key] = 0
+
+
+def totals() -> Dict[str, int]:
+    """Return the HTML and request-body bytes before / after reduction so far this run."""
+    with _totals_lock:
+        return dict(_totals)
+
+
+def _saved(before: int, after: int) -> float:
+    return 100.0 * (before - after) / before if before else 0.0
+
+
+def log_totals() -> None:
+    """Log bytes before and after minification and compression, if either ran."""
+    t = totals()
+    if t["posts"]:
+        logger.info(
+            "HTML minification: %d post(s), %d → %d bytes (saved %.1f%%)",
+            t["posts"],
+            t["html_in"],
+            t["html_out"],
+            _saved(t["html_in"], t["html_out"]),
+        )
+    if t["bodies"] and t["body_in"] != t["body_out"]:
+        logger.info(
+            "Request compression: %d request(s), %d → %d bytes (saved %.1f%%)",
+            t["bodies"],
+            t["body_in"],
+            t["body_out"],
+            _saved(t["body_in"], t["body_out"]),
+        )
@@ -9,34 +9,296 @@ Author(s):
 Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
 
 Created Date: 2025-04-14
-Last Modified Date: 2025-04-17
+Last Modified Date: 2026-10-16
 
 Comments:
 - v1.06 Ready to Zip and Ship: refactored media upload helper, added type hints and docstrings
+- v1.07 Added --workers for concurrent publishing with an end-of-run summary
+- v1.08 All WordPress calls go through the pooled, retrying session in wp_client.py
+- v1.09 Featured images are uploaded once per site via the content-hash media cache
+- v1.10 Publish journal: resumable runs, no move on failure, failed/ dead-letter folder
+- v1.11 Added --batch to create up to 25 posts per request via /wp-json/batch/v1
+- v1.12 Added --manifest: posts.json metadata per post and bulk slug-existence checks
+- v1.13 Remote featured images: reuse site media by URL/filename, else download once
+- v1.14 Optional image_optimization stage (resize, strip metadata, WebP/JPEG) before upload
+- v1.15 Posts are sent with their categories; names resolve to IDs via the category index
+- v1.16 Added --watch daemon mode publishing files as they land in pre-post/
+- v1.17 Added --all-profiles / --profiles with a global worker budget and per-host cap
+- v1.18 Added --adaptive: AIMD concurrency per site driven by 429/503 and latency
+- v1.19 Added --source to publish straight out of zip bundles without extracting
+- v1.20 HTML stage: title from <h1>/<title>, inline images uploaded and src rewritten
+- v1.21 Per-phase timing metrics (JSON + Prometheus textfile) and --profile
+- v1.22 Added --progress-json: JSON-lines progress events on stdout for the GUI
+- v1.23 Run planning / reporting split out and cancellable publish loops for PublishEngine
+- v1.24 Added --sync: content-hash fingerprints per file, update only changed posts
+- v1.25 Added --claim / --claim-status: several hosts drain one shared pre-post/
+- v1.26 Schedule mode spreads posts over free cadence slots (status 'future')
+- v1.27 Optional payload reduction: minify_html and gzip request bodies (compress_requests)
+- v1.28 Site-bound per-profile objects are rebuilt when the URL or login changes
+- v1.29 Per-profile objects are built under a per-key lock, not the registry lock
+- v1.30 Multi-profile run summary lists files (profile/file), not one line per profile
+- v1.31 Progress events carry each file's profile and path
+- v1.32 A create left 'sending' by a crash is looked up by slug or set aside, not re-sent
+- v1.33 So is a create whose request failed without a clear rejection (timeout, 5xx)
+- v1.34 --sync without --manifest leaves manifest-made posts' title, slug and SEO alone
+- v1.35 --claim hosts keep their journal in rollback mode; WAL does not work over NFS/SMB
+- v1.36 Inline images are looked up in pre-post/ and the journal; --sync never sends raw srcs
+- v1.37 Unanswered creates without a slug are found by title and content, then retried
+- v1.38 Schedule slots are planned in the site's timezone, not this machine's
 """
 
 import argparse
+import hashlib
 import json
 import logging
+import os
 import calendar
+import signal
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable, Tuple, Union
+from urllib.parse import urlsplit
 
-import requests
-from requests.exceptions import HTTPError, RequestException
+from requests import Response
+from requests.exceptions import ConnectTimeout, HTTPError, RequestException
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
+import html_processor
+import image_optimizer
+import content_sources
+import metrics
+import progress
+from category_index import CategoryIndex
+from content_sources import ZipMember
+from image_fetcher import RemoteImageCache
+from manifest import (
+    apply_entry,
+    existing_slugs,
+    index_manifest,
+    load_manifest,
+    posts_titled,
+    raw_field,
+)
+from media_cache import MediaCache, MediaIndex
+from orchestrator import (
+    DEFAULT_PER_HOST,
+    ProfileRun,
+    format_table,
+    load_profiles,
+    run_profiles,
 )
+import payload_reducer
+import rate_control
+import schedule_planner
+from publish_journal import STATE_FAILED, STATE_MOVED, STATE_SENDING, PublishJournal
+from watcher import DEFAULT_SETTLE_SECONDS, FolderWatcher
+from work_claims import DEFAULT_LEASE_TTL, WorkClaims, format_status
+from wp_client import DEFAULT_POOL_SIZE, session_for, session_key
+
+# Configure logging
+LOG_FORMAT = "%(asctime)s [%(levelname)s] [%(threadName)s] %(message)s"
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, datefmt=LOG_DATEFMT)
 logger = logging.getLogger(__name__)
 
+CONFIG_DIR = "configs"
+RATE_LIMITS_PATH = Path(".push_it") / "rate_limits.json"
+PROFILE_PATH = Path(".push_it") / "profile.pstats"
+METRICS_DIR = Path(".push_it")
+STATE_DIR_NAME = ".push_it"
+DEFAULT_MAX_ATTEMPTS = 3
+INLINE_IMAGE_WORKERS = 4
+
+# A post source: an HTML file in pre-post/ or an HTML member of a zip bundle.
+Source = Union[Path, ZipMember]
+MAX_BATCH_SIZE = 25  # WordPress core's default limit for /batch/v1
+
+_batch_unsupported: set = set()
+
+# Profile settings that shape a post's payload; changing one makes --sync resend it.
+SYNC_CONFIG_KEYS = ("category_ids", "categories", "featured_image_url")
+# Left as they are on the site when --sync updates a post (no unpublishing typo fixes).
+SYNC_KEEP_ON_SITE = ("status", "date")
+# What a manifest entry sets; left alone when --sync runs without the manifest.
+SYNC_MANIFEST_FIELDS = ("title", "slug", "excerpt", "meta", "featured_media")
+
+# What plan_files() re-raises when a bundle or manifest cannot be used.
+PLAN_ERRORS = (OSError, zipfile.BadZipFile, json.JSONDecodeError, RequestException)
+
+# (kind, state dir) → (session key it was built for, or None, object)
+_profile_objects: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+# One lock per key, held while its object is built (which may mean network I/O), so
+# a slow site only holds up callers waiting for that same object.
+_profile_build_locks: Dict[Tuple[str, str], threading.Lock] = {}
+# Guards the two dicts above; never held while building.
+_profile_objects_lock = threading.Lock()
+
+
+def profile_label(config: Dict[str, Any]) -> str:
+    """Return the profile's name in progress events: its own, else its content folder's."""
+    return config.get("profile_name") or Path(config["content_dir"]).name
+
+
+def site_label(config: Dict[str, Any]) -> str:
+    """Return the host of the profile's site, used to label its metrics."""
+    return urlsplit(config["wp_url"]).netloc
+
+
+def state_dir(config: Dict[str, Any]) -> Path:
+    """Return the per-profile directory that holds local caches and run state.
+
+    `state_dir` in the config overrides it (each --claim host keeps its own).
+    """
+    if config.get("state_dir"):
+        return Path(config["state_dir"])
+    return Path(config["content_dir"]) / STATE_DIR_NAME
+
+
+def _per_profile(
+    kind: str,
+    config: Dict[str, Any],
+    factory: Callable[[Path], Any],
+    per_site: bool = False,
+) -> Any:
+    """Return the shared `kind` object for this profile, building it from its state dir once.
+
+    A `per_site` object talks to the site (it holds a session or a site's answer), so
+    it is rebuilt when the profile's URL, user or password changes, e.g. after a
+    correction in the GUI form.
+    """
+    directory = state_dir(config)
+    key = (kind, str(directory.resolve()))
+    site = session_key(config) if per_site else None
+    with _profile_objects_lock:
+        entry = _profile_objects.get(key)
+        if entry is not None and entry[0] == site:
+            return entry[1]
+        build_lock = _profile_build_locks.setdefault(key, threading.Lock())
+    with build_lock:
+        with _profile_objects_lock:
+            entry = _profile_objects.get(key)
+        if entry is None or entry[0] != site:
+            entry = (site, factory(directory))
+            with _profile_objects_lock:
+                _profile_objects[key] = entry
+        return entry[1]
+
+
+def forget_run_state(config: Dict[str, Any]) -> None:
+    """Drop per-profile values that are only valid for one run of a long-lived process.
+
+    Category names and schedule slots are resolved once per run; a later run may
+    come with an edited config or new scheduled posts on the site, so resolve them
+    again. Caches that check themselves against the site (media, categories,
+    journal) stay warm.
+    """
+    directory = str(state_dir(config).resolve())
+    with _profile_objects_lock:
+        for kind in ("category_ids", "schedule_planner"):
+            _profile_objects.pop((kind, directory), None)
+
+
+def media_cache_for(config: Dict[str, Any]) -> MediaCache:
+    """Return the shared featured-image cache for this profile."""
+    return _per_profile(
+        "media_cache",
+        config,
+        lambda d: MediaCache(d / "media_cache.json", session_for(config)),
+        per_site=True,
+    )
+
+
+def media_index_for(config: Dict[str, Any]) -> MediaIndex:
+    """Return the shared index of this profile's site media library."""
+    return _per_profile(
+        "media_index",
+        config,
+        lambda d: MediaIndex(d / "media_index.json", session_for(config)),
+        per_site=True,
+    )
+
+
+def image_fetcher_for(config: Dict[str, Any]) -> RemoteImageCache:
+    """Return the shared download cache for this profile's remote images."""
+    return _per_profile(
+        "image_fetcher", config, lambda d: RemoteImageCache(d / "images")
+    )
+
+
+def category_index_for(config: Dict[str, Any]) -> CategoryIndex:
+    """Return the shared, cached category index for this profile's site."""
+    return _per_profile(
+        "category_index",
+        config,
+        lambda d: CategoryIndex(d / "categories.json", session_for(config)),
+        per_site=True,
+    )
+
+
+def category_ids_for(config: Dict[str, Any]) -> List[int]:
+    """Return the profile's category IDs, resolving any named `categories` once per run."""
+
+    def resolve(_: Path) -> List[int]:
+        wanted = list(config.get("category_ids", [])) + list(
+            config.get("categories", [])
+        )
+        if all(isinstance(c, int) or str(c).isdigit() for c in wanted):
+            return [int(c) for c in wanted]
+        try:
+            return category_index_for(config).resolve(wanted)
+        except RequestException as e:
+            logger.error("Could not resolve category names: %s", e)
+            return [int(c) for c in wanted if isinstance(c, int) or str(c).isdigit()]
+
+    return _per_profile("category_ids", config, resolve)
+
+
+def schedule_planner_for(config: Dict[str, Any]) -> schedule_planner.SlotPlanner:
+    """Return the profile's slot planner, reading the site's timezone and scheduled posts once per run."""
+
+    def build(_: Path) -> schedule_planner.SlotPlanner:
+        session = session_for(config)
+        try:
+            now = schedule_planner.site_now(schedule_planner.site_timezone(session))
+        except (RequestException, ValueError) as e:
+            logger.warning(
+                "Could not read the site's timezone; using local time: %s", e
+            )
+            now = schedule_planner.site_now()
+        try:
+            booked = schedule_planner.booked_dates(session, now)
+        except RequestException as e:
+            logger.error("Could not read scheduled posts; slots may overlap: %s", e)
+            booked = []
+        return schedule_planner.planner_for(config, booked, now)
+
+    return _per_profile("schedule_planner", config, build)
+
+
+def journal_for(config: Dict[str, Any]) -> PublishJournal:
+    """Return the shared publish journal for this profile.
+
+    Under --claim it lives on the shared filesystem (`shared_state`), where other
+    hosts read it, so it is opened without WAL.
+    """
+    return _per_profile(
+        "journal",
+        config,
+        lambda d: PublishJournal(
+            d / "journal.sqlite3", shared=bool(config.get("shared_state"))
+        ),
+    )
+
 
 def get_schedule_timestamp(day_name: str, time_str: str) -> int:
-    """Return a UNIX timestamp for the next occurrence of day_name at time_str (HH:MM)."""
+    """Return a UNIX timestamp for the next occurrence of day_name at time_str (HH:MM).
+
+    Schedule mode now takes its dates from schedule_planner_for(); this stays for
+    callers that want the single next occurrence.
+    """
     today = datetime.now()
     target_time = datetime.strptime(time_str, "%H:%M").time()
     days_ahead = (list(calendar.day_name).index(day_name) - today.weekday() + 7) % 7
@@ -46,107 +308,1503 @@ def get_schedule_timestamp(day_name: str, time_str: str) -> int:
     return int(target.timestamp())
 
 
-def upload_featured_image(local_path: str, config: Dict[str, Any]) -> Optional[int]:
-    """Upload a local image file to WordPress and return the media ID, or None on failure."""
-    url = f"{config['wp_url'].rstrip('/')}/wp-json/wp/v2/media"
+def upload_media(local_path: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Upload a local image file to WordPress and return the media item, or None on failure."""
+    session = session_for(config)
     try:
-        with open(local_path, "rb") as img_file:
+        with metrics.timed("image_upload", site_label(config)) as timer, open(
+            local_path, "rb"
+        ) as img_file:
+            timer.bytes = os.fstat(img_file.fileno()).st_size
             files = {"file": img_file}
-            response = requests.post(
-                url, auth=(config["username"], config["app_password"]), files=files
-            )
+            response = session.post("wp/v2/media", files=files)
             response.raise_for_status()
-            media_id = response.json().get("id")
-            logger.info("Uploaded featured image '%s' → ID %s", local_path, media_id)
-            return media_id
+            media = response.json()
+            logger.info("Uploaded image '%s' → ID %s", local_path, media.get("id"))
+            return media
     except OSError as e:
         logger.error("I/O error uploading image '%s': %s", local_path, e)
     except HTTPError as e:
         logger.error("HTTP error uploading image '%s': %s", local_path, e)
     except RequestException as e:
         logger.error("Request exception uploading image '%s': %s", local_path, e)
+    except ValueError as e:
+        logger.error("Bad response uploading image '%s': %s", local_path, e)
     return None
 
 
-def publish_file(file_path: Path, config: Dict[str, Any]) -> None:
-    """Process a single HTML file: upload image, post or schedule to WordPress, and move the file."""
-    try:
-        content = file_path.read_text(encoding="utf-8")
-    except OSError as e:
-        logger.error("I/O error reading '%s': %s", file_path, e)
-        return
+def upload_featured_image(local_path: str, config: Dict[str, Any]) -> Optional[int]:
+    """Upload a local image file to WordPress and return the media ID, or None on failure."""
+    media = upload_media(local_path, config)
+    return media.get("id") if media else None
 
-    # Handle featured image
-    img_id: Optional[int] = None
-    img_url = config.get("featured_image_url", "")
+
+def upload_image(local_path: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Optimise and upload a local image once per site; returns its media cache entry."""
+    local_path = prepare_image(local_path, config)
+    return media_cache_for(config).get_or_upload(
+        local_path, lambda path: upload_media(path, config)
+    )
+
+
+def resolve_featured_image(img_url: str, config: Dict[str, Any]) -> Optional[int]:
+    """Return a media ID for a featured image given as a file:// or http(s) URL.
+
+    Remote images already in the site's media library are reused as-is; anything else
+    is downloaded once into the local cache and uploaded through the media cache.
+    """
     if img_url.startswith("file://"):
         local_path = img_url.replace("file://", "")
-        img_id = upload_featured_image(local_path, config)
+    elif img_url.startswith(("http://", "https://")):
+        media_id = media_index_for(config).lookup(img_url)
+        if media_id:
+            logger.info("Featured image already on site as media ID %s", media_id)
+            return media_id
+        local_path = fetch_remote_image(img_url, config)
+        if not local_path:
+            return None
+    else:
+        return None
+    entry = upload_image(local_path, config)
+    return entry["id"] if entry else None
+
+
+def fetch_remote_image(url: str, config: Dict[str, Any]) -> Optional[str]:
+    """Download (or revalidate) a remote image into the profile's cache; returns its path."""
+    with metrics.timed("image_fetch", site_label(config)) as timer:
+        local_path = image_fetcher_for(config).fetch(url)
+        if local_path:
+            timer.bytes = os.path.getsize(local_path)
+        return local_path
+
+
+def inline_image_path(
+    src: str, file_path: Source, config: Dict[str, Any]
+) -> Optional[str]:
+    """Return a local file for an <img src>: beside the HTML file, in its bundle, or downloaded.
+
+    A file already moved to posted/ still finds its images in pre-post/, where they
+    were dropped with it.
+    """
+    if not html_processor.is_local(src):
+        return fetch_remote_image(html_processor.absolute_url(src), config)
+    relative = html_processor.local_path_of(src)
+    if isinstance(file_path, ZipMember):
+        try:
+            data = file_path.read_sibling(relative)
+        except KeyError:
+            return None
+        # Uploads need a real file; name it by content so each image is written once.
+        target = (
+            state_dir(config)
+            / "inline"
+            / (hashlib.sha256(data).hexdigest()[:32] + Path(relative).suffix.lower())
+        )
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f"{target.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+        return str(target)
+    for folder in (file_path.parent, Path(config["content_dir"]) / "pre-post"):
+        path = folder / relative
+        if path.is_file():
+            return str(path)
+    return None
+
+
+def upload_inline_images(
+    soup, file_path: Source, config: Dict[str, Any], require_all: bool = False
+) -> int:
+    """Upload the local and off-site images in a post body in parallel and rewrite their src.
+
+    An image that cannot be found or uploaded now falls back to the URL the journal
+    recorded for it on an earlier publish; failing that it is left as it is, with a
+    warning, unless `require_all` (used by --sync, so an update never swaps a working
+    URL for a dead local path), which raises ValueError instead.
+    Returns the number of <img> tags rewritten.
+    """
+    sources = html_processor.images_to_upload(soup, config["wp_url"])
+    if not sources:
+        return 0
+    journal = journal_for(config)
+    known = journal.inline_images(file_path.name)
+
+    def upload(src: str) -> Optional[str]:
+        try:
+            local_path = inline_image_path(src, file_path, config)
+        except OSError as e:
+            logger.warning("Could not read image '%s': %s", src, e)
+            local_path = None
+        entry = upload_image(local_path, config) if local_path else None
+        if entry and entry.get("source_url"):
+            return entry["source_url"]
+        if known.get(src):
+            return known[src]
+        if not local_path:
+            logger.warning("Image '%s' in '%s' not found", src, file_path.name)
+        return None
+
+    workers = min(
+        len(sources), int(config.get("inline_image_workers", INLINE_IMAGE_WORKERS))
+    )
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="img"
+    ) as pool:
+        new_urls = {
+            src: url for src, url in zip(sources, pool.map(upload, sources)) if url
+        }
+    missing = [src for src in sources if src not in new_urls]
+    if missing and require_all:
+        raise ValueError(f"inline image(s) not found or not uploaded: {missing}")
+    if new_urls:
+        journal.record_inline_images(file_path.name, new_urls)
+    rewritten = html_processor.rewrite_images(soup, new_urls)
+    logger.info(
+        "'%s': %d of %d inline image(s) rewritten",
+        file_path.name,
+        rewritten,
+        len(soup.find_all("img", src=True)),
+    )
+    return rewritten
+
+
+def process_html(
+    content: str,
+    file_path: Source,
+    config: Dict[str, Any],
+    require_images: bool = False,
+) -> Tuple[str, Optional[str]]:
+    """Run the HTML stage on a post body; returns (content, title found in the HTML).
+
+    With `require_images` a missing inline image raises ValueError.
+    """
+    soup = html_processor.parse(content)
+    title = html_processor.extract_title(soup)
+    rewritten = 0
+    if config.get("inline_images", True):
+        rewritten = upload_inline_images(soup, file_path, config, require_images)
+    # Re-serialise only when images were rewritten or the file is a full document (only
+    # its <body> is posted); an untouched fragment goes out byte-for-byte.
+    if rewritten or soup.body is not None:
+        content = html_processor.body_html(soup)
+    if config.get("minify_html"):
+        content = payload_reducer.minify_html(content)
+    return content, title
+
+
+def prepare_image(local_path: str, config: Dict[str, Any]) -> str:
+    """Run the profile's optional image_optimization stage, returning the path to upload."""
+    settings = config.get("image_optimization")
+    if not settings:
+        return local_path
+    try:
+        return image_optimizer.optimize_image(
+            local_path,
+            image_optimizer.normalise_settings(settings),
+            state_dir(config) / "optimized",
+        )
+    except (OSError, ValueError) as e:
+        logger.warning("Could not optimise '%s', uploading original: %s", local_path, e)
+        return local_path
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Return True for errors that retrying will not fix (4xx other than 408/429, bad data)."""
+    if isinstance(error, HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return 400 <= status < 500 and status not in (408, 429)
+    return isinstance(error, (UnicodeDecodeError, ValueError)) and not isinstance(
+        error, RequestException
+    )
+
+
+def is_rejection(error: Exception) -> bool:
+    """Return True if a failed write certainly created nothing on the site.
+
+    That is a 4xx answer (other than 408) or a connection that never opened. Read
+    timeouts, dropped connections, 5xx and unreadable replies leave it unknown.
+    """
+    if isinstance(error, HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return 400 <= status < 500 and status != 408
+    return isinstance(error, ConnectTimeout)
+
+
+def default_title(file_path: Source, html_title: Optional[str]) -> str:
+    """Return the title a post gets without a manifest: the HTML's, else the file name's."""
+    return html_title or file_path.stem.replace("-", " ").title()
+
+
+def build_payload(
+    file_path: Source,
+    config: Dict[str, Any],
+    meta: Optional[Dict[str, Any]] = None,
+    reuse_media: bool = True,
+    schedule: bool = True,
+    require_images: bool = False,
+) -> Dict[str, Any]:
+    """Read an HTML file and build its post payload, uploading the featured image if needed.
+
+    `meta` is the file's manifest entry, if any; its title, slug, SEO fields and
+    featured image take precedence over the profile defaults. A media ID already
+    recorded in the journal is reused instead of uploading again, unless `reuse_media`
+    is False (the featured image setting may have changed). In schedule mode the
+    post takes the next free slot, unless `schedule` is False (it already has its
+    date on the site). The title comes from the HTML's <h1> or <title> when there
+    is one, else from the file name.
+    Raises OSError or UnicodeDecodeError if the file cannot be read, and ValueError
+    if `require_images` and an inline image has no site URL.
+    """
+    meta = meta or {}
+    site = site_label(config)
+    with metrics.timed("read", site) as timer:
+        raw = file_path.read_bytes()
+        timer.bytes = len(raw)
+    with metrics.timed("html", site):
+        content, html_title = process_html(
+            raw.decode("utf-8"), file_path, config, require_images
+        )
+    journal = journal_for(config)
+
+    # Handle featured image
+    entry = journal.get(file_path.name) or {}
+    img_id: Optional[int] = entry.get("media_id") if reuse_media else None
+    img_url = meta.get("featured_image_url") or config.get("featured_image_url", "")
+    if not img_id and img_url:
+        with metrics.timed("featured_image", site):
+            img_id = resolve_featured_image(img_url, config)
+        if img_id and reuse_media:
+            journal.record_image(file_path.name, img_id)
 
     # Build post payload
     payload: Dict[str, Any] = {
-        "title": file_path.stem.replace("-", " ").title(),
+        "title": default_title(file_path, html_title),
         "content": content,
         "status": config.get("post_status", "draft"),
     }
     if img_id:
         payload["featured_media"] = img_id
+    categories = category_ids_for(config)
+    if categories:
+        payload["categories"] = categories
+    apply_entry(payload, meta)
 
-    # Schedule post if needed
-    if config.get("post_status") == "schedule":
-        ts = get_schedule_timestamp(
-            config.get("schedule_day", "Monday"), config.get("schedule_time", "00:00")
-        )
-        payload["date"] = datetime.fromtimestamp(ts).isoformat()
+    # Schedule post if needed: each post gets its own free slot. WordPress calls a
+    # scheduled post's status 'future'; 'schedule' is only this tool's name for it.
+    if schedule and config.get("post_status") == "schedule":
+        slot = schedule_planner_for(config).next_slot()
+        payload["status"] = "future"
+        payload["date"] = slot.isoformat(timespec="seconds")
         logger.info("Scheduling post '%s' for %s", payload["title"], payload["date"])
+    return payload
+
+
+def gzip_bodies_for(config: Dict[str, Any]) -> bool:
+    """True if request bodies should be gzipped: compress_requests is on and the site copes."""
+    if not config.get("compress_requests"):
+        return False
+
+    def probe(_: Path) -> bool:
+        accepted = payload_reducer.accepts_gzip(session_for(config))
+        if accepted:
+            logger.info("%s accepts gzip request bodies", site_label(config))
+        else:
+            logger.warning(
+                "%s does not accept gzip request bodies; sending them uncompressed",
+                site_label(config),
+            )
+        return accepted
+
+    return _per_profile("gzip_bodies", config, probe, per_site=True)
+
+
+def post_json(config: Dict[str, Any], route: str, body: Any) -> Response:
+    """POST a JSON body to the profile's site, compressed when gzip_bodies_for() allows."""
+    data, headers = payload_reducer.encode_json(body, gzip_bodies_for(config))
+    return session_for(config).post(route, data=data, headers=headers)
+
+
+def post_route(post_id: Optional[int] = None) -> str:
+    """Return the REST route that creates a post, or updates `post_id` if given."""
+    return f"wp/v2/posts/{post_id}" if post_id else "wp/v2/posts"
+
+
+def create_post(
+    payload: Dict[str, Any], config: Dict[str, Any], post_id: Optional[int] = None
+) -> int:
+    """Create (or update, given `post_id`) a post and return its ID.
+
+    Raises RequestException or ValueError.
+    """
+    with metrics.timed("create_post", site_label(config)) as timer:
+        response = post_json(config, post_route(post_id), payload)
+        timer.bytes = len(response.request.body or b"")
+    response.raise_for_status()
+    post_id = response.json().get("id")
+    if not post_id:
+        raise ValueError("response did not include a post ID")
+    return post_id
+
+
+def is_redropped(file_path: Source, entry: Dict[str, Any]) -> bool:
+    """True if a file the journal already finished is back in pre-post as new content.
+
+    Bundle members never move, so for them a finished entry just means 'done'.
+    """
+    return isinstance(file_path, Path) and entry.get("state") in (
+        STATE_MOVED,
+        STATE_FAILED,
+    )
 
-    # Create post on WordPress
+
+def meta_hash(config: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> str:
+    """Hash the manifest entry and profile settings that shape a file's post."""
+    settings = {key: config.get(key) for key in SYNC_CONFIG_KEYS}
+    entry = {k: v for k, v in (meta or {}).items() if k != "existing_id"}
+    blob = json.dumps([settings, entry], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def fingerprint(
+    file_path: Source, config: Dict[str, Any], meta: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Return the journal fingerprint of a source file as it is now.
+
+    Bundle members are never synced, so they get none; neither does a file that
+    cannot be read (the next --sync then simply resends it).
+    """
+    if not isinstance(file_path, Path):
+        return {}
     try:
-        response = requests.post(
-            f"{config['wp_url'].rstrip('/')}/wp-json/wp/v2/posts",
-            auth=(config["username"], config["app_password"]),
-            json=payload,
-        )
-        response.raise_for_status()
-        post_id = response.json().get("id")
-        logger.info("Posted '%s' → Post ID %s", payload["title"], post_id)
-    except HTTPError as e:
-        logger.error("HTTP error posting '%s': %s", payload["title"], e)
-    except RequestException as e:
-        logger.error("Request exception for '%s': %s", payload["title"], e)
+        st = file_path.stat()
+        content_hash = hashlib.sha256(file_path.read_bytes()).hexdigest()
+    except OSError:
+        return {}
+    return {
+        "content_hash": content_hash,
+        "meta_hash": meta_hash(config, meta),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "from_manifest": int(any(k != "existing_id" for k in meta or {})),
+    }
+
 
-    # Move file to 'posted' folder
+def move_to_posted(
+    file_path: Source, config: Dict[str, Any], post_id: Optional[int] = None
+) -> bool:
+    """Move a published file into 'posted' and mark it done in the journal."""
+    if isinstance(file_path, ZipMember):
+        # Bundles are read-only: the journal alone records the member as published.
+        journal_for(config).record_moved(file_path.name)
+        logger.info("Published '%s' from bundle", file_path.name)
+        progress.done(file_path, post_id, profile=profile_label(config))
+        return True
     try:
-        dest = file_path.parent.parent / "posted" / file_path.name
-        file_path.replace(dest)
+        dest = Path(config["content_dir"]) / "posted" / file_path.name
+        with metrics.timed("move", site_label(config)):
+            file_path.replace(dest)
         logger.info("Moved '%s' → '%s'", file_path.name, dest)
     except OSError as e:
         logger.error("Error moving '%s' to posted: %s", file_path.name, e)
+        progress.failed(
+            file_path,
+            f"could not move to posted: {e}",
+            retry=True,
+            profile=profile_label(config),
+        )
+        return False
+    journal_for(config).record_moved(file_path.name)
+    progress.done(file_path, post_id, profile=profile_label(config))
+    return True
+
+
+def handle_failure(
+    file_path: Source,
+    config: Dict[str, Any],
+    error: Exception,
+    rejected: Optional[bool] = None,
+) -> None:
+    """Record a failed attempt; dead-letter the file into 'failed' if it cannot succeed.
+
+    Unless `rejected` (default: is_rejection(error)), a create request that was sent
+    stays 'sending', so the next attempt checks the site before posting again.
+    """
+    journal = journal_for(config)
+    if rejected is None:
+        rejected = is_rejection(error)
+    attempts = journal.record_error(file_path.name, str(error), rejected=rejected)
+    max_attempts = int(config.get("max_attempts", DEFAULT_MAX_ATTEMPTS))
+    will_retry = not is_permanent_error(error) and attempts < max_attempts
+    progress.failed(
+        file_path, str(error), retry=will_retry, profile=profile_label(config)
+    )
+    if will_retry:
+        logger.warning(
+            "'%s' failed (attempt %d/%d), will retry next run: %s",
+            file_path.name,
+            attempts,
+            max_attempts,
+            error,
+        )
+        return
+    move_to_failed(
+        file_path, config, str(error), f"after {attempts} attempt(s): {error}"
+    )
+
+
+def move_to_failed(
+    file_path: Source, config: Dict[str, Any], error: str, note: str
+) -> None:
+    """Move a file into 'failed' with `note` in its .error.txt and journal `error`."""
+    journal = journal_for(config)
+    if isinstance(file_path, ZipMember):
+        journal.record_failed(file_path.name, error)
+        logger.error("Giving up on '%s': %s", file_path.name, error)
+        return
+    failed_dir = Path(config["content_dir"]) / "failed"
+    try:
+        failed_dir.mkdir(exist_ok=True)
+        file_path.replace(failed_dir / file_path.name)
+        (failed_dir / f"{file_path.name}.error.txt").write_text(
+            f"{datetime.now().isoformat(timespec='seconds')} {note}\n",
+            encoding="utf-8",
+        )
+    except OSError as e:
+        logger.error("Error moving '%s' to failed: %s", file_path.name, e)
+        return
+    journal.record_failed(file_path.name, error)
+    logger.error("Moved '%s' → '%s': %s", file_path.name, failed_dir, error)
+
+
+def create_interrupted(entry: Dict[str, Any], meta: Dict[str, Any]) -> bool:
+    """True if an earlier attempt sent this file's create request but got no clear answer."""
+    return (
+        entry.get("state") == STATE_SENDING
+        and not entry.get("post_id")
+        and not meta.get("existing_id")  # updating a known post again is harmless
+    )
+
+
+def find_interrupted_post(
+    file_path: Source, config: Dict[str, Any], meta: Dict[str, Any]
+) -> Tuple[str, Optional[int]]:
+    """Look for the post an unanswered create request may have made.
+
+    With a manifest slug the slug decides. Otherwise the site is searched for posts
+    with the same title: one whose raw content is this file's body is the post, and
+    no post with that title means none was made. Returns ('found', post_id),
+    ('absent', None) or ('unsure', None) when posts share the title but not the body.
+    Raises RequestException, OSError, UnicodeDecodeError or ValueError.
+    """
+    session = session_for(config)
+    slug = meta.get("slug")
+    if slug:
+        found = existing_slugs(session, [slug])
+        return ("found", found[slug]) if slug in found else ("absent", None)
+    raw = file_path.read_bytes()
+    content, html_title = process_html(raw.decode("utf-8"), file_path, config)
+    title = meta.get("title") or default_title(file_path, html_title)
+    candidates = posts_titled(session, title)
+    for post in candidates:
+        if raw_field(post, "content").strip() == content.strip():
+            return "found", post["id"]
+    return ("unsure", None) if candidates else ("absent", None)
+
+
+def recover_interrupted(
+    file_path: Source, config: Dict[str, Any], meta: Dict[str, Any]
+) -> Tuple[bool, Optional[int]]:
+    """Decide what to do with a file whose create request's outcome is unknown.
+
+    Returns (proceed, post_id). The site is asked (see find_interrupted_post): a
+    matching post is taken as the one the earlier attempt created, and no such post
+    means it is safe to create it now, as one more ordinary attempt. Only when
+    another post has the same title but different content is there no telling, and
+    the file goes to 'failed' for a person to check. If the lookup itself fails the
+    file is left where it is for the next run.
+    """
+    label = profile_label(config)
+    try:
+        outcome, post_id = find_interrupted_post(file_path, config, meta)
+    except (RequestException, OSError, UnicodeDecodeError, ValueError) as e:
+        logger.error(
+            "Could not check whether '%s' was already posted: %s", file_path.name, e
+        )
+        handle_failure(file_path, config, e, rejected=False)
+        return False, None
+    if outcome == "found":
+        logger.info(
+            "'%s' was posted by an earlier attempt: post %s", file_path.name, post_id
+        )
+        journal_for(config).record_post(
+            file_path.name, post_id, **fingerprint(file_path, config, meta)
+        )
+        return True, post_id
+    if outcome == "absent":
+        logger.info(
+            "'%s' was not created by the earlier attempt; posting it", file_path.name
+        )
+        return True, None
+    error = (
+        "an earlier attempt to create this post got no clear answer, and the site has "
+        "another post with the same title"
+    )
+    progress.failed(file_path, error, retry=False, profile=label)
+    move_to_failed(
+        file_path,
+        config,
+        error,
+        f"{error}. Check before dropping the file into pre-post/ again.",
+    )
+    return False, None
+
+
+def publish_file(
+    file_path: Source, config: Dict[str, Any], meta: Optional[Dict[str, Any]] = None
+) -> bool:
+    """Process a single HTML file: upload image, post or schedule to WordPress, and move the file.
+
+    Each step is recorded in the profile's journal, so a rerun after a crash resumes
+    from the last completed step instead of creating a duplicate post. `meta` is the
+    file's manifest entry; if it carries an `existing_id` that post is updated instead.
+    Returns True once the post exists and the file has been moved to 'posted'.
+    """
+    progress.started(file_path, profile=profile_label(config))
+    with metrics.timed("publish", site_label(config)), progress.current_file(
+        file_path, profile=profile_label(config)
+    ):
+        meta = meta or {}
+        journal = journal_for(config)
+        entry = journal.get(file_path.name) or {}
+        if is_redropped(file_path, entry):
+            # The same file name was dropped into pre-post again: treat it as new content.
+            journal.reset(file_path.name)
+            entry = {}
+
+        post_id = entry.get("post_id")
+        if create_interrupted(entry, meta):
+            proceed, post_id = recover_interrupted(file_path, config, meta)
+            if not proceed:
+                return False
+        if post_id:
+            logger.info(
+                "Resuming '%s': post %s already created", file_path.name, post_id
+            )
+        else:
+            try:
+                payload = build_payload(file_path, config, meta)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error("I/O error reading '%s': %s", file_path, e)
+                handle_failure(file_path, config, e)
+                return False
+
+            # Create (or update) post on WordPress
+            journal.record_sending(file_path.name)
+            try:
+                post_id = create_post(payload, config, meta.get("existing_id"))
+            except (RequestException, ValueError) as e:
+                logger.error("Error posting '%s': %s", payload["title"], e)
+                handle_failure(file_path, config, e)
+                return False
+            journal.record_post(
+                file_path.name, post_id, **fingerprint(file_path, config, meta)
+            )
+            logger.info("Posted '%s' → Post ID %s", payload["title"], post_id)
+
+        # Move file to 'posted' folder
+        return move_to_posted(file_path, config, post_id)
+
+
+def _batch_item_error(sub: Dict[str, Any]) -> HTTPError:
+    """Turn a failed /batch/v1 sub-response into an HTTPError carrying its status."""
+    response = Response()
+    response.status_code = int(sub.get("status") or 500)
+    body = sub.get("body") if isinstance(sub.get("body"), dict) else {}
+    return HTTPError(
+        f"{response.status_code} {body.get('code', 'error')}: {body.get('message', '')}",
+        response=response,
+    )
+
+
+def create_posts_batch(
+    payloads: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    post_ids: Optional[List[Optional[int]]] = None,
+) -> Optional[List[Tuple[Optional[int], Optional[Exception]]]]:
+    """Create posts (or update those with a matching `post_ids` entry) in one request.
+
+    Returns one (post_id, error) pair per payload, in order, or None if the site does not
+    support the batch endpoint. Raises RequestException if the batch request itself fails.
+    """
+    wp_url = config["wp_url"].rstrip("/")
+    if wp_url in _batch_unsupported:
+        return None
+    post_ids = post_ids or [None] * len(payloads)
+    body = {
+        "validation": "normal",
+        "requests": [
+            {"method": "POST", "path": f"/{post_route(post_id)}", "body": payload}
+            for payload, post_id in zip(payloads, post_ids)
+        ],
+    }
+    with metrics.timed("batch_post", site_label(config)) as timer:
+        response = post_json(config, "batch/v1", body)
+        timer.bytes = len(response.request.body or b"")
+    if response.status_code in (404, 405, 501):
+        logger.warning(
+            "Batch endpoint unavailable on %s (HTTP %s); posting one at a time",
+            wp_url,
+            response.status_code,
+        )
+        _batch_unsupported.add(wp_url)
+        return None
+    response.raise_for_status()
+    responses = response.json().get("responses", [])
+    if len(responses) != len(payloads):
+        raise ValueError(
+            f"batch returned {len(responses)} responses for {len(payloads)} posts"
+        )
+
+    results: List[Tuple[Optional[int], Optional[Exception]]] = []
+    for sub in responses:
+        sub_body = sub.get("body") if isinstance(sub.get("body"), dict) else {}
+        if 200 <= int(sub.get("status") or 0) < 300 and sub_body.get("id"):
+            results.append((sub_body["id"], None))
+        else:
+            results.append((None, _batch_item_error(sub)))
+    return results
+
+
+def publish_chunk(
+    files: List[Source],
+    config: Dict[str, Any],
+    post_meta: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, List[str]]:
+    """Publish a group of files with a single batch request, falling back to one per post."""
+    post_meta = post_meta or {}
+    summary: Dict[str, List[str]] = {"succeeded": [], "failed": []}
+    journal = journal_for(config)
+    pending: List[Tuple[Source, Dict[str, Any]]] = []
+    for file_path in files:
+        progress.started(file_path, profile=profile_label(config))
+        entry = journal.get(file_path.name) or {}
+        if is_redropped(file_path, entry):
+            journal.reset(file_path.name)
+            entry = {}
+        meta = post_meta.get(file_path.name) or {}
+        if create_interrupted(entry, meta):
+            proceed, entry["post_id"] = recover_interrupted(file_path, config, meta)
+            if not proceed:
+                summary["failed"].append(file_path.name)
+                continue
+        if entry.get("post_id"):
+            # Already created in an earlier run; only the move is left.
+            ok = move_to_posted(file_path, config, entry["post_id"])
+            summary["succeeded" if ok else "failed"].append(file_path.name)
+            continue
+        try:
+            with progress.current_file(file_path, profile=profile_label(config)):
+                payload = build_payload(file_path, config, meta)
+            pending.append((file_path, payload))
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error("I/O error reading '%s': %s", file_path, e)
+            handle_failure(file_path, config, e)
+            summary["failed"].append(file_path.name)
+
+    if not pending:
+        return summary
+    for file_path, _ in pending:
+        journal.record_sending(file_path.name)
+    try:
+        results = create_posts_batch(
+            [payload for _, payload in pending],
+            config,
+            [post_meta.get(f.name, {}).get("existing_id") for f, _ in pending],
+        )
+    except (RequestException, ValueError) as e:
+        logger.error("Batch of %d posts failed: %s", len(pending), e)
+        for file_path, _ in pending:
+            handle_failure(file_path, config, e)
+            summary["failed"].append(file_path.name)
+        return summary
+    if results is None:
+        for file_path, _ in pending:
+            journal.record_unsent(file_path.name)
+            ok = publish_file(file_path, config, post_meta.get(file_path.name))
+            summary["succeeded" if ok else "failed"].append(file_path.name)
+        return summary
+
+    for (file_path, payload), (post_id, error) in zip(pending, results):
+        if error is not None:
+            logger.error("Error posting '%s': %s", payload["title"], error)
+            handle_failure(file_path, config, error)
+            summary["failed"].append(file_path.name)
+            continue
+        journal.record_post(
+            file_path.name,
+            post_id,
+            **fingerprint(file_path, config, post_meta.get(file_path.name)),
+        )
+        logger.info("Posted '%s' → Post ID %s (batch)", payload["title"], post_id)
+        ok = move_to_posted(file_path, config, post_id)
+        summary["succeeded" if ok else "failed"].append(file_path.name)
+    return summary
+
+
+def publish_batches(
+    files: List[Source],
+    config: Dict[str, Any],
+    batch_size: int,
+    workers: int = 1,
+    post_meta: Optional[Dict[str, Dict[str, Any]]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Dict[str, List[str]]:
+    """Publish files in groups of `batch_size` posts per request, `workers` groups at a time.
+
+    Once `cancel` is set, groups not yet started are left in place and listed as
+    'cancelled'; groups already on the wire finish normally.
+    """
+    chunks = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+    summary: Dict[str, List[str]] = {"succeeded": [], "failed": [], "cancelled": []}
+
+    def publish_unless_cancelled(chunk: List[Source]) -> Dict[str, List[str]]:
+        if cancel is not None and cancel.is_set():
+            return {"cancelled": [f.name for f in chunk]}
+        return publish_chunk(chunk, config, post_meta)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+        for chunk_summary in pool.map(publish_unless_cancelled, chunks):
+            for key, names in chunk_summary.items():
+                summary[key].extend(names)
+    return summary
+
+
+def publish_all(
+    files: List[Source],
+    config: Dict[str, Any],
+    workers: int = 1,
+    post_meta: Optional[Dict[str, Dict[str, Any]]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Dict[str, List[str]]:
+    """Publish files on a pool of up to `workers` threads and return a success/failure summary.
+
+    Once `cancel` is set, files not yet started are left in place and listed as
+    'cancelled'; files already being published finish normally.
+    """
+    post_meta = post_meta or {}
+    summary: Dict[str, List[str]] = {"succeeded": [], "failed": [], "cancelled": []}
+
+    def publish_unless_cancelled(html_file: Source) -> Optional[bool]:
+        if cancel is not None and cancel.is_set():
+            return None
+        return publish_file(html_file, config, post_meta.get(html_file.name))
+
+    def record(html_file: Source, ok: Optional[bool]) -> None:
+        key = "cancelled" if ok is None else "succeeded" if ok else "failed"
+        summary[key].append(html_file.name)
+
+    if workers <= 1:
+        for html_file in files:
+            record(html_file, publish_unless_cancelled(html_file))
+        return summary
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker") as pool:
+        futures = {pool.submit(publish_unless_cancelled, f): f for f in files}
+        for future in as_completed(futures):
+            html_file = futures[future]
+            try:
+                ok = future.result()
+            except Exception:
+                logger.exception("Unexpected error publishing '%s'", html_file.name)
+                ok = False
+            record(html_file, ok)
+    return summary
+
+
+def plan_sync(
+    files: List[Path],
+    config: Dict[str, Any],
+    post_meta: Dict[str, Dict[str, Any]],
+) -> Tuple[List[Tuple[Path, int, Dict[str, Any], bool]], int, List[Path]]:
+    """Work out which published files need their post updated.
+
+    A file whose size, mtime and metadata hash all match the journal is unchanged
+    without being read; otherwise its content hash decides. A file the journal says
+    was published from a manifest entry that `post_meta` lacks is compared on content
+    alone, as is one from an older journal whose metadata hash no longer matches.
+    Returns the changed files as (path, post_id, fingerprint, content_only), the
+    unchanged count, and the files the journal has no post ID for.
+    """
+    journal = journal_for(config)
+    entries = journal.entries()
+    changed: List[Tuple[Path, int, Dict[str, Any], bool]] = []
+    unknown: List[Path] = []
+    unchanged = 0
+    for file_path in files:
+        entry = entries.get(file_path.name) or {}
+        post_id = entry.get("post_id")
+        if not post_id:
+            unknown.append(file_path)
+            continue
+        meta = post_meta.get(file_path.name)
+        st = file_path.stat()
+        same_meta = entry.get("meta_hash") == meta_hash(config, meta)
+        content_only = not meta and (
+            bool(entry.get("from_manifest"))
+            or (entry.get("from_manifest") is None and not same_meta)
+        )
+        if (
+            (same_meta or content_only)
+            and entry.get("size") == st.st_size
+            and entry.get("mtime_ns") == st.st_mtime_ns
+        ):
+            unchanged += 1
+            continue
+        current = fingerprint(file_path, config, meta)
+        if content_only:
+            # The post's metadata is still what the manifest made it.
+            current["meta_hash"] = entry.get("meta_hash")
+            current["from_manifest"] = entry.get("from_manifest")
+        if (same_meta or content_only) and current.get("content_hash") == entry.get(
+            "content_hash"
+        ):
+            # Touched but not edited: remember the new mtime so the next run skips the read.
+            journal.record_synced(file_path.name, post_id, **current)
+            unchanged += 1
+            continue
+        changed.append((file_path, post_id, current, content_only))
+    return changed, unchanged, unknown
+
+
+def sync_file(
+    file_path: Path,
+    post_id: int,
+    current: Dict[str, Any],
+    config: Dict[str, Any],
+    meta: Optional[Dict[str, Any]] = None,
+    content_only: bool = False,
+) -> bool:
+    """Send a changed file's content and metadata to its existing post.
+
+    The post's status and date are left as they are on the site, and with
+    `content_only` so are the fields a manifest sets (SYNC_MANIFEST_FIELDS), rather
+    than overwriting them with values guessed from the file. Failures are journalled
+    but the file stays in 'posted'; the next --sync tries again.
+    """
+    journal = journal_for(config)
+    progress.started(file_path, profile=profile_label(config))
+    with metrics.timed("sync", site_label(config)), progress.current_file(
+        file_path, profile=profile_label(config)
+    ):
+        try:
+            payload = build_payload(
+                file_path,
+                config,
+                meta,
+                reuse_media=False,
+                schedule=False,
+                require_images=True,
+            )
+            keep = SYNC_KEEP_ON_SITE + (SYNC_MANIFEST_FIELDS if content_only else ())
+            for key in keep:
+                payload.pop(key, None)
+            create_post(payload, config, post_id)
+        except (OSError, UnicodeDecodeError, RequestException, ValueError) as e:
+            logger.error(
+                "Error updating '%s' (post %s): %s", file_path.name, post_id, e
+            )
+            journal.record_error(file_path.name, str(e))
+            progress.failed(
+                file_path, str(e), retry=True, profile=profile_label(config)
+            )
+            return False
+        if not content_only:
+            current = dict(current, media_id=payload.get("featured_media"))
+        journal.record_synced(file_path.name, post_id, attempts=0, **current)
+        logger.info(
+            "Updated '%s' → Post ID %s",
+            payload.get("title", file_path.name),
+            post_id,
+        )
+        progress.done(file_path, post_id, profile=profile_label(config))
+        return True
+
+
+def run_sync(config: Dict[str, Any], args: argparse.Namespace) -> Dict[str, List[str]]:
+    """Update the posts of files in posted/ whose content or metadata changed."""
+    files = sorted((Path(config["content_dir"]) / "posted").glob("*.html"))
+    post_meta: Dict[str, Dict[str, Any]] = {}
+    if args.manifest is not None:
+        manifest_path = Path(
+            args.manifest or Path(config["content_dir"]) / "posts.json"
+        )
+        try:
+            manifest = load_manifest(manifest_path)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error("Could not use manifest '%s': %s", manifest_path, e)
+            raise SystemExit(1)
+        post_meta = {
+            f.name: dict(manifest[f.stem]) for f in files if f.stem in manifest
+        }
+
+    changed, unchanged, unknown = plan_sync(files, config, post_meta)
+    if unknown and post_meta:
+        # Published before the journal knew them: find their posts by slug.
+        slugs = [post_meta[f.name]["slug"] for f in unknown if f.name in post_meta]
+        try:
+            found = existing_slugs(session_for(config), slugs) if slugs else {}
+        except RequestException as e:
+            logger.error("Could not look up slugs: %s", e)
+            found = {}
+        still_unknown = []
+        for file_path in unknown:
+            post_id = found.get(post_meta.get(file_path.name, {}).get("slug"))
+            if post_id:
+                changed.append(
+                    (
+                        file_path,
+                        post_id,
+                        fingerprint(file_path, config, post_meta[file_path.name]),
+                        False,
+                    )
+                )
+            else:
+                still_unknown.append(file_path)
+        unknown = still_unknown
+    for file_path in unknown:
+        logger.warning("Not syncing '%s': no post ID recorded for it", file_path.name)
+    content_only = sum(1 for *_, only in changed if only)
+    if content_only:
+        logger.warning(
+            "%d changed post(s) were published from a manifest (or the journal cannot "
+            "tell) and --manifest was not given: syncing their content only, keeping "
+            "their title, slug, excerpt, SEO fields and featured image",
+            content_only,
+        )
+    logger.info(
+        "Sync: %d changed, %d unchanged, %d without a post",
+        len(changed),
+        unchanged,
+        len(unknown),
+    )
+    progress.total(len(changed), profile_label(config))
+
+    summary: Dict[str, List[str]] = {"succeeded": [], "failed": []}
+    with ThreadPoolExecutor(
+        max_workers=args.workers, thread_name_prefix="sync"
+    ) as pool:
+        futures = {
+            pool.submit(
+                sync_file, f, post_id, current, config, post_meta.get(f.name), only
+            ): f
+            for f, post_id, current, only in changed
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                ok = future.result()
+            except Exception:
+                logger.exception("Unexpected error syncing '%s'", file_path.name)
+                ok = False
+            summary["succeeded" if ok else "failed"].append(file_path.name)
+    return summary
+
+
+def plan_manifest(
+    files: List[Source],
+    config: Dict[str, Any],
+    manifest: Dict[str, Dict[str, Any]],
+    on_existing: str,
+) -> Tuple[List[Source], Dict[str, Dict[str, Any]]]:
+    """Join manifest entries (keyed by slug) to files and resolve which posts exist.
+
+    Returns the files still to publish and their per-file metadata. With
+    on_existing='skip' files whose slug is already on the site are journalled and
+    moved to 'posted' without posting; with 'update' they carry an `existing_id`.
+    """
+    post_meta: Dict[str, Dict[str, Any]] = {}
+    for file_path in files:
+        entry = manifest.get(file_path.stem)
+        if entry is None:
+            logger.warning("No manifest entry for '%s'; using defaults", file_path.name)
+            continue
+        post_meta[file_path.name] = dict(entry)
+
+    slugs = [meta["slug"] for meta in post_meta.values()]
+    found = existing_slugs(session_for(config), slugs) if slugs else {}
+    logger.info(
+        "Manifest: %d of %d slugs already exist on site", len(found), len(slugs)
+    )
+
+    to_publish: List[Source] = []
+    for file_path in files:
+        meta = post_meta.get(file_path.name)
+        post_id = found.get(meta["slug"]) if meta else None
+        if post_id and on_existing == "skip":
+            logger.info(
+                "Skipping '%s': slug already exists as post %s", file_path.name, post_id
+            )
+            journal_for(config).record_post(file_path.name, post_id)
+            move_to_posted(file_path, config, post_id)
+            continue
+        if post_id:
+            meta["existing_id"] = post_id
+        to_publish.append(file_path)
+    return to_publish, post_meta
+
+
+def log_summary(summary: Dict[str, List[str]]) -> None:
+    """Log the end-of-run totals and the names of any files that failed."""
+    logger.info(
+        "Run complete: %d succeeded, %d failed",
+        len(summary["succeeded"]),
+        len(summary["failed"]),
+    )
+    for name in sorted(summary["failed"]):
+        logger.warning("Failed: %s", name)
+    if summary.get("cancelled"):
+        logger.info(
+            "Cancelled: %d file(s) left in place for the next run",
+            len(summary["cancelled"]),
+        )
+
+
+def report_run(
+    summary: Dict[str, List[str]], metrics_dir: Path, adaptive: bool = False
+) -> None:
+    """Log and write the end-of-run totals, metrics and progress for one run."""
+    image_optimizer.log_totals()
+    payload_reducer.log_totals()
+    metrics.log_totals()
+    metrics.write_reports(metrics_dir)
+    if adaptive:
+        rate_control.save_limits(RATE_LIMITS_PATH)
+    log_summary(summary)
+    progress.finished(len(summary["succeeded"]), len(summary["failed"]))
+
+
+def enable_adaptive(config: Dict[str, Any], max_limit: int) -> None:
+    """Attach the site's shared adaptive limiter to this profile's session."""
+    session_for(config).limiter = rate_control.limiter_for(
+        config["wp_url"], max_limit, RATE_LIMITS_PATH
+    )
+
+
+def run_watch(
+    configs: List[Dict[str, Any]], workers: int, settle_seconds: float
+) -> Dict[str, List[str]]:
+    """Publish files as they arrive in each profile's pre-post/ until SIGTERM or Ctrl+C.
+
+    Runs in this one process, so HTTP connections and caches stay warm between files.
+    """
+    watcher = FolderWatcher(
+        lambda path, config: publish_file(path, config),
+        workers=workers,
+        settle_seconds=settle_seconds,
+    )
+    for config in configs:
+        watcher.add(Path(config["content_dir"]) / "pre-post", config)
+
+    def request_stop(signum, _frame) -> None:
+        logger.info("Received %s", signal.Signals(signum).name)
+        watcher.stop()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    return watcher.run()
+
+
+def run_all_profiles(
+    profiles: List[Tuple[str, Path]],
+    workers: int,
+    per_host: int,
+    manifest: Optional[str],
+    on_existing: str,
+    adaptive: bool = False,
+) -> Dict[str, List[str]]:
+    """Publish every profile's pre-post/ in parallel and print a per-profile table."""
+    runs: List[ProfileRun] = []
+    for name, path in profiles:
+        config = load_config(str(path))
+        config.setdefault("profile_name", name)
+        config["http_pool_size"] = max(per_host, DEFAULT_POOL_SIZE)
+        if adaptive:
+            enable_adaptive(config, per_host)
+        files = sorted((Path(config["content_dir"]) / "pre-post").glob("*.html"))
+        post_meta: Dict[str, Dict[str, Any]] = {}
+        if manifest is not None and files:
+            manifest_path = Path(config["content_dir"]) / "posts.json"
+            try:
+                files, post_meta = plan_manifest(
+                    files, config, load_manifest(manifest_path), on_existing
+                )
+            except (OSError, json.JSONDecodeError, RequestException) as e:
+                logger.error(
+                    "[%s] Could not use manifest '%s': %s", name, manifest_path, e
+                )
+                continue
+        logger.info("[%s] %d file(s) to publish", name, len(files))
+        progress.total(len(files), profile_label(config))
+        runs.append(ProfileRun(name, config, files, post_meta))
+
+    run_profiles(runs, publish_file, global_workers=workers, per_host=per_host)
+    # stdout carries progress events with --progress-json; keep the table off it.
+    print(format_table(runs), file=sys.stderr if progress.enabled() else sys.stdout)
+    # One entry per file, so totals and the finished event count files, not profiles.
+    return {
+        "succeeded": [f"{r.name}/{f}" for r in runs for f, ok in r.results if ok],
+        "failed": [f"{r.name}/{f}" for r in runs for f, ok in r.results if not ok],
+    }
+
+
+def watch_or_exit(
+    configs: List[Dict[str, Any]], args: argparse.Namespace
+) -> Dict[str, List[str]]:
+    """Run --watch for the given profiles, exiting cleanly if watchdog is missing."""
+    if args.adaptive:
+        for config in configs:
+            enable_adaptive(config, args.workers)
+    try:
+        return run_watch(configs, args.workers, args.settle)
+    except RuntimeError as e:
+        logger.error("%s", e)
+        raise SystemExit(1)
+
+
+def run_single_profile(
+    config: Dict[str, Any], args: argparse.Namespace
+) -> Dict[str, List[str]]:
+    """Publish one profile's pre-post/ according to the command-line options."""
+    if args.workers > int(config.get("http_pool_size", DEFAULT_POOL_SIZE)):
+        config["http_pool_size"] = args.workers
+    if args.adaptive:
+        enable_adaptive(config, args.workers)
+    if args.watch:
+        if args.source:
+            raise SystemExit("--watch cannot be combined with --source")
+        return watch_or_exit([config], args)
+    if args.sync:
+        return run_sync(config, args)
+    if args.claim:
+        return run_claimed(config, args)
+
+    try:
+        files, post_meta = plan_files(config, args.source, args.manifest, args.existing)
+    except PLAN_ERRORS:
+        raise SystemExit(1)
+    if args.batch:
+        return publish_batches(
+            files, config, args.batch, workers=args.workers, post_meta=post_meta
+        )
+    return publish_all(files, config, workers=args.workers, post_meta=post_meta)
+
+
+def run_claimed(
+    config: Dict[str, Any], args: argparse.Namespace
+) -> Dict[str, List[str]]:
+    """Drain a pre-post/ shared with other hosts, claiming one file at a time.
+
+    Files move into in-progress/<host>/ before publishing, so no two hosts ever
+    publish the same file; this host's journal and caches live in its own state dir.
+    """
+    claims = WorkClaims(Path(config["content_dir"]), args.host_id, args.lease_ttl)
+    config["state_dir"] = str(claims.state_dir)
+    config["shared_state"] = True
+    try:
+        claims.start(journal_for(config))
+    except (RuntimeError, OSError) as e:
+        logger.error("Cannot claim work: %s", e)
+        raise SystemExit(1)
+    try:
+        return claims.drain(
+            lambda path: publish_file(path, config), workers=args.workers
+        )
+    finally:
+        claims.stop()
+
+
+def plan_files(
+    config: Dict[str, Any],
+    source: Optional[str] = None,
+    manifest: Optional[str] = None,
+    on_existing: str = "skip",
+) -> Tuple[List[Source], Dict[str, Dict[str, Any]]]:
+    """List one profile's files to publish and join them to their manifest entries.
+
+    `source` and `manifest` mean the same as --source and --manifest. Logs and
+    re-raises one of PLAN_ERRORS if the bundle or manifest cannot be used.
+    """
+    bundle_entries: List[Dict[str, Any]] = []
+    if source:
+        try:
+            files, bundle_entries = bundle_sources(Path(source), config)
+        except (OSError, zipfile.BadZipFile, json.JSONDecodeError) as e:
+            logger.error("Could not read bundle source '%s': %s", source, e)
+            raise
+    else:
+        source_dir = Path(config["content_dir"]) / "pre-post"
+        files = sorted(source_dir.glob("*.html"))
+    progress.total(len(files), profile_label(config))
+
+    post_meta: Dict[str, Dict[str, Any]] = {}
+    if manifest is not None:
+        manifest_path = Path(manifest or Path(config["content_dir"]) / "posts.json")
+        try:
+            if bundle_entries and not manifest:
+                entries = index_manifest(bundle_entries)
+            else:
+                entries = load_manifest(manifest_path)
+            files, post_meta = plan_manifest(files, config, entries, on_existing)
+        except (OSError, json.JSONDecodeError, RequestException) as e:
+            logger.error("Could not use manifest '%s': %s", manifest_path, e)
+            raise
+    return files, post_meta
+
+
+def bundle_sources(
+    source: Path, config: Dict[str, Any]
+) -> Tuple[List[Source], List[Dict[str, Any]]]:
+    """List the unpublished HTML members of a zip bundle (or a folder of bundles).
+
+    Members the journal already records as published or failed are left out. Also
+    returns the entries of any posts.json shipped inside the bundles.
+    """
+    journal = journal_for(config)
+    members: List[Source] = []
+    entries: List[Dict[str, Any]] = []
+    for archive in content_sources.archives_in(source):
+        found = content_sources.list_members(archive)
+        todo = [
+            m
+            for m in found
+            if (journal.get(m.name) or {}).get("state")
+            not in (STATE_MOVED, STATE_FAILED)
+        ]
+        logger.info(
+            "Bundle '%s': %d HTML member(s), %d to publish",
+            archive.name,
+            len(found),
+            len(todo),
+        )
+        members.extend(todo)
+        entries.extend(content_sources.bundle_manifest(archive) or [])
+    return members, entries
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load and return the JSON configuration from the given path."""
     try:
         with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            config = json.load(f)
     except FileNotFoundError:
         logger.error("Configuration file not found: %s", config_path)
         raise
     except json.JSONDecodeError as e:
         logger.error("Invalid JSON in config file: %s", e)
         raise
+    if config.get("post_status") == "schedule":
+        try:
+            schedule_planner.parse_settings(config)
+        except ValueError as e:
+            logger.error("Invalid schedule settings in %s: %s", config_path, e)
+            raise
+    return config
 
 
 def main() -> None:
     """Entry point: parse args, load config, and process all HTML files in pre-post directory."""
     parser = argparse.ArgumentParser(description="Publish posts to WordPress")
-    parser.add_argument("--config", required=True, help="Path to JSON config file")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--config", help="Path to JSON config file")
+    target.add_argument(
+        "--all-profiles",
+        action="store_true",
+        help=f"Publish every profile in {CONFIG_DIR}/ in parallel",
+    )
+    target.add_argument(
+        "--profiles",
+        metavar="A,B,C",
+        help=f"Publish the named profiles from {CONFIG_DIR}/ in parallel",
+    )
+    parser.add_argument(
+        "--source",
+        metavar="PATH",
+        help="Publish from a zip bundle (or a folder of zips) instead of pre-post/; "
+        "members are read in place and never extracted",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help="With --all-profiles/--profiles, max concurrent files per wp_url "
+        f"(default: {DEFAULT_PER_HOST}); --workers is the global budget",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of files to publish concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="?",
+        type=int,
+        const=MAX_BATCH_SIZE,
+        default=0,
+        metavar="SIZE",
+        help=f"Create up to SIZE posts per request via /wp-json/batch/v1 "
+        f"(default SIZE: {MAX_BATCH_SIZE}; 0 turns batching off)",
+    )
+    parser.add_argument(
+        "--manifest",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Take title, slug and SEO metadata from a posts.json manifest "
+        "(default PATH: <content_dir>/posts.json)",
+    )
+    parser.add_argument(
+        "--existing",
+        choices=("skip", "update"),
+        default="skip",
+        help="With --manifest, what to do with posts whose slug already exists",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update the posts of files in posted/ whose HTML or metadata changed "
+        "since they were last sent; unchanged files cost no network call",
+    )
+    parser.add_argument(
+        "--claim",
+        action="store_true",
+        help="Share pre-post/ with other hosts: claim each file by moving it into "
+        "in-progress/<host>/ before publishing; files of hosts whose lease expired "
+        "are reclaimed",
+    )
+    parser.add_argument(
+        "--host-id",
+        default=None,
+        metavar="NAME",
+        help="With --claim, this worker's name (default: the machine's hostname)",
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=DEFAULT_LEASE_TTL,
+        metavar="SECONDS",
+        help="With --claim, seconds without a heartbeat before a host's files are "
+        f"reclaimed (default: {DEFAULT_LEASE_TTL:.0f})",
+    )
+    parser.add_argument(
+        "--claim-status",
+        action="store_true",
+        help="Show each host's lease and progress on the profile's pre-post/ and exit",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adapt concurrency per site to 429/503s and latency; --workers "
+        "(or --per-host) becomes the ceiling and the safe limit is remembered",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and publish files as they are dropped into pre-post/",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        metavar="SECONDS",
+        help="With --watch, how long a file must stay unchanged before publishing "
+        "when its writer's close cannot be seen, e.g. off Linux "
+        f"(default: {DEFAULT_SETTLE_SECONDS})",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        default=str(METRICS_DIR),
+        metavar="DIR",
+        help="Where to write per-phase timings as metrics.json and metrics.prom "
+        f"(Prometheus textfile format; default: {METRICS_DIR})",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=str(PROFILE_PATH),
+        default=None,
+        metavar="PATH",
+        help=f"Run under cProfile and save the stats (default PATH: {PROFILE_PATH})",
+    )
+    parser.add_argument(
+        "--progress-json",
+        action="store_true",
+        help="Write JSON-lines progress events (total, started, phase, done, failed) "
+        "to stdout; logs stay on stderr",
+    )
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not 0 <= args.batch <= MAX_BATCH_SIZE:
+        parser.error(f"--batch must be between 0 (off) and {MAX_BATCH_SIZE}")
+    if args.per_host < 1:
+        parser.error("--per-host must be at least 1")
+
+    if (args.all_profiles or args.profiles) and (
+        args.batch or args.source or args.sync
+    ):
+        parser.error("--batch, --source and --sync only apply to a single --config")
+    if args.sync and (args.batch or args.source or args.watch):
+        parser.error("--sync cannot be combined with --batch, --source or --watch")
+    if (args.claim or args.claim_status) and not args.config:
+        parser.error("--claim and --claim-status need a single --config")
+    if args.claim and (
+        args.batch or args.source or args.watch or args.sync or args.manifest
+    ):
+        parser.error(
+            "--claim cannot be combined with --batch, --source, --watch, --sync "
+            "or --manifest"
+        )
+    if args.lease_ttl <= 0:
+        parser.error("--lease-ttl must be positive")
+    if args.claim_status:
+        print(format_status(Path(load_config(args.config)["content_dir"])))
+        return
+    if args.progress_json:
+        progress.enable(sys.stdout)
+
+    def run() -> Dict[str, List[str]]:
+        if not (args.all_profiles or args.profiles):
+            return run_single_profile(load_config(args.config), args)
+        names = (
+            None
+            if args.all_profiles
+            else [n.strip() for n in args.profiles.split(",") if n.strip()]
+        )
+        try:
+            profiles = load_profiles(Path(CONFIG_DIR), names)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        if args.watch:
+            configs = [load_config(str(path)) for _, path in profiles]
+            return watch_or_exit(configs, args)
+        return run_all_profiles(
+            profiles,
+            args.workers,
+            args.per_host,
+            args.manifest,
+            args.existing,
+            adaptive=args.adaptive,
+        )
+
+    if args.profile:
+        summary = metrics.profile_run(run, Path(args.profile))
+    else:
+        summary = run()
 
-    config = load_config(args.config)
-    source_dir = Path(config["content_dir"]) / "pre-post"
-    for html_file in source_dir.glob("*.html"):
-        publish_file(html_file, config)
+    report_run(summary, Path(args.metrics_dir), adaptive=args.adaptive)
 
 
 if __name__ == "__main__":
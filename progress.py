@@ -0,0 +1,228 @@
+"""
+Module/Script Name: progress.py
+
+Description:
+Machine-readable progress protocol between post_pusher.py and the GUI. With
+--progress-json, post_pusher writes one JSON object per line to stdout (logs stay on
+stderr): a run total, then started / phase / done / failed events per file with
+timings. Per-file events name the profile and the file's path as well as its name, so
+two profiles' files of the same name stay apart. RunProgress is the reading side: it
+folds those events into counts, per-file rows, throughput and an ETA.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial JSON-lines emitter and RunProgress reader
+- v1.01 Per-file events and rows are keyed by profile and path, not bare file name
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import metrics
+
+# Event names (the "event" field of every line).
+TOTAL = "total"
+STARTED = "started"
+PHASE = "phase"
+DONE = "done"
+FAILED = "failed"
+FINISHED = "finished"
+
+_stream: Optional[IO[str]] = None
+_lock = threading.Lock()
+_started: Dict[Tuple[str, str], float] = {}
+_local = threading.local()
+
+
+def emit(event: str, **fields: Any) -> None:
+    """Write one event line if progress output is enabled; a no-op otherwise."""
+    if _stream is None:
+        return
+    line = json.dumps({"event": event, "ts": round(time.time(), 3), **fields})
+    with _lock:
+        _stream.write(line + "\n")
+        _stream.flush()
+
+
+def file_fields(path: Any, profile: str = "") -> Dict[str, str]:
+    """Return what identifies a file in per-file events: its name, path and profile."""
+    return {
+        "file": getattr(path, "name", str(path)),
+        "path": str(path),
+        "profile": profile,
+    }
+
+
+def _on_phase(phase: str, site: str, seconds: float, nbytes: int) -> None:
+    fields = getattr(_local, "file", None)
+    if fields is not None and phase != "publish":
+        emit(
+            PHASE,
+            **fields,
+            phase=phase,
+            site=site,
+            seconds=round(seconds, 4),
+            bytes=nbytes,
+        )
+
+
+def enable(stream: IO[str]) -> None:
+    """Send progress events to `stream` (normally sys.stdout) from now on."""
+    global _stream
+    _stream = stream
+    metrics.add_listener(_on_phase)
+
+
+def enabled() -> bool:
+    return _stream is not None
+
+
+def total(count: int, profile: str = "") -> None:
+    """Announce how many files a profile is about to publish (watch mode never does)."""
+    emit(TOTAL, total=count, profile=profile)
+
+
+def started(path: Any, profile: str = "") -> None:
+    fields = file_fields(path, profile)
+    with _lock:
+        _started[(profile, fields["path"])] = time.monotonic()
+    emit(STARTED, **fields)
+
+
+def _elapsed(fields: Dict[str, str]) -> Optional[float]:
+    with _lock:
+        began = _started.pop((fields["profile"], fields["path"]), None)
+    return round(time.monotonic() - began, 4) if began is not None else None
+
+
+def done(path: Any, post_id: Optional[int] = None, profile: str = "") -> None:
+    fields = file_fields(path, profile)
+    emit(DONE, **fields, post_id=post_id, seconds=_elapsed(fields))
+
+
+def failed(path: Any, error: str, retry: bool = False, profile: str = "") -> None:
+    """Report a file that failed this run; `retry` means a later run will try again."""
+    fields = file_fields(path, profile)
+    emit(FAILED, **fields, error=error, retry=retry, seconds=_elapsed(fields))
+
+
+def finished(succeeded: int, failures: int) -> None:
+    emit(FINISHED, succeeded=succeeded, failed=failures)
+
+
+@contextmanager
+def current_file(path: Any, profile: str = "") -> Iterator[None]:
+    """Attribute phase timings recorded on this thread to `path` while inside the block."""
+    previous = getattr(_local, "file", None)
+    _local.file = file_fields(path, profile)
+    try:
+        yield
+    finally:
+        _local.file = previous
+
+
+class RunProgress:
+    """Reader side: folds progress events into totals, per-file rows and an ETA."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.finished = False
+        self.rows: List[Dict[str, Any]] = []  # one per file, in order first seen
+        self.profiles: Set[str] = set()
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._first_ts: Optional[float] = None
+        self._last_ts: Optional[float] = None
+
+    @property
+    def completed(self) -> int:
+        return self.done + self.failed
+
+    def _row(self, name: str, path: str, profile: str) -> int:
+        """Return the row index for a file, adding a row (and growing the total) if new."""
+        key = (profile, path)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.rows)
+            self.profiles.add(profile)
+            self.rows.append(
+                {
+                    "file": name,
+                    "profile": profile,
+                    "path": path,
+                    "status": "queued",
+                    "phase": "",
+                    "seconds": None,
+                    "detail": "",
+                }
+            )
+            # Files nobody announced (watch mode, skipped manifest entries) still count.
+            self.total = max(self.total, len(self.rows))
+        return index
+
+    def apply(self, event: Dict[str, Any]) -> Optional[int]:
+        """Apply one parsed event; returns the index of the row it changed, if any."""
+        kind = event.get("event")
+        ts = event.get("ts")
+        if isinstance(ts, (int, float)):
+            if self._first_ts is None:
+                self._first_ts = ts
+            self._last_ts = ts
+        if kind == TOTAL:
+            self.total += int(event.get("total", 0))
+            return None
+        if kind == FINISHED:
+            self.finished = True
+            return None
+        name = event.get("file")
+        if not name:
+            return None
+        # Events from before paths were sent carry only the name.
+        index = self._row(name, event.get("path") or name, event.get("profile") or "")
+        row = self.rows[index]
+        if kind == STARTED:
+            row["status"] = "running"
+        elif kind == PHASE:
+            row["phase"] = event.get("phase", "")
+        elif kind == DONE:
+            if row["status"] not in ("done", "failed"):
+                self.done += 1
+            row.update(status="done", phase="", seconds=event.get("seconds"))
+            if event.get("post_id"):
+                row["detail"] = f"post {event['post_id']}"
+        elif kind == FAILED:
+            if row["status"] not in ("done", "failed"):
+                self.failed += 1
+            row.update(status="failed", phase="", seconds=event.get("seconds"))
+            row["detail"] = event.get("error", "")
+        return index
+
+    def feed(self, line: str) -> Optional[int]:
+        """Parse and apply one line; non-JSON lines raise ValueError."""
+        event = json.loads(line)
+        if not isinstance(event, dict):
+            raise ValueError("progress event is not an object")
+        return self.apply(event)
+
+    def throughput(self) -> float:
+        """Files completed per second since the first event."""
+        if self._first_ts is None or self._last_ts is None:
+            return 0.0
+        elapsed = self._last_ts - self._first_ts
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        """Seconds left at the current throughput, or None before there is a rate."""
+        rate = self.throughput()
+        if rate <= 0:
+            return None
+        return max(0, self.total - self.completed) / rate
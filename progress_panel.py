@@ -0,0 +1,182 @@
+"""
+Module/Script Name: progress_panel.py
+
+Description:
+Run progress widget for the GUI. Feeds post_pusher.py's --progress-json lines into a
+RunProgress and shows them as a determinate progress bar, live throughput / ETA and a
+per-file status table (model/view, so thousands of rows stay cheap).
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial progress bar, throughput / ETA label and file status table
+- v1.01 File column names the profile once a run spans more than one
+"""
+
+from typing import Any, Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QHeaderView,
+    QLabel,
+    QProgressBar,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from progress import RunProgress
+
+STATUS_COLOURS = {"done": "#2e7d32", "failed": "#c62828", "running": "#1565c0"}
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "–"
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class FileStatusModel(QAbstractTableModel):
+    """Table model over RunProgress.rows: one row per file."""
+
+    COLUMNS = ("File", "Status", "Phase", "Time", "Details")
+
+    def __init__(self, run: RunProgress, parent=None):
+        super().__init__(parent)
+        self.run = run
+        self._shown = 0  # rows the view has been told about
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._shown
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = self.run.rows[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                if len(self.run.profiles) > 1:
+                    return f"{row['profile']}/{row['file']}"
+                return row["file"]
+            if column == 1:
+                return row["status"]
+            if column == 2:
+                return row["phase"]
+            if column == 3:
+                return "" if row["seconds"] is None else f"{row['seconds']:.2f}s"
+            return row["detail"]
+        if role == Qt.ItemDataRole.ToolTipRole and column == 0:
+            return row["path"] or None
+        if role == Qt.ItemDataRole.ToolTipRole and column == 4:
+            return row["detail"] or None
+        if role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            colour = STATUS_COLOURS.get(row["status"])
+            return QColor(colour) if colour else None
+        return None
+
+    def reset_run(self, run: RunProgress) -> None:
+        self.beginResetModel()
+        self.run = run
+        self._shown = 0
+        self.endResetModel()
+
+    def row_updated(self, row: int) -> None:
+        """Tell the view a row changed, inserting any rows it has not seen yet."""
+        if row >= self._shown:
+            self.beginInsertRows(QModelIndex(), self._shown, len(self.run.rows) - 1)
+            self._shown = len(self.run.rows)
+            self.endInsertRows()
+            return
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.COLUMNS) - 1)
+        )
+
+
+class ProgressPanel(QWidget):
+    """Progress bar, throughput / ETA line and per-file table for one post_pusher run."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.run = RunProgress()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        self.stats_label = QLabel("")
+        self.model = FileStatusModel(self.run, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setStretchLastSection(True)
+        self.table.setMinimumHeight(160)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.stats_label)
+        layout.addWidget(self.table)
+
+    def start(self) -> None:
+        """Clear the previous run and show a busy bar until the total arrives."""
+        self.run = RunProgress()
+        self.model.reset_run(self.run)
+        self.progress_bar.setRange(0, 0)
+        self.stats_label.setText("Starting…")
+
+    def feed_line(self, line: str) -> bool:
+        """Apply one line of post_pusher stdout; returns False if it was not an event."""
+        try:
+            row = self.run.feed(line)
+        except ValueError:
+            return False
+        if row is not None:
+            self.model.row_updated(row)
+            if self.run.rows[row]["status"] == "running":
+                self.table.scrollTo(self.model.index(row, 0))
+        self._refresh()
+        return True
+
+    def _refresh(self) -> None:
+        run = self.run
+        if run.total:
+            self.progress_bar.setRange(0, run.total)
+            self.progress_bar.setValue(run.completed)
+        rate = run.throughput()
+        text = (
+            f"{run.completed}/{run.total} files · {run.done} done · {run.failed} failed"
+        )
+        if rate:
+            text += f" · {rate:.1f} files/s · ETA {format_duration(run.eta_seconds())}"
+        self.stats_label.setText(text)
+
+    def finish(self) -> None:
+        """Show the final state once the process has exited."""
+        if self.run.total:
+            self._refresh()
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(100)
+            self.stats_label.setText("No files to publish")
@@ -0,0 +1,115 @@
+"""
+Module/Script Name: publish_engine.py
+
+Description:
+post_pusher.py as a reusable object. A PublishEngine runs profiles in the calling
+process, so HTTP sessions, media / category caches and journals stay open between
+runs instead of being rebuilt by a new interpreter each time. A run can be cancelled
+from another thread: files not yet started are left in pre-post/ for the next run.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial in-process engine with cooperative cancellation
+- v1.01 Payload reduction totals are reset per run too
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import image_optimizer
+import metrics
+import payload_reducer
+import post_pusher
+from wp_client import DEFAULT_POOL_SIZE, close_sessions
+
+logger = logging.getLogger(__name__)
+
+
+class PublishEngine:
+    """Publishes one profile per run() with warm sessions and caches.
+
+    Runs are serialised; call run() from a background thread and cancel() from any
+    thread. Cancelling never interrupts a request on the wire: files already in
+    progress finish (the journal makes that safe either way) and the rest are skipped.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        batch: int = 0,
+        metrics_dir: Path = post_pusher.METRICS_DIR,
+    ) -> None:
+        self.workers = workers
+        self.batch = batch
+        self.metrics_dir = metrics_dir
+        self._cancel = threading.Event()
+        self._run_lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Stop starting new files; the current run returns once in-flight files finish."""
+        if not self._cancel.is_set():
+            logger.info("Cancelling: finishing files in progress, skipping the rest")
+        self._cancel.set()
+
+    def run(
+        self,
+        config_path: str,
+        source: Optional[str] = None,
+        manifest: Optional[str] = None,
+        on_existing: str = "skip",
+    ) -> Dict[str, List[str]]:
+        """Publish the profile at `config_path` and return the run summary.
+
+        The config file is read again each run so edits are picked up; everything
+        keyed on its credentials and content_dir is reused. Raises one of
+        post_pusher.PLAN_ERRORS if the bundle or manifest cannot be used.
+        """
+        with self._run_lock:
+            self._cancel.clear()
+            config = post_pusher.load_config(config_path)
+            if self.workers > int(config.get("http_pool_size", DEFAULT_POOL_SIZE)):
+                config["http_pool_size"] = self.workers
+            post_pusher.forget_run_state(config)
+            metrics.reset()
+            image_optimizer.reset_totals()
+            payload_reducer.reset_totals()
+
+            files, post_meta = post_pusher.plan_files(
+                config, source, manifest, on_existing
+            )
+            if self.batch:
+                summary = post_pusher.publish_batches(
+                    files,
+                    config,
+                    self.batch,
+                    workers=self.workers,
+                    post_meta=post_meta,
+                    cancel=self._cancel,
+                )
+            else:
+                summary = post_pusher.publish_all(
+                    files,
+                    config,
+                    workers=self.workers,
+                    post_meta=post_meta,
+                    cancel=self._cancel,
+                )
+            post_pusher.report_run(summary, Path(self.metrics_dir))
+            return summary
+
+    def close(self) -> None:
+        """Cancel any run and close pooled connections; call when the application exits."""
+        self.cancel()
+        with self._run_lock:
+            close_sessions()
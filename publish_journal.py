@@ -0,0 +1,206 @@
+"""
+Module/Script Name: publish_journal.py
+
+Description:
+Crash-safe SQLite journal recording each source file's progress through the publish
+pipeline (image uploaded → post created → file moved, or failed), so an interrupted
+run can resume without repeating network calls. Each published file also keeps a
+fingerprint (content / metadata hashes and its size and mtime) so a sync run can tell
+which posts changed without reading unchanged files or touching the network.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial journal with per-file state, attempt counts and last error
+- v1.01 Per-file fingerprint columns for incremental sync; entries() bulk read
+- v1.02 'sending' state marks a create request whose outcome is not yet known
+- v1.03 record_unsent() for batch requests the site refused outright
+- v1.04 record_error() keeps 'sending' unless the site clearly rejected the request
+- v1.05 from_manifest fingerprint column: whether a manifest entry shaped the post
+- v1.06 `shared` journals (on a network filesystem) use rollback, not WAL, journaling
+- v1.07 inline_images column: the site URL each local <img src> was uploaded to
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+STATE_IMAGE_UPLOADED = "image_uploaded"
+STATE_SENDING = "sending"  # create request sent, no post ID back yet
+STATE_POST_CREATED = "post_created"
+STATE_MOVED = "moved"
+STATE_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    media_id INTEGER,
+    post_id INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at TEXT NOT NULL
+)
+"""
+# Added in v1.01 / v1.05 / v1.07; older journals get them via ALTER TABLE on open.
+ADDED_COLUMNS = {
+    "content_hash": "TEXT",
+    "meta_hash": "TEXT",
+    "size": "INTEGER",
+    "mtime_ns": "INTEGER",
+    # 1 if the post was made from a manifest entry, 0 if not; NULL in older journals.
+    "from_manifest": "INTEGER",
+    # JSON {src: site URL} of the post's inline images, so a later sync can reuse them.
+    "inline_images": "TEXT",
+}
+
+
+class PublishJournal:
+    """Thread-safe per-profile record of where each file is in the publish pipeline."""
+
+    def __init__(self, db_path: Path, shared: bool = False) -> None:
+        """Open (creating if needed) the journal at `db_path`.
+
+        `shared` is for a journal on a network filesystem that other hosts read:
+        SQLite's WAL mode needs shared memory those hosts cannot see, so such a
+        journal keeps every committed row in the database file itself.
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            mode = "DELETE" if shared else "WAL"
+            self._conn.execute(f"PRAGMA journal_mode={mode}")
+            self._conn.execute(_SCHEMA)
+            existing = {
+                row["name"] for row in self._conn.execute("PRAGMA table_info(files)")
+            }
+            for column, kind in ADDED_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE files ADD COLUMN {column} {kind}")
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the journal row for a file, or None if it has never been seen."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM files WHERE name = ?", (name,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Return every file's row keyed by name, in one query."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM files").fetchall()
+        return {row["name"]: dict(row) for row in rows}
+
+    def _upsert(self, name: str, state: str, **fields: Any) -> None:
+        fields["state"] = state
+        fields["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        columns = ", ".join(fields)
+        placeholders = ", ".join("?" for _ in fields)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO files (name, {columns}) VALUES (?, {placeholders}) "
+                f"ON CONFLICT(name) DO UPDATE SET {updates}",
+                (name, *fields.values()),
+            )
+
+    def record_image(self, name: str, media_id: int) -> None:
+        self._upsert(name, STATE_IMAGE_UPLOADED, media_id=media_id)
+
+    def record_sending(self, name: str) -> None:
+        """Mark that a create request is about to go out; a crash now leaves it unknown."""
+        self._upsert(name, STATE_SENDING)
+
+    def record_unsent(self, name: str) -> None:
+        """Undo record_sending() for a request that was refused before being processed."""
+        self._upsert(name, "pending")
+
+    def inline_images(self, name: str) -> Dict[str, str]:
+        """Return the {src: site URL} map recorded for a file's inline images."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT inline_images FROM files WHERE name = ?", (name,)
+            ).fetchone()
+        return json.loads(row["inline_images"]) if row and row["inline_images"] else {}
+
+    def record_inline_images(self, name: str, urls: Dict[str, str]) -> None:
+        """Add uploaded inline images to a file's map without touching its state."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT inline_images FROM files WHERE name = ?", (name,)
+            ).fetchone()
+            merged = json.loads(row["inline_images"]) if row and row[0] else {}
+            merged.update(urls)
+            self._conn.execute(
+                "INSERT INTO files (name, state, inline_images, updated_at) "
+                "VALUES (?, 'pending', ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET inline_images = excluded.inline_images",
+                (
+                    name,
+                    json.dumps(merged, sort_keys=True),
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+
+    def record_post(self, name: str, post_id: int, **fingerprint: Any) -> None:
+        """Record the created post, with the fingerprint of the content it was made from."""
+        self._upsert(
+            name, STATE_POST_CREATED, post_id=post_id, error=None, **fingerprint
+        )
+
+    def record_synced(self, name: str, post_id: int, **fields: Any) -> None:
+        """Record that an already-published file's post now matches its fingerprint."""
+        self._upsert(name, STATE_MOVED, post_id=post_id, error=None, **fields)
+
+    def record_moved(self, name: str) -> None:
+        self._upsert(name, STATE_MOVED, error=None)
+
+    def record_error(self, name: str, error: str, rejected: bool = False) -> int:
+        """Record a (possibly transient) failure and return the attempt count so far.
+
+        A file left 'sending' stays that way, since the post may exist despite the
+        error; only `rejected` (the site refused the request, so nothing was created)
+        puts it back to pending.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO files (name, state, attempts, error, updated_at) "
+                "VALUES (?, 'pending', 1, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET attempts = attempts + 1, "
+                "state = CASE WHEN state = ? AND ? THEN 'pending' ELSE state END, "
+                "error = excluded.error, updated_at = excluded.updated_at",
+                (
+                    name,
+                    error,
+                    datetime.now().isoformat(timespec="seconds"),
+                    STATE_SENDING,
+                    rejected,
+                ),
+            )
+            row = self._conn.execute(
+                "SELECT attempts FROM files WHERE name = ?", (name,)
+            ).fetchone()
+        return row["attempts"]
+
+    def record_failed(self, name: str, error: str) -> None:
+        self._upsert(name, STATE_FAILED, error=error)
+
+    def reset(self, name: str) -> None:
+        """Forget a file so it is treated as brand new on the next attempt."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE name = ?", (name,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -11,16 +11,23 @@ Author(s):
 Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
 
 Created Date: 2025-04-15
-Last Modified Date: 2025-04-18
+Last Modified Date: 2026-10-16
 
 Comments:
 - v1.00 Final: fixed nested show_help_dialog indent; all methods at class scope
+- v1.01 REST calls use the shared pooled session from wp_client.py
+- v1.02 REST calls run on a QThreadPool with loading state and cancel on profile change
+- v1.03 Categories come from the shared, paginated and cached category index
+- v1.04 Run progress from post_pusher --progress-json: bar, file table, throughput / ETA
+- v1.05 Process output goes to a bounded, timer-batched log panel with level/file filters
+- v1.06 Runs use an in-process PublishEngine on a long-lived worker thread; Cancel button
+- v1.07 Schedule cadence: posts per day and time windows; 'Daily' schedule day
+- v1.08 Schedule settings are checked on save (e.g. more posts per day than times)
 """
 
 import sys
 import os
 import json
-import requests
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -34,14 +41,22 @@ from PyQt6.QtWidgets import (
     QLabel,
     QHBoxLayout,
     QTimeEdit,
-    QProgressBar,
+    QSpinBox,
     QSizePolicy,
     QMenuBar,
     QDialog,
 )
 from PyQt6.QtGui import QPixmap, QAction
-from PyQt6.QtCore import QTime, QProcess
+from PyQt6.QtCore import QTime, QThreadPool
 from image_drop_widget import ImageDropWidget
+from log_panel import LogPanel
+from progress_panel import ProgressPanel
+from qt_workers import RequestWorker
+from ui_workers import EngineWorker
+from post_pusher import category_index_for
+from publish_engine import PublishEngine
+from schedule_planner import parse_settings
+from wp_client import session_for
 
 CONFIG_DIR = "configs"
 CONTENT_ROOT = "content"
@@ -115,11 +130,17 @@ class PushItUI(QMainWindow):
                 "Friday",
                 "Saturday",
                 "Sunday",
+                "Daily",
             ]
         )
         self.schedule_time_input = QTimeEdit(QTime(14, 0))
-        self.schedule_day_selector.setEnabled(False)
-        self.schedule_time_input.setEnabled(False)
+        self.schedule_per_day_input = QSpinBox()
+        self.schedule_per_day_input.setRange(1, 96)
+        self.schedule_windows_input = QLineEdit()
+        self.schedule_windows_input.setPlaceholderText(
+            "e.g. 09:00-12:00, 14:00-17:00 (empty: Schedule Time)"
+        )
+        self.toggle_schedule_fields(self.status_selector.currentText())
 
         # Status label
         self.status_label = QLabel("Status: Not Connected")
@@ -134,14 +155,22 @@ class PushItUI(QMainWindow):
             "🧪 Test Connection", clicked=self.test_connection
         )
         self.run_button = QPushButton("🚀 Run post_pusher.py", clicked=self.run_script)
-
-        # Progress bar and process for running script
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setValue(0)
-        self.process = QProcess(self)
-        self.process.readyReadStandardOutput.connect(self.handle_stdout)
-        self.process.readyReadStandardError.connect(self.handle_stderr)
-        self.process.finished.connect(self.process_finished)
+        self.cancel_run_button = QPushButton("⏹ Cancel Run", clicked=self.cancel_run)
+        self.cancel_run_button.setEnabled(False)
+
+        # Progress panel, log panel and the in-process engine that runs publishes
+        self.progress_panel = ProgressPanel()
+        self.log_panel = LogPanel()
+        self.progress_panel.table.clicked.connect(
+            lambda index: self.log_panel.set_file_filter(
+                self.progress_panel.run.rows[index.row()]["file"]
+            )
+        )
+        self.engine_worker = EngineWorker(PublishEngine())
+        self.engine_worker.progress_line.connect(self.handle_progress_line)
+        self.engine_worker.log_text.connect(self.log_panel.append_text)
+        self.engine_worker.finished.connect(self.run_finished)
+        self.engine_worker.error.connect(self.run_failed)
 
         # Assemble form and additional widgets
         self._build_form(layout)
@@ -152,8 +181,17 @@ class PushItUI(QMainWindow):
         btn_row.addWidget(self.test_button)
         layout.addLayout(btn_row)
         layout.addWidget(self.status_label)
-        layout.addWidget(self.run_button)
-        layout.addWidget(self.progress_bar)
+        run_row = QHBoxLayout()
+        run_row.addWidget(self.run_button)
+        run_row.addWidget(self.cancel_run_button)
+        layout.addLayout(run_row)
+        layout.addWidget(self.progress_panel)
+        layout.addWidget(self.log_panel)
+
+        # Background pool for network calls; the GUI thread never blocks on HTTP
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(4)
+        self._workers: set[RequestWorker] = set()
 
         # Load existing configs into selector
         self.load_config_list()
@@ -185,6 +223,8 @@ class PushItUI(QMainWindow):
         form.addRow("Post Status:", self.status_selector)
         form.addRow("Schedule Day:", self.schedule_day_selector)
         form.addRow("Schedule Time:", self.schedule_time_input)
+        form.addRow("Posts per Day:", self.schedule_per_day_input)
+        form.addRow("Time Windows:", self.schedule_windows_input)
         parent_layout.addLayout(form)
 
     def show_help_dialog(self):
@@ -231,6 +271,7 @@ class PushItUI(QMainWindow):
 
     def load_config(self, name: str):
         """Load selected JSON config into UI fields."""
+        self.cancel_requests()
         if name == "-- Select --":
             return
         path = os.path.join(CONFIG_DIR, f"{name}.json")
@@ -253,25 +294,81 @@ class PushItUI(QMainWindow):
             self.schedule_time_input.setTime(
                 QTime.fromString(data.get("schedule_time", "14:00"), "HH:mm")
             )
+            self.schedule_per_day_input.setValue(int(data.get("schedule_per_day", 1)))
+            windows = data.get("schedule_windows", [])
+            self.schedule_windows_input.setText(
+                windows if isinstance(windows, str) else ", ".join(windows)
+            )
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to load config '{name}': {e}")
 
+    def _form_config(self) -> dict:
+        """Return the connection settings currently in the form as a profile config."""
+        name = self.config_name_input.text().strip() or "default"
+        return {
+            "wp_url": self.wp_url_input.text(),
+            "username": self.username_input.text(),
+            "app_password": self.password_input.text(),
+            "content_dir": self.content_folder_input.text()
+            or os.path.join(CONTENT_ROOT, name),
+        }
+
+    def _session(self):
+        """Return the shared HTTP session for the credentials currently in the form."""
+        return session_for(self._form_config())
+
+    def _start_request(self, fn, on_result, on_error, busy_text: str, buttons):
+        """Run fn on the thread pool, disabling `buttons` and showing `busy_text` meanwhile."""
+        worker = RequestWorker(fn)
+        worker.setAutoDelete(False)
+        # Re-check cancellation on the GUI thread: a reply may already be queued.
+        worker.signals.result.connect(
+            lambda result: None if worker.cancelled else on_result(result)
+        )
+        worker.signals.error.connect(
+            lambda msg: None if worker.cancelled else on_error(msg)
+        )
+        worker.signals.finished.connect(lambda: self._request_finished(worker, buttons))
+        for button in buttons:
+            button.setEnabled(False)
+        self.status_label.setText(f"⏳ {busy_text}")
+        self._workers.add(worker)
+        self.thread_pool.start(worker)
+
+    def _request_finished(self, worker: RequestWorker, buttons):
+        self._workers.discard(worker)
+        for button in buttons:
+            button.setEnabled(True)
+
+    def cancel_requests(self):
+        """Cancel in-flight network calls so their results never reach the new profile."""
+        for worker in list(self._workers):
+            worker.cancel()
+            self._request_finished(worker, [])
+        for button in (self.fetch_button, self.add_category_button, self.test_button):
+            button.setEnabled(True)
+        self.status_label.setText("Status: Not Connected")
+
     def fetch_categories(self):
-        """Fetch existing WP categories and populate selector."""
-        try:
-            url = f"{self.wp_url_input.text().rstrip('/')}/wp-json/wp/v2/categories"
-            resp = requests.get(
-                url, auth=(self.username_input.text(), self.password_input.text())
-            )
-            resp.raise_for_status()
-            cats = resp.json()
-            self.category_selector.clear()
-            for cat in cats:
-                self.category_selector.addItem(
-                    f"{cat['name']} ({cat['id']})", cat["id"]
-                )
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to fetch categories: {e}")
+        """Fetch existing WP categories (all pages, cached per profile) and populate selector."""
+        index = category_index_for(self._form_config())
+        self._start_request(
+            index.refresh,
+            self._categories_fetched,
+            lambda msg: self._request_failed("Failed to fetch categories", msg),
+            "Fetching categories…",
+            [self.fetch_button],
+        )
+
+    def _categories_fetched(self, cats: list):
+        self.category_selector.clear()
+        for cat in cats:
+            self.category_selector.addItem(f"{cat['name']} ({cat['id']})", cat["id"])
+        self.status_label.setText(f"Loaded {len(cats)} categories")
+
+    def _request_failed(self, title: str, msg: str):
+        self.status_label.setText(f"❌ {title}")
+        QMessageBox.warning(self, "Error", f"{title}: {msg}")
 
     def select_category(self, index: int):
         """Add selected category ID to input field."""
@@ -293,22 +390,28 @@ class PushItUI(QMainWindow):
         if not name:
             QMessageBox.warning(self, "Missing Name", "Enter a category name.")
             return
-        try:
-            url = f"{self.wp_url_input.text().rstrip('/')}/wp-json/wp/v2/categories"
-            resp = requests.post(
-                url,
-                auth=(self.username_input.text(), self.password_input.text()),
-                json={"name": name},
-            )
+        session = self._session()
+
+        def create():
+            resp = session.post("wp/v2/categories", json={"name": name})
             resp.raise_for_status()
-            cat = resp.json()
-            QMessageBox.information(
-                self, "Created", f"Category '{cat['name']}' ID {cat['id']}"
-            )
-            self.new_category_input.clear()
-            self.fetch_categories()
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to create category: {e}")
+            return resp.json()
+
+        self._start_request(
+            create,
+            self._category_added,
+            lambda msg: self._request_failed("Failed to create category", msg),
+            f"Creating category '{name}'…",
+            [self.add_category_button],
+        )
+
+    def _category_added(self, cat: dict):
+        self.status_label.setText(f"Created category '{cat['name']}'")
+        QMessageBox.information(
+            self, "Created", f"Category '{cat['name']}' ID {cat['id']}"
+        )
+        self.new_category_input.clear()
+        self.fetch_categories()
 
     def save_config(self):
         """Save UI settings as a JSON config."""
@@ -333,7 +436,19 @@ class PushItUI(QMainWindow):
             "post_status": self.status_selector.currentText(),
             "schedule_day": self.schedule_day_selector.currentText(),
             "schedule_time": self.schedule_time_input.time().toString("HH:mm"),
+            "schedule_per_day": self.schedule_per_day_input.value(),
+            "schedule_windows": [
+                w.strip()
+                for w in self.schedule_windows_input.text().split(",")
+                if w.strip()
+            ],
         }
+        if cfg["post_status"] == "schedule":
+            try:
+                parse_settings(cfg)
+            except ValueError as e:
+                QMessageBox.warning(self, "Invalid Schedule", str(e))
+                return
         try:
             with open(
                 os.path.join(CONFIG_DIR, f"{name}.json"), "w", encoding="utf-8"
@@ -346,25 +461,35 @@ class PushItUI(QMainWindow):
 
     def test_connection(self):
         """Test WP credentials and update status."""
-        try:
-            url = f"{self.wp_url_input.text().rstrip('/')}/wp-json/wp/v2/users/me"
-            resp = requests.get(
-                url, auth=(self.username_input.text(), self.password_input.text())
-            )
-            if resp.status_code == 200:
-                self.status_label.setText(
-                    "✅ Connected: " + resp.json().get("name", "OK")
-                )
-            else:
-                self.status_label.setText(f"❌ Failed: {resp.status_code}")
-        except Exception as e:
-            self.status_label.setText(f"❌ Error: {e}")
+        session = self._session()
+
+        def check():
+            resp = session.get("wp/v2/users/me")
+            name = resp.json().get("name", "OK") if resp.status_code == 200 else None
+            return resp.status_code, name
+
+        self._start_request(
+            check,
+            self._connection_checked,
+            lambda msg: self.status_label.setText(f"❌ Error: {msg}"),
+            "Testing connection…",
+            [self.test_button],
+        )
+
+    def _connection_checked(self, result: tuple):
+        status_code, name = result
+        if status_code == 200:
+            self.status_label.setText("✅ Connected: " + name)
+        else:
+            self.status_label.setText(f"❌ Failed: {status_code}")
 
     def toggle_schedule_fields(self, text: str):
         """Enable or disable schedule fields."""
         enable = text == "schedule"
         self.schedule_day_selector.setEnabled(enable)
         self.schedule_time_input.setEnabled(enable)
+        self.schedule_per_day_input.setEnabled(enable)
+        self.schedule_windows_input.setEnabled(enable)
 
     def handle_images_dropped(self, paths: list[str]):
         """Set featured image path when dropped."""
@@ -372,30 +497,48 @@ class PushItUI(QMainWindow):
             self.featured_image_input.setText(paths[0])
 
     def run_script(self):
-        """Run post_pusher.py with selected config."""
+        """Publish the selected profile on the engine's background thread."""
         profile = self.config_selector.currentText()
         if profile == "-- Select --":
             QMessageBox.warning(self, "No Profile", "Please select a profile.")
             return
         cfg_path = os.path.join(CONFIG_DIR, f"{profile}.json")
-        self.progress_bar.setRange(0, 0)
+        self.progress_panel.start()
         self.run_button.setEnabled(False)
-        self.process.start(sys.executable, ["post_pusher.py", "--config", cfg_path])
+        self.cancel_run_button.setEnabled(True)
+        self.engine_worker.run(cfg_path)
 
-    def handle_stdout(self):
-        data = bytes(self.process.readAllStandardOutput()).decode("utf-8")
-        print(data, end="")
+    def cancel_run(self):
+        """Let files in progress finish and skip the rest; no process is killed."""
+        self.cancel_run_button.setEnabled(False)
+        self.engine_worker.cancel()
 
-    def handle_stderr(self):
-        data = bytes(self.process.readAllStandardError()).decode("utf-8")
-        print(data, end="")
+    def handle_progress_line(self, line: str):
+        if not self.progress_panel.feed_line(line):
+            self.log_panel.append_text(line + "\n")
 
-    def process_finished(self, exit_code: int, exit_status: QProcess.ExitStatus):
-        """Reset UI after process completes."""
-        self.progress_bar.setRange(0, 100)
-        self.progress_bar.setValue(100)
+    def _run_ended(self):
+        self.log_panel.finish()
+        self.progress_panel.finish()
         self.run_button.setEnabled(True)
-        QMessageBox.information(self, "Done", f"Finished with code {exit_code}.")
+        self.cancel_run_button.setEnabled(False)
+
+    def run_finished(self, summary: dict):
+        """Reset UI after a run completes or is cancelled."""
+        self._run_ended()
+        text = f"{len(summary['succeeded'])} succeeded, {len(summary['failed'])} failed"
+        if summary.get("cancelled"):
+            text += f", {len(summary['cancelled'])} cancelled"
+        QMessageBox.information(self, "Done", f"Finished: {text}.")
+
+    def run_failed(self, msg: str):
+        self._run_ended()
+        QMessageBox.warning(self, "Error", f"Run failed: {msg}")
+
+    def closeEvent(self, event):
+        """Stop the engine (waiting for files in progress) before the window goes."""
+        self.engine_worker.shutdown()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+"""
+Module/Script Name: qt_workers.py
+
+Description:
+QThreadPool worker for the Push It Real Good UI. Runs blocking calls (REST requests,
+thumbnail decoding) off the GUI thread and reports back through result / error /
+finished signals, with cooperative cancellation. Depends on Qt only, so widgets can
+use it without loading the publishing pipeline.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 RequestWorker / WorkerSignals moved here from ui_workers.py
+"""
+
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Signals a RequestWorker emits; delivered on the GUI thread via queued connections."""
+
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class RequestWorker(QRunnable):
+    """Runs fn(*args, **kwargs) on a pool thread and emits its result or error.
+
+    Cancelling cannot interrupt a request already on the wire, but once cancelled the
+    worker's result and error are discarded, so a stale reply never reaches the UI.
+    """
+
+    def __init__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+        else:
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
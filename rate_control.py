@@ -0,0 +1,213 @@
+"""
+Module/Script Name: rate_control.py
+
+Description:
+Adaptive concurrency control for WordPress write calls (posts and media). Grows the
+number of requests in flight while latency stays flat and backs off on 429 / 503 or
+rising latency (additive increase, multiplicative decrease). Latency is compared per
+route, since a media upload is slower than a post create without the site being any
+busier. Honours Retry-After and remembers the safe limit per wp_url between runs.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial AIMD limiter with per-site persistence
+- v1.01 Latency cuts need an absolute rise too; only real limit changes are logged
+- v1.02 Latency baseline per route (media, posts, batch), normalised by request size,
+        so big uploads are not mistaken for congestion
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from file_utils import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = (429, 503)
+DEFAULT_START_LIMIT = 2.0
+DECREASE_FACTOR = 0.5
+LATENCY_FACTOR = 2.0  # latency this many times the baseline counts as congestion
+# ...and at least this many seconds above it, so jitter on a fast host is not congestion
+MIN_LATENCY_RISE = 0.05
+DEFAULT_BACKOFF = 5.0  # seconds to pause on 429/503 without Retry-After
+EWMA_WEIGHT = 0.2
+# Bodies larger than this are judged by latency per this many bytes, so a 5 MB upload
+# is not "slower" than a 50 KB one just for being bigger.
+LATENCY_BYTES_UNIT = 256 * 1024
+
+_limiters: Dict[str, "AdaptiveLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds from a Retry-After header (seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def request_kind(url: str) -> str:
+    """Return the REST route a URL calls, without IDs: 'wp/v2/media', 'batch/v1', ..."""
+    path = urlsplit(url).path
+    route = path.split("/wp-json/", 1)[-1]
+    return re.sub(r"/\d+(?=/|$)", "", route.strip("/"))
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for one site, shared by every thread talking to it."""
+
+    def __init__(self, wp_url: str, max_limit: int, start_limit: float) -> None:
+        self.wp_url = wp_url
+        self.max_limit = max(1, max_limit)
+        self.limit = min(max(1.0, start_limit), self.max_limit)
+        self.in_flight = 0
+        self.resume_at = 0.0
+        # Smoothed and lowest-seen latency per request_kind().
+        self.baseline: Dict[str, float] = {}
+        self.ewma: Dict[str, float] = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a slot is free under the current limit and no pause is active."""
+        with self._cond:
+            while True:
+                wait = self.resume_at - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self.in_flight >= int(self.limit):
+                    self._cond.wait()
+                else:
+                    self.in_flight += 1
+                    return
+
+    def release(
+        self,
+        latency: float,
+        status: Optional[int],
+        retry_after: Optional[str] = None,
+        kind: str = "",
+        sent_bytes: int = 0,
+    ) -> None:
+        """Return a slot and adjust the limit from the call's latency and status.
+
+        `kind` (see request_kind()) picks the latency baseline the call is judged by,
+        and `sent_bytes` (the request body size) scales the latency down for big bodies.
+        """
+        now = time.monotonic()
+        with self._cond:
+            self.in_flight -= 1
+            if status in THROTTLE_STATUSES or status is None:
+                delay = parse_retry_after(retry_after)
+                if status is not None:
+                    self.resume_at = max(
+                        self.resume_at,
+                        now + (DEFAULT_BACKOFF if delay is None else delay),
+                    )
+                self._decrease(
+                    now, f"HTTP {status}" if status else "request error", kind
+                )
+            else:
+                latency /= max(1.0, sent_bytes / LATENCY_BYTES_UNIT)
+                previous = self.ewma.get(kind)
+                ewma = (
+                    latency
+                    if previous is None
+                    else EWMA_WEIGHT * latency + (1 - EWMA_WEIGHT) * previous
+                )
+                self.ewma[kind] = ewma
+                if kind not in self.baseline or ewma < self.baseline[kind]:
+                    self.baseline[kind] = ewma
+                baseline = self.baseline[kind]
+                if (
+                    ewma > baseline * LATENCY_FACTOR
+                    and ewma - baseline > MIN_LATENCY_RISE
+                ):
+                    self._decrease(
+                        now, f"{kind or 'request'} latency {ewma:.2f}s", kind
+                    )
+                elif self.limit < self.max_limit:
+                    # Roughly +1 slot per limit's worth of successful calls.
+                    self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def _decrease(self, now: float, reason: str, kind: str = "") -> None:
+        # At most one cut per in-flight window, so one burst of 429s halves only once.
+        ewma = self.ewma.get(kind)
+        if now - self._last_decrease < (ewma or 1.0):
+            return
+        self._last_decrease = now
+        old = self.limit
+        self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+        if ewma is not None:
+            # Let the baseline drift up so a permanently slower host is not punished forever.
+            self.baseline[kind] = (self.baseline[kind] + ewma) / 2
+        if self.limit != old:
+            logger.warning(
+                "%s: %s, concurrency %.1f → %.1f", self.wp_url, reason, old, self.limit
+            )
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable rate limits '%s': %s", path, e)
+        return {}
+
+
+def limiter_for(wp_url: str, max_limit: int, limits_path: Path) -> AdaptiveLimiter:
+    """Return the shared limiter for a site, starting from its remembered safe limit."""
+    key = wp_url.rstrip("/").lower()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            saved = _load(limits_path).get(key, {})
+            limiter = AdaptiveLimiter(
+                key, max_limit, float(saved.get("limit", DEFAULT_START_LIMIT))
+            )
+            _limiters[key] = limiter
+        else:
+            limiter.max_limit = max(limiter.max_limit, max_limit)
+        return limiter
+
+
+def save_limits(limits_path: Path) -> None:
+    """Persist every active site's current limit as its safe starting point next run."""
+    with _limiters_lock:
+        if not _limiters:
+            return
+        data = _load(limits_path)
+        for key, limiter in _limiters.items():
+            data[key] = {
+                "limit": round(limiter.limit, 2),
+                "updated": datetime.now().isoformat(timespec="seconds"),
+            }
+            logger.info("%s: safe concurrency %.1f", key, limiter.limit)
+    write_json_atomic(limits_path, data)
@@ -0,0 +1,263 @@
+"""
+Module/Script Name: schedule_planner.py
+
+Description:
+Spreads a batch of scheduled posts over time slots instead of giving them all the same
+date. A cadence (posts per day, on the configured weekdays, inside one or more time
+windows) defines the slots; slots already taken by future posts on the site (found with
+one paged query) are skipped, and each post gets the next free slot. Slots are naive
+times in the site's timezone, which is what WordPress reads a post's `date` as.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial cadence / window slot planner with site booking lookup
+- v1.01 Each time-only window is its own slot; more posts per day than times is an error
+- v1.02 Plan in the site's timezone (timezone_string / gmt_offset from /wp-json)
+"""
+
+import bisect
+import calendar
+import logging
+import threading
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+PER_PAGE = 100
+LEAD_TIME = timedelta(minutes=5)  # never schedule closer to now than this
+MAX_DAYS_AHEAD = 3660  # give up rather than loop forever on an empty cadence
+
+Window = Tuple[time, time]
+
+
+def parse_days(value: Any) -> List[int]:
+    """Turn 'Monday', ['Monday', 'Thursday'] or 'daily' into weekday numbers (Monday=0)."""
+    names = [value] if isinstance(value, str) else list(value or ["Monday"])
+    if any(str(n).lower() in ("daily", "every day", "everyday") for n in names):
+        return list(range(7))
+    lookup = {name.lower(): i for i, name in enumerate(calendar.day_name)}
+    try:
+        return sorted({lookup[str(n).strip().lower()] for n in names})
+    except KeyError as e:
+        raise ValueError(f"unknown schedule day {e.args[0]!r}") from None
+
+
+def parse_windows(value: Any, default_time: str = "00:00") -> List[Window]:
+    """Turn ['09:00-12:00', '14:00-17:00'] (or one comma-separated string) into windows.
+
+    Without windows the day has a single instant, `default_time` (the old
+    schedule_time behaviour).
+    """
+    if isinstance(value, str):
+        value = [v for v in value.split(",") if v.strip()]
+    if not value:
+        start = datetime.strptime(default_time, "%H:%M").time()
+        return [(start, start)]
+    windows: List[Window] = []
+    for spec in value:
+        start_text, _, end_text = str(spec).partition("-")
+        start = datetime.strptime(start_text.strip(), "%H:%M").time()
+        end = datetime.strptime((end_text or start_text).strip(), "%H:%M").time()
+        if end < start:
+            raise ValueError(f"schedule window {spec!r} ends before it starts")
+        windows.append((start, end))
+    return sorted(windows)
+
+
+def point_times(windows: Sequence[Window]) -> Optional[List[time]]:
+    """Return the distinct times if every window is a single time, else None."""
+    if any(start != end for start, end in windows):
+        return None
+    return sorted({start for start, _ in windows})
+
+
+def check_per_day(windows: Sequence[Window], per_day: int) -> None:
+    """Raise ValueError if `windows` cannot hold `per_day` distinct slots a day."""
+    if per_day < 1:
+        raise ValueError("schedule_per_day must be at least 1")
+    points = point_times(windows)
+    if points is not None and per_day > len(points):
+        raise ValueError(
+            f"schedule_per_day is {per_day} but the schedule only has "
+            f"{len(points)} time(s) a day; give schedule_windows as time ranges "
+            "(e.g. '09:00-17:00') or list at least that many times"
+        )
+
+
+def day_slots(day: datetime, windows: Sequence[Window], per_day: int) -> List[datetime]:
+    """Return `per_day` slot start times on `day`, spaced evenly through the windows.
+
+    When every window is just a time, each time is a slot of its own and `per_day`
+    of them are picked, evenly spread (check_per_day() guards against too few).
+    """
+    points = point_times(windows)
+    if points is not None:
+        step = len(points) / per_day
+        return [
+            datetime.combine(day.date(), points[int(step * k)])
+            for k in range(min(per_day, len(points)))
+        ]
+    spans = [
+        (datetime.combine(day.date(), start), datetime.combine(day.date(), end))
+        for start, end in windows
+    ]
+    total = sum(((end - start) for start, end in spans), timedelta())
+    step = total / per_day
+    slots = []
+    for k in range(per_day):
+        offset = step * k
+        for start, end in spans:
+            if offset < end - start or (start, end) == spans[-1]:
+                slots.append(start + offset)
+                break
+            offset -= end - start
+    return slots
+
+
+def site_timezone(session) -> tzinfo:
+    """Return the site's timezone from the /wp-json index.
+
+    `timezone_string` (e.g. 'Europe/Berlin') is preferred because it follows daylight
+    saving; sites set to a fixed 'UTC+10' offset only send `gmt_offset` (hours).
+    """
+    resp = session.get("", params={"_fields": "timezone_string,gmt_offset"})
+    resp.raise_for_status()
+    info = resp.json()
+    name = info.get("timezone_string")
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning("Unknown site timezone %r; using its gmt_offset", name)
+    return timezone(timedelta(hours=float(info.get("gmt_offset") or 0)))
+
+
+def site_now(
+    tz: Optional[tzinfo] = None, utc_now: Optional[datetime] = None
+) -> datetime:
+    """Return the current wall-clock time in `tz` (this machine's zone if None), naive."""
+    utc_now = utc_now or datetime.now(timezone.utc)
+    return utc_now.astimezone(tz).replace(tzinfo=None)
+
+
+def booked_dates(session, after: datetime) -> List[datetime]:
+    """Return the dates of the site's scheduled (future) posts after `after`, sorted.
+
+    `after` and the returned dates are naive site-local times, as in `date`. One paged
+    query: ?status=future&after=...&_fields=date, 100 per page.
+    """
+    dates: List[datetime] = []
+    page = 1
+    while True:
+        resp = session.get(
+            "wp/v2/posts",
+            params={
+                "status": "future",
+                "after": after.isoformat(timespec="seconds"),
+                "per_page": PER_PAGE,
+                "page": page,
+                "orderby": "date",
+                "order": "asc",
+                "_fields": "id,date",
+            },
+        )
+        resp.raise_for_status()
+        for post in resp.json():
+            try:
+                dates.append(datetime.fromisoformat(post["date"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        if page >= int(resp.headers.get("X-WP-TotalPages", 1)):
+            break
+        page += 1
+    return sorted(dates)
+
+
+class SlotPlanner:
+    """Hands out free slots in order; safe to call from several publishing threads."""
+
+    def __init__(
+        self,
+        days: Sequence[int],
+        windows: Sequence[Window],
+        per_day: int = 1,
+        booked: Sequence[datetime] = (),
+        now: Optional[datetime] = None,
+    ) -> None:
+        check_per_day(windows, per_day)
+        self.days = set(days)
+        self.windows = list(windows)
+        self.per_day = per_day
+        self.booked = sorted(booked)
+        self.earliest = (now or datetime.now()) + LEAD_TIME
+        self._lock = threading.Lock()
+        self._day = self.earliest.replace(hour=0, minute=0, second=0, microsecond=0)
+        self._pending: List[datetime] = []
+
+    def _is_booked(self, start: datetime, end: datetime) -> bool:
+        """True if a site post already falls inside [start, end)."""
+        i = bisect.bisect_left(self.booked, start)
+        return i < len(self.booked) and self.booked[i] < end
+
+    def _fill(self) -> None:
+        """Queue the free slots of the next scheduled day that has any."""
+        for _ in range(MAX_DAYS_AHEAD):
+            day = self._day
+            self._day += timedelta(days=1)
+            if day.weekday() not in self.days:
+                continue
+            slots = day_slots(day, self.windows, self.per_day)
+            bounds = slots[1:] + [day + timedelta(days=1)]
+            free = [
+                start
+                for start, end in zip(slots, bounds)
+                if start >= self.earliest and not self._is_booked(start, end)
+            ]
+            if free:
+                self._pending = free
+                return
+        raise ValueError("no free schedule slot within ten years")
+
+    def next_slot(self) -> datetime:
+        with self._lock:
+            if not self._pending:
+                self._fill()
+            return self._pending.pop(0)
+
+
+def parse_settings(config: Dict[str, Any]) -> Tuple[List[int], List[Window], int]:
+    """Return (weekdays, windows, per_day) from a profile's schedule_* settings.
+
+    Raises ValueError if any of them is malformed, or if per_day asks for more posts
+    a day than time-only windows can place.
+    """
+    per_day = int(config.get("schedule_per_day", 1))
+    windows = parse_windows(
+        config.get("schedule_windows"), config.get("schedule_time", "00:00")
+    )
+    check_per_day(windows, per_day)
+    return parse_days(config.get("schedule_day")), windows, per_day
+
+
+def planner_for(
+    config: Dict[str, Any],
+    booked: Sequence[datetime] = (),
+    now: Optional[datetime] = None,
+) -> SlotPlanner:
+    """Build a profile's planner from its schedule_* settings and the site's bookings."""
+    days, windows, per_day = parse_settings(config)
+    planner = SlotPlanner(days, windows, per_day, booked, now)
+    logger.info(
+        "Schedule: %d per day on %s; %d future post(s) already on the site",
+        per_day,
+        ", ".join(calendar.day_abbr[d] for d in days),
+        len(planner.booked),
+    )
+    return planner
@@ -0,0 +1,129 @@
+import base64
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from mock_wp_server import MockWordPress
+
+POST_PUSHER = Path(__file__).resolve().parents[1] / "post_pusher.py"
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+@pytest.fixture
+def wp():
+    with MockWordPress() as server:
+        yield server
+
+
+@pytest.fixture
+def site(tmp_path, wp):
+    """A content_dir with pre-post/ and posted/, and a config pointing at the mock."""
+    for sub in ("pre-post", "posted"):
+        (tmp_path / sub).mkdir()
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps(
+            {
+                "wp_url": wp.url,
+                "username": "user",
+                "app_password": "pass",
+                "content_dir": str(tmp_path),
+                "post_status": "publish",
+                "http_retries": 0,
+            }
+        )
+    )
+    return tmp_path
+
+
+def push(site, *args):
+    return subprocess.run(
+        [
+            sys.executable,
+            str(POST_PUSHER),
+            "--config",
+            str(site / "config.json"),
+            *args,
+        ],
+        capture_output=True,
+        text=True,
+        cwd=site,
+        timeout=60,
+    )
+
+
+def write_posts(site, *names):
+    for name in names:
+        (site / "pre-post" / f"{name}.html").write_text(
+            f"<h1>{name.title()}</h1><p>About {name}.</p>"
+        )
+
+
+def titles(wp):
+    return sorted(p["title"]["raw"] for p in wp.posts.values())
+
+
+def test_rerun_after_server_errors_posts_each_file_once(wp, site):
+    write_posts(site, "alpha", "beta")
+    wp.error_rate = 1.0
+    push(site)
+    assert wp.posts == {}
+    assert sorted(p.name for p in (site / "pre-post").glob("*.html")) == [
+        "alpha.html",
+        "beta.html",
+    ]
+
+    wp.error_rate = 0.0
+    push(site)
+    assert titles(wp) == ["Alpha", "Beta"]
+    assert sorted(p.name for p in (site / "posted").iterdir()) == [
+        "alpha.html",
+        "beta.html",
+    ]
+
+
+def test_rerun_after_a_lost_reply_does_not_duplicate(wp, site):
+    write_posts(site, "alpha")
+    wp.lost_replies = 1
+    push(site)
+    assert titles(wp) == ["Alpha"]
+
+    push(site)
+    assert titles(wp) == ["Alpha"]
+    assert (site / "posted" / "alpha.html").is_file()
+
+
+def test_sync_keeps_uploaded_inline_images(wp, site):
+    (site / "pre-post" / "pic.png").write_bytes(PIXEL_PNG)
+    (site / "pre-post" / "alpha.html").write_text(
+        '<h1>Alpha</h1><p>First.</p><img src="pic.png">'
+    )
+    push(site)
+    (post,) = wp.posts.values()
+    (media,) = wp.media.values()
+    assert media["source_url"] in post["content"]
+
+    (site / "posted" / "alpha.html").write_text(
+        '<h1>Alpha</h1><p>Edited.</p><img src="pic.png">'
+    )
+    result = push(site, "--sync")
+    assert result.returncode == 0, result.stderr
+    assert "Edited." in post["content"]
+    assert media["source_url"] in post["content"]
+    assert 'src="pic.png"' not in post["content"]
+    assert len(wp.media) == 1
+
+
+def test_batch_falls_back_to_single_posts_on_404(wp, site):
+    wp.batch_supported = False
+    write_posts(site, "alpha", "beta", "gamma")
+    result = push(site, "--batch", "5")
+    assert "Batch endpoint unavailable" in result.stderr
+    assert titles(wp) == ["Alpha", "Beta", "Gamma"]
+    assert wp.stats[404] == 1
+    assert len(list((site / "posted").iterdir())) == 3
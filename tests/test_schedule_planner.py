@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import schedule_planner
+
+MONDAY = datetime(2026, 10, 19)
+
+
+def test_point_windows_get_a_slot_each():
+    windows = schedule_planner.parse_windows(["09:00", "15:00"])
+    assert schedule_planner.day_slots(MONDAY, windows, 2) == [
+        MONDAY.replace(hour=9),
+        MONDAY.replace(hour=15),
+    ]
+
+
+def test_per_day_is_spread_over_point_windows():
+    windows = schedule_planner.parse_windows(["09:00", "12:00", "15:00", "18:00"])
+    assert schedule_planner.day_slots(MONDAY, windows, 2) == [
+        MONDAY.replace(hour=9),
+        MONDAY.replace(hour=15),
+    ]
+
+
+def test_planner_hands_out_every_point_window():
+    planner = schedule_planner.SlotPlanner(
+        [0], schedule_planner.parse_windows(["09:00", "15:00"]), 2, now=MONDAY
+    )
+    assert [planner.next_slot() for _ in range(3)] == [
+        MONDAY.replace(hour=9),
+        MONDAY.replace(hour=15),
+        MONDAY.replace(day=26, hour=9),
+    ]
+
+
+def test_range_windows_are_unchanged():
+    windows = schedule_planner.parse_windows(["09:00-12:00", "14:00-17:00"])
+    assert schedule_planner.day_slots(MONDAY, windows, 4) == [
+        MONDAY.replace(hour=9),
+        MONDAY.replace(hour=10, minute=30),
+        MONDAY.replace(hour=14),
+        MONDAY.replace(hour=15, minute=30),
+    ]
+
+
+def test_per_day_without_windows_is_rejected():
+    with pytest.raises(ValueError, match="schedule_per_day is 3"):
+        schedule_planner.parse_settings(
+            {"schedule_per_day": 3, "schedule_time": "14:00"}
+        )
+
+
+def test_more_per_day_than_point_windows_is_rejected():
+    with pytest.raises(ValueError, match="only has 2 time"):
+        schedule_planner.parse_settings(
+            {"schedule_per_day": 3, "schedule_windows": ["09:00", "15:00"]}
+        )
+
+
+def test_per_day_within_point_windows_is_accepted():
+    _, windows, per_day = schedule_planner.parse_settings(
+        {"schedule_per_day": 2, "schedule_windows": "09:00, 15:00"}
+    )
+    assert per_day == 2 and len(windows) == 2
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self, index):
+        self.index = index
+
+    def get(self, route, params=None):
+        assert route == ""
+        return FakeResponse(self.index)
+
+
+def test_site_timezone_prefers_timezone_string():
+    tz = schedule_planner.site_timezone(
+        FakeSession({"timezone_string": "Australia/Sydney", "gmt_offset": 11})
+    )
+    assert tz.utcoffset(datetime(2026, 7, 1)) == timedelta(hours=10)
+
+
+def test_planner_runs_on_the_site_clock_with_a_non_utc_offset():
+    # Sunday 23:00 UTC is already Monday 09:00 on a UTC+10 site, so the 09:00
+    # slot has passed there and the first free one is Monday 15:00.
+    tz = schedule_planner.site_timezone(
+        FakeSession({"timezone_string": "", "gmt_offset": 10})
+    )
+    utc_now = datetime(2026, 10, 18, 23, 0, tzinfo=timezone.utc)
+    planner = schedule_planner.SlotPlanner(
+        [0],
+        schedule_planner.parse_windows(["09:00", "15:00"]),
+        2,
+        now=schedule_planner.site_now(tz, utc_now),
+    )
+    assert planner.next_slot() == MONDAY.replace(hour=15)
@@ -0,0 +1,105 @@
+"""
+Module/Script Name: ui_workers.py
+
+Description:
+Engine worker for the Push It Real Good UI. EngineWorker keeps one PublishEngine on a
+long-lived thread and forwards its log lines and progress events as signals. The
+Qt-only RequestWorker lives in qt_workers.py.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial RequestWorker / WorkerSignals
+- v1.01 EngineWorker: in-process publish runs on a long-lived QThread
+- v1.02 RequestWorker / WorkerSignals moved to qt_workers.py (no pipeline imports)
+"""
+
+import logging
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+import progress
+from post_pusher import LOG_DATEFMT, LOG_FORMAT
+from publish_engine import PublishEngine
+
+
+class _SignalStream:
+    """File-like sink for progress.enable(): each complete line becomes one signal."""
+
+    def __init__(self, signal) -> None:
+        self.signal = signal
+
+    def write(self, text: str) -> None:
+        for line in text.splitlines():
+            if line:
+                self.signal.emit(line)
+
+    def flush(self) -> None:
+        pass
+
+
+class _SignalLogHandler(logging.Handler):
+    """Logging handler that emits each formatted record (tracebacks included) as text."""
+
+    def __init__(self, signal) -> None:
+        super().__init__()
+        self.signal = signal
+        self.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATEFMT))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.signal.emit(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class EngineWorker(QObject):
+    """Owns a PublishEngine and runs it on its own QThread for the life of the window.
+
+    run() queues a run onto that thread, so sessions and caches stay warm between
+    runs; cancel() may be called from the GUI thread at any time.
+    """
+
+    progress_line = pyqtSignal(str)
+    log_text = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    _requested = pyqtSignal(str)
+
+    def __init__(self, engine: PublishEngine) -> None:
+        super().__init__()
+        self.engine = engine
+        self._log_handler = _SignalLogHandler(self.log_text)
+        logging.getLogger().addHandler(self._log_handler)
+        progress.enable(_SignalStream(self.progress_line))
+        self._thread = QThread()
+        self._thread.setObjectName("publish-engine")
+        self.moveToThread(self._thread)
+        self._requested.connect(self._run)
+        self._thread.start()
+
+    def run(self, config_path: str) -> None:
+        self._requested.emit(config_path)
+
+    def cancel(self) -> None:
+        self.engine.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel any run, wait for in-flight files, then stop the thread."""
+        self.engine.close()
+        self._thread.quit()
+        self._thread.wait()
+        logging.getLogger().removeHandler(self._log_handler)
+
+    @pyqtSlot(str)
+    def _run(self, config_path: str) -> None:
+        try:
+            summary = self.engine.run(config_path)
+        except Exception as e:
+            logging.getLogger(__name__).exception("Run failed")
+            self.error.emit(str(e))
+        else:
+            self.finished.emit(summary)
@@ -0,0 +1,275 @@
+"""
+Module/Script Name: watcher.py
+
+Description:
+Watch-folder daemon support for post_pusher.py. Uses watchdog (inotify on Linux,
+ReadDirectoryChangesW on Windows) to notice HTML files dropped into a profile's
+pre-post/ folder, waits until each file is fully written, then hands it to a small
+pool of publishing threads. No polling happens while the folders are idle.
+
+Where inotify reports IN_CLOSE_WRITE, a file written in place is only published after
+its writer closes it, however long the writer pauses. Elsewhere, and for files that
+were already there or were renamed in whole, a file counts as written once its size
+and mtime have stayed put for the settle period.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial FolderWatcher with settle detection and clean shutdown
+- v1.01 Wait for IN_CLOSE_WRITE where available; re-check before publishing; events
+        for files being published are kept, not dropped
+"""
+
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is only needed for --watch
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE_SECONDS = 1.0
+CLOSED_SETTLE_SECONDS = 0.2  # after IN_CLOSE_WRITE only a short re-check is needed
+
+
+def close_events_supported() -> bool:
+    """True if this platform's observer reports IN_CLOSE_WRITE (on_closed)."""
+    return getattr(Observer, "__name__", "") == "InotifyObserver" and hasattr(
+        FileSystemEventHandler, "on_closed"
+    )
+
+
+PublishFn = Callable[[Path, Dict[str, Any]], bool]
+
+
+class _Handler(FileSystemEventHandler):
+    """Forwards HTML file events for one folder to the watcher."""
+
+    def __init__(self, watcher: "FolderWatcher", config: Dict[str, Any]) -> None:
+        super().__init__()
+        self.watcher = watcher
+        self.config = config
+
+    def _notify(self, path: str, writing: bool = False, closed: bool = False) -> None:
+        if path.lower().endswith(".html"):
+            self.watcher.notify(Path(path), self.config, writing=writing, closed=closed)
+
+    def on_created(self, event) -> None:
+        if not event.is_directory:
+            self._notify(event.src_path, writing=True)
+
+    def on_modified(self, event) -> None:
+        if not event.is_directory:
+            self._notify(event.src_path, writing=True)
+
+    def on_moved(self, event) -> None:
+        # A rename brings in a file someone already finished writing.
+        if not event.is_directory:
+            self.watcher.forget(Path(event.src_path))
+            self._notify(event.dest_path)
+
+    def on_deleted(self, event) -> None:
+        if not event.is_directory:
+            self.watcher.forget(Path(event.src_path))
+
+    def on_closed(self, event) -> None:
+        if not event.is_directory:
+            self._notify(event.src_path, closed=True)
+
+
+class FolderWatcher:
+    """Publishes files as they arrive in watched folders until stop() is called."""
+
+    def __init__(
+        self,
+        publish: PublishFn,
+        workers: int = 1,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        close_events: Optional[bool] = None,
+    ) -> None:
+        if Observer is None:
+            raise RuntimeError(
+                "--watch needs the 'watchdog' package (pip install watchdog)"
+            )
+        self.publish = publish
+        self.workers = workers
+        self.settle_seconds = settle_seconds
+        # With close events a file written in place waits for its writer to close it.
+        self.close_events = (
+            close_events_supported() if close_events is None else close_events
+        )
+        self.summary: Dict[str, List[str]] = {"succeeded": [], "failed": []}
+        self._observer = Observer()
+        self._folders: List[Tuple[Path, Dict[str, Any]]] = []
+        self._cond = threading.Condition()
+        # path → (due time, config, last seen (size, mtime)); no due time while a
+        # writer still has the file open
+        self._pending: Dict[
+            Path, Tuple[Optional[float], Dict[str, Any], Optional[tuple]]
+        ] = {}
+        # Files handed to a worker; their newer events wait in _pending until it is done.
+        self._active: set = set()
+        self._queue: "queue.Queue[Optional[Tuple[Path, Dict[str, Any], tuple]]]" = (
+            queue.Queue()
+        )
+        self._stopping = threading.Event()
+
+    def add(self, folder: Path, config: Dict[str, Any]) -> None:
+        """Watch `folder` (a pre-post directory) for files to publish with `config`."""
+        folder.mkdir(parents=True, exist_ok=True)
+        self._folders.append((folder, config))
+        self._observer.schedule(_Handler(self, config), str(folder), recursive=False)
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[tuple]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def notify(
+        self,
+        path: Path,
+        config: Dict[str, Any],
+        writing: bool = False,
+        closed: bool = False,
+    ) -> None:
+        """(Re)start the settle timer for a file that was just written or moved in.
+
+        `writing` marks an event from a writer that may still have the file open; with
+        close events the file then waits for `closed` instead of a timer.
+        """
+        if closed:
+            due: Optional[float] = time.monotonic() + CLOSED_SETTLE_SECONDS
+        elif writing and self.close_events:
+            due = None
+        else:
+            due = time.monotonic() + self.settle_seconds
+        with self._cond:
+            self._pending[path] = (due, config, self._signature(path))
+            self._cond.notify()
+
+    def forget(self, path: Path) -> None:
+        """Drop a file that left the folder before it was published."""
+        with self._cond:
+            self._pending.pop(path, None)
+
+    def _next_due(self) -> Optional[Tuple[Path, float]]:
+        """Return the pending file due soonest that is neither open nor being published."""
+        ready = [
+            (path, due)
+            for path, (due, _, _) in self._pending.items()
+            if due is not None and path not in self._active
+        ]
+        return min(ready, key=lambda item: item[1]) if ready else None
+
+    def _dispatch(self) -> None:
+        """Move files whose size and mtime stayed put for the settle period onto the queue."""
+        with self._cond:
+            while not self._stopping.is_set():
+                nxt = self._next_due()
+                if nxt is None:
+                    self._cond.wait()
+                    continue
+                path, due = nxt
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                _, config, seen = self._pending.pop(path)
+                current = self._signature(path)
+                if current is None:
+                    continue  # moved away or deleted before it settled
+                if current != seen:
+                    # Written to without an event we acted on: time it again.
+                    self._pending[path] = (
+                        time.monotonic() + self.settle_seconds,
+                        config,
+                        current,
+                    )
+                    continue
+                self._active.add(path)
+                self._queue.put((path, config, current))
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, config, seen = item
+            with self._cond:
+                # Last look before publishing claims or moves the file: any change
+                # since it settled (or a newer event) sends it back to wait.
+                changed = path in self._pending or self._signature(path) != seen
+                if changed:
+                    self._active.discard(path)
+                    if path not in self._pending:
+                        self._pending[path] = (
+                            time.monotonic() + self.settle_seconds,
+                            config,
+                            self._signature(path),
+                        )
+                    self._cond.notify()
+            if changed:
+                continue
+            try:
+                ok = path.exists() and self.publish(path, config)
+            except Exception:
+                logger.exception("Unexpected error publishing '%s'", path.name)
+                ok = False
+            with self._cond:
+                self._active.discard(path)
+                self.summary["succeeded" if ok else "failed"].append(path.name)
+                if path in self._pending:
+                    self._cond.notify()  # written to again while it was published
+
+    def stop(self) -> None:
+        """Ask the watcher to finish in-flight files and return from run()."""
+        self._stopping.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def run(self) -> Dict[str, List[str]]:
+        """Publish existing files, then watch until stop(); returns the run summary."""
+        threads = [
+            threading.Thread(target=self._work, name=f"worker_{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        dispatcher = threading.Thread(
+            target=self._dispatch, name="dispatch", daemon=True
+        )
+        for t in threads:
+            t.start()
+        dispatcher.start()
+        self._observer.start()
+        for folder, config in self._folders:
+            for path in sorted(folder.glob("*.html")):
+                with self._cond:
+                    # An event since the observer started knows better than the scan.
+                    if path not in self._pending:
+                        self.notify(path, config)
+            logger.info("Watching '%s'", folder)
+
+        self._stopping.wait()
+        logger.info("Shutting down: finishing files already in progress")
+        self._observer.stop()
+        self._observer.join()
+        dispatcher.join()
+        for _ in threads:
+            self._queue.put(None)
+        for t in threads:
+            t.join()
+        return self.summary
@@ -0,0 +1,394 @@
+"""
+Module/Script Name: work_claims.py
+
+Description:
+Lets several machines drain one profile's pre-post/ on a shared filesystem. A host
+claims a file by renaming it into in-progress/<host>/ (a rename succeeds for exactly
+one host), keeps a lease file there fresh with a heartbeat thread, and gives back
+whatever it still holds when it stops. Files held by a host whose lease has expired
+are reclaimed by the others, taking over any post ID the dead host's journal already
+recorded so the post is not created twice. A file whose create request was in flight
+when its host died may already be on the site, so it goes to failed/ for a person to
+check instead of being published again.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial rename-based claiming with leases, reclaim and a status table
+- v1.01 Dead hosts' journals are opened read-only; an unreadable one sets the file aside
+- v1.02 Host journals on the shared filesystem use rollback journaling, not WAL
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from file_utils import write_json_atomic
+from publish_journal import STATE_SENDING, PublishJournal
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS_DIR = "in-progress"
+LEASE_FILE = "lease.json"
+DEFAULT_LEASE_TTL = 300.0  # seconds without a heartbeat before a host counts as dead
+# Per-host journal and caches, under content_dir.
+HOSTS_STATE_DIR = Path(".push_it") / "hosts"
+
+
+def default_host_id() -> str:
+    return socket.gethostname().split(".")[0] or "host"
+
+
+def host_state_dir(content_dir: Path, host: str) -> Path:
+    """Return the host's own state directory (journal, caches) inside the shared content dir.
+
+    SQLite journals must not be written by two machines at once over a network
+    filesystem, so each host keeps its own. WAL needs shared memory that other
+    machines cannot see, so these journals are opened with shared=True (rollback
+    journaling) and every committed row is in the database file when others read it.
+    """
+    return content_dir / HOSTS_STATE_DIR / host
+
+
+def _still_running(lease: Dict[str, Any]) -> bool:
+    """False if the lease was taken on this machine by a process that has since died."""
+    if lease.get("machine") != socket.gethostname():
+        return True  # another machine's process: only its heartbeat can tell
+    try:
+        os.kill(int(lease.get("pid", 0)), 0)
+    except ProcessLookupError:
+        return False
+    except (OSError, ValueError):
+        pass
+    return True
+
+
+def read_lease(host_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(host_dir / LEASE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def lease_expired(lease: Optional[Dict[str, Any]], now: Optional[float] = None) -> bool:
+    """True if the lease is missing, released, or older than its TTL."""
+    if not lease or lease.get("state") == "stopped":
+        return True
+    now = time.time() if now is None else now
+    return now - float(lease.get("heartbeat", 0)) > float(
+        lease.get("ttl", DEFAULT_LEASE_TTL)
+    )
+
+
+class WorkClaims:
+    """One host's view of a shared pre-post/: claims files and keeps its lease alive."""
+
+    def __init__(
+        self,
+        content_dir: Path,
+        host: Optional[str] = None,
+        ttl: float = DEFAULT_LEASE_TTL,
+    ) -> None:
+        self.content_dir = content_dir
+        self.host = host or default_host_id()
+        self.ttl = ttl
+        self.pre_post = content_dir / "pre-post"
+        self.root = content_dir / IN_PROGRESS_DIR
+        self.dir = self.root / self.host
+        self.state_dir = host_state_dir(content_dir, self.host)
+        self.claimed = 0
+        self.done = 0
+        self.failed = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._candidates: Deque[Path] = deque()
+        self._seen: set = set()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._journal: Optional[PublishJournal] = None
+
+    # -- lease -------------------------------------------------------------------
+
+    def _write_lease(self, state: str = "running") -> None:
+        with self._lock:
+            lease = {
+                "host": self.host,
+                "machine": socket.gethostname(),
+                "pid": os.getpid(),
+                "state": state,
+                "started": self.started,
+                "heartbeat": time.time(),
+                "ttl": self.ttl,
+                "claimed": self.claimed,
+                "done": self.done,
+                "failed": self.failed,
+            }
+        write_json_atomic(self.dir / LEASE_FILE, lease)
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                self._write_lease()
+            except OSError as e:
+                logger.warning("Could not renew lease for %s: %s", self.host, e)
+
+    def start(self, journal: PublishJournal) -> None:
+        """Take the lease for this host and start renewing it.
+
+        `journal` is this host's own journal; post IDs found in a dead host's
+        journal are copied into it when its files are reclaimed.
+        """
+        lease = read_lease(self.dir)
+        if lease and not lease_expired(lease) and _still_running(lease):
+            raise RuntimeError(
+                f"host id '{self.host}' is already running (pid {lease.get('pid')}); "
+                "give this worker its own --host-id"
+            )
+        self._journal = journal
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._write_lease()
+        self._heartbeat = threading.Thread(target=self._beat, name="lease", daemon=True)
+        self._heartbeat.start()
+        logger.info(
+            "Claiming work in '%s' as host '%s' (lease TTL %.0fs)",
+            self.pre_post,
+            self.host,
+            self.ttl,
+        )
+
+    def stop(self) -> None:
+        """Hand back files still held (e.g. to retry later) and release the lease."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        returned = 0
+        for path in sorted(self.dir.glob("*.html")):
+            try:
+                path.replace(self.pre_post / path.name)
+                returned += 1
+            except OSError as e:
+                logger.error("Could not return '%s' to pre-post: %s", path.name, e)
+        if returned:
+            logger.info("Returned %d unfinished file(s) to pre-post", returned)
+        self._write_lease("stopped")
+
+    # -- claiming ----------------------------------------------------------------
+
+    def _expired_hosts(self) -> List[Path]:
+        if not self.root.is_dir():
+            return []
+        return [
+            d
+            for d in sorted(self.root.iterdir())
+            if d.is_dir() and d != self.dir and lease_expired(read_lease(d))
+        ]
+
+    def _refill(self) -> None:
+        """Queue this host's own leftovers, then dead hosts' files, then pre-post/."""
+        found: List[Path] = sorted(self.dir.glob("*.html"))
+        for host_dir in self._expired_hosts():
+            held = sorted(host_dir.glob("*.html"))
+            if held:
+                logger.warning(
+                    "Host '%s' lease expired; reclaiming %d file(s)",
+                    host_dir.name,
+                    len(held),
+                )
+            found.extend(held)
+        found.extend(sorted(self.pre_post.glob("*.html")))
+        # A file handed back after failing here is left for other hosts / later runs.
+        self._candidates.extend(p for p in found if p.name not in self._seen)
+
+    def _journal_entry(self, host: str, name: str) -> Optional[Dict[str, Any]]:
+        """Return `host`'s journal row for `name` ({} if none), or None if unreadable.
+
+        Another host's journal is only read: opening it as a PublishJournal would
+        run DDL on a database this host does not own. If a crash left a rollback
+        journal beside it, the read-only open fails and the caller sets the file aside.
+        """
+        if host == self.host and self._journal is not None:
+            return self._journal.get(name) or {}
+        db_path = host_state_dir(self.content_dir, host) / "journal.sqlite3"
+        if not db_path.exists():
+            return {}
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute(
+                    "SELECT * FROM files WHERE name = ?", (name,)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error("Could not read host '%s' journal '%s': %s", host, db_path, e)
+            return None
+        return dict(row) if row else {}
+
+    def _take_over(self, path: Path, host: str) -> bool:
+        """Pick up where `host` (dead, or this host before a crash) left off on `path`.
+
+        Its post ID, if any, is carried into this host's journal so only the move is
+        left. Returns False if the file was set aside because its post may exist.
+        """
+        entry = self._journal_entry(host, path.name)
+        if entry is None:
+            return self._set_aside(
+                path,
+                f"host '{host}' held this file but its journal could not be read; "
+                "the post may already be on the site. Check before dropping the file "
+                "into pre-post/ again.",
+            )
+        if entry.get("post_id"):
+            if host != self.host and self._journal is not None:
+                self._journal.record_post(path.name, entry["post_id"])
+            logger.info(
+                "'%s' already has post %s from host '%s'; only the move is left",
+                path.name,
+                entry["post_id"],
+                host,
+            )
+            return True
+        if entry.get("state") != STATE_SENDING:
+            return True
+        return self._set_aside(
+            path,
+            f"host '{host}' stopped while creating this post; it may already be on "
+            "the site. Check before dropping the file into pre-post/ again.",
+        )
+
+    def _set_aside(self, path: Path, note: str) -> bool:
+        """Move a file whose post may already exist to failed/; always returns False."""
+        failed_dir = self.content_dir / "failed"
+        try:
+            failed_dir.mkdir(exist_ok=True)
+            path.replace(failed_dir / path.name)
+            (failed_dir / f"{path.name}.error.txt").write_text(
+                note + "\n", encoding="utf-8"
+            )
+        except OSError as e:
+            logger.error("Could not set aside '%s': %s", path.name, e)
+            return False
+        if self._journal is not None:
+            self._journal.record_failed(path.name, note)
+        logger.error("Moved '%s' → '%s': %s", path.name, failed_dir, note)
+        return False
+
+    def claim_next(self) -> Optional[Path]:
+        """Claim one file for this host and return its in-progress path, or None when dry."""
+        with self._lock:
+            refilled = False
+            while True:
+                if not self._candidates:
+                    if refilled:
+                        return None
+                    self._refill()
+                    refilled = True
+                    continue
+                source = self._candidates.popleft()
+                if source.name in self._seen:
+                    continue
+                target = self.dir / source.name
+                if source.parent != self.dir:
+                    try:
+                        # Atomic on one filesystem: exactly one host's rename wins.
+                        os.rename(source, target)
+                    except FileNotFoundError:
+                        continue
+                    except OSError as e:
+                        logger.warning("Could not claim '%s': %s", source.name, e)
+                        continue
+                self._seen.add(source.name)
+                if source.parent != self.pre_post and not self._take_over(
+                    target, source.parent.name
+                ):
+                    continue
+                self.claimed += 1
+                return target
+
+    def finished(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+
+    def drain(
+        self, publish: Callable[[Path], bool], workers: int = 1
+    ) -> Dict[str, List[str]]:
+        """Claim and publish files on `workers` threads until nothing is left to claim."""
+        summary: Dict[str, List[str]] = {"succeeded": [], "failed": []}
+        summary_lock = threading.Lock()
+
+        def worker() -> None:
+            while not self._stop.is_set():
+                path = self.claim_next()
+                if path is None:
+                    return
+                try:
+                    ok = publish(path)
+                except Exception:
+                    logger.exception("Unexpected error publishing '%s'", path.name)
+                    ok = False
+                self.finished(ok)
+                with summary_lock:
+                    summary["succeeded" if ok else "failed"].append(path.name)
+
+        threads = [
+            threading.Thread(target=worker, name=f"claim_{i}") for i in range(workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return summary
+
+
+def format_status(content_dir: Path, now: Optional[float] = None) -> str:
+    """Return a plain-text table of every host's lease and counters for a content dir."""
+    now = time.time() if now is None else now
+    root = content_dir / IN_PROGRESS_DIR
+    header = ("Host", "State", "Heartbeat", "Claimed", "Done", "Failed", "Holding")
+    rows = []
+    for host_dir in sorted(root.iterdir()) if root.is_dir() else []:
+        if not host_dir.is_dir():
+            continue
+        lease = read_lease(host_dir) or {}
+        if lease.get("state") == "stopped":
+            state = "stopped"
+        else:
+            state = "expired" if lease_expired(lease, now) else "alive"
+        age = now - float(lease["heartbeat"]) if "heartbeat" in lease else None
+        rows.append(
+            (
+                host_dir.name,
+                state,
+                "–" if age is None else f"{age:.0f}s ago",
+                str(lease.get("claimed", 0)),
+                str(lease.get("done", 0)),
+                str(lease.get("failed", 0)),
+                str(len(list(host_dir.glob("*.html")))),
+            )
+        )
+    widths = [max(len(r[i]) for r in [header, *rows]) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(header, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend(
+        "  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows
+    )
+    waiting = len(list((content_dir / "pre-post").glob("*.html")))
+    posted = len(list((content_dir / "posted").glob("*.html")))
+    lines.append(f"\npre-post: {waiting} waiting · posted: {posted}")
+    return "\n".join(lines)
@@ -0,0 +1,171 @@
+"""
+Module/Script Name: wp_client.py
+
+Description:
+Shared HTTP client layer for talking to the WordPress REST API. Builds one pooled,
+keep-alive session per profile with default timeouts and jittered exponential
+retries for idempotent requests.
+
+Author(s):
+Skippy the Magnificent with an eensy weensy bit of help from that filthy monkey, Big G
+
+Created Date: 2026-10-16
+Last Modified Date: 2026-10-16
+
+Comments:
+- v1.00 Initial session factory shared by post_pusher.py and push_it_ui_mvp.py
+- v1.01 Optional adaptive limiter around write calls, retrying POSTs on 429/503
+- v1.02 session_key() exposed so callers can tell when a profile's site or login changed
+- v1.03 POSTs are retried on 429 only; a 503 may come after the post was created
+- v1.04 Limiter is told each call's route and body size so latency is judged fairly
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_control import request_kind
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (5.0, 30.0)  # (connect, read) seconds
+DEFAULT_RETRIES = 3
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+THROTTLED_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+THROTTLE_STATUSES = (429, 503)
+# A 503 can come from a proxy or PHP-FPM after WordPress already handled the request,
+# so only 429 (refused before processing) is safe to retry for a non-idempotent POST.
+POST_RETRY_STATUSES = (429,)
+
+_sessions: Dict[Tuple[str, str, str], "WPSession"] = {}
+_sessions_lock = threading.Lock()
+
+
+class WPSession(requests.Session):
+    """A requests.Session bound to one WordPress site and its application password."""
+
+    def __init__(
+        self,
+        wp_url: str,
+        username: str,
+        app_password: str,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        super().__init__()
+        self.wp_url = wp_url.rstrip("/")
+        self.auth = (username, app_password)
+        self.timeout = timeout
+        # Set by callers that want adaptive concurrency (see rate_control.py).
+        self.limiter = None
+        self.throttle_retries = retries
+
+        # Only idempotent methods are retried; Retry-After is honoured on 429/503.
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=0.5,
+            backoff_jitter=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def api_url(self, route: str) -> str:
+        """Return the absolute REST URL for a route such as 'wp/v2/posts'."""
+        return f"{self.wp_url}/wp-json/{route.lstrip('/')}"
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any):
+        """Send a request, resolving relative REST routes and applying the default timeout."""
+        if not url.startswith(("http://", "https://")):
+            url = self.api_url(url)
+        kwargs.setdefault("timeout", self.timeout)
+        if self.limiter is None or method.upper() not in THROTTLED_METHODS:
+            return super().request(method, url, *args, **kwargs)
+
+        # Write calls are not retried by urllib3, so throttled ones are retried here once
+        # the limiter's Retry-After pause is over. A 503 to a POST goes back to the
+        # caller (see POST_RETRY_STATUSES), though the limiter still backs off on it.
+        retry_statuses = (
+            POST_RETRY_STATUSES if method.upper() == "POST" else THROTTLE_STATUSES
+        )
+        for attempt in range(self.throttle_retries + 1):
+            for f in (kwargs.get("files") or {}).values():
+                if hasattr(f, "seek"):
+                    f.seek(0)
+            self.limiter.acquire()
+            started = time.monotonic()
+            status = retry_after = None
+            sent = 0
+            try:
+                response = super().request(method, url, *args, **kwargs)
+                status = response.status_code
+                retry_after = response.headers.get("Retry-After")
+                body = response.request.body
+                sent = len(body) if isinstance(body, (bytes, str)) else 0
+            finally:
+                self.limiter.release(
+                    time.monotonic() - started,
+                    status,
+                    retry_after,
+                    request_kind(url),
+                    sent,
+                )
+            if status not in retry_statuses or attempt == self.throttle_retries:
+                return response
+            logger.warning("HTTP %s from %s, retrying %s", status, url, method)
+        return response
+
+
+def build_session(config: Dict[str, Any]) -> WPSession:
+    """Build a new WPSession from a profile config, honouring optional http_* overrides."""
+    timeout = config.get("http_timeout", DEFAULT_TIMEOUT)
+    if isinstance(timeout, list):
+        timeout = tuple(timeout)
+    return WPSession(
+        config["wp_url"],
+        config["username"],
+        config["app_password"],
+        timeout=timeout,
+        retries=int(config.get("http_retries", DEFAULT_RETRIES)),
+        pool_size=int(config.get("http_pool_size", DEFAULT_POOL_SIZE)),
+    )
+
+
+def session_key(config: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Return what identifies a profile's session: site URL, user and password."""
+    return (config["wp_url"].rstrip("/"), config["username"], config["app_password"])
+
+
+def session_for(config: Dict[str, Any]) -> WPSession:
+    """Return the shared session for this profile, creating it on first use."""
+    key = session_key(config)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = build_session(config)
+            _sessions[key] = session
+        return session
+
+
+def close_sessions(wp_url: Optional[str] = None) -> None:
+    """Close and forget cached sessions, optionally only those for one site."""
+    with _sessions_lock:
+        for key in list(_sessions):
+            if wp_url is None or key[0] == wp_url.rstrip("/"):
+                _sessions.pop(key).close()